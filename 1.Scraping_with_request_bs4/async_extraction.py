@@ -0,0 +1,282 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+from charset import TEXT_CONTENT_TYPES, detect_encoding
+from metrics import aiohttp_trace_config
+from retry import FetchResult, parse_retry_after
+from web_extraction import WebScraper
+
+
+class AsyncResponse:
+    """Réponse HTTP entièrement lue, compatible avec l'usage fait de requests.Response"""
+
+    def __init__(self, url, status_code, headers, content, encoding=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class AsyncWebScraper(WebScraper):
+    """Variante asyncio de WebScraper pour récupérer de nombreuses pages en parallèle.
+
+    Même forme d'API que WebScraper (get_page, scrape_article_content,
+    scrape_table_data) mais en coroutines, plus fetch_many qui renvoie les
+    résultats au fur et à mesure. Deux limites s'appliquent : une limite
+    globale de requêtes simultanées et une limite par hôte.
+
+        async with AsyncWebScraper("https://example.com", concurrency=20) as scraper:
+            async for url, response in scraper.fetch_many(urls):
+                ...
+    """
+
+    metrics_label = 'async'
+
+    def __init__(self, base_url, headers=None, concurrency=10, per_host_limit=2, timeout=10,
+                 scheduler=None, parser='html.parser', retry_policy=None, circuit_breaker=None,
+                 max_body_bytes=10 * 1024 * 1024, allowed_content_types=TEXT_CONTENT_TYPES, metrics=None):
+        super().__init__(base_url, headers, scheduler=scheduler, parser=parser,
+                         retry_policy=retry_policy, circuit_breaker=circuit_breaker,
+                         max_body_bytes=max_body_bytes, allowed_content_types=allowed_content_types,
+                         metrics=metrics)
+        self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+
+        self._client = None
+        self._global_limit = None
+        self._host_limits = {}
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Ouvre la session aiohttp (appelé automatiquement si besoin)"""
+        if self._client is None:
+            self._client = aiohttp.ClientSession(
+                headers=dict(self.session.headers),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                # Le pool de connexions suit les mêmes limites que les sémaphores
+                connector=aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host_limit),
+                # Phases DNS / connexion / TTFB mesurées par les hooks de trace aiohttp
+                trace_configs=[aiohttp_trace_config(self.metrics, self.metrics_label)] if self.metrics else None,
+            )
+            # Sémaphores recréés à chaque ouverture : liés à la boucle d'événements courante
+            self._global_limit = asyncio.Semaphore(self.concurrency)
+            self._host_limits = {}
+
+    async def close(self):
+        """Ferme la session aiohttp"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def _host_limit(self, url):
+        host = urlparse(url).netloc.lower()
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.per_host_limit)
+            self._host_limits[host] = limit
+        return limit
+
+    async def get_page(self, url):
+        """Récupère le contenu d'une page web (None en cas d'échec, détail via fetch)"""
+        return (await self.fetch(url)).response
+
+    async def fetch(self, url):
+        """Récupère une page avec nouvelles tentatives et renvoie un FetchResult structuré"""
+        result = await self._fetch(url)
+        if self.metrics:
+            self.metrics.record_fetch(result, self.metrics_label)
+        return result
+
+    async def _fetch(self, url):
+        await self.open()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.circuit_breaker and not self.circuit_breaker.allow(url):
+                if self.scheduler and attempt == 1:
+                    # Aucune requête : le créneau éventuellement réservé par next_url() est rendu
+                    self.scheduler.release(url)
+                return FetchResult(url, 'circuit_open', error="Hôte désactivé après des échecs répétés",
+                                   attempts=attempt - 1, elapsed=time.monotonic() - start)
+
+            retry_after = None
+            rejection = None
+            try:
+                # Attente de politesse avant de prendre un créneau de connexion
+                if self.scheduler:
+                    await self.scheduler.aacquire(url)
+                async with self._global_limit, self._host_limit(url):
+                    async with self._client.get(url) as response:
+                        if 'Retry-After' in response.headers:
+                            retry_after = parse_retry_after(response.headers['Retry-After'])
+                            if self.scheduler:
+                                self.scheduler.register_retry_after(url, response.headers['Retry-After'])
+                        status = response.status
+                        content = None
+                        if response.ok:
+                            rejection = self.rejection_reason(response.headers)
+                            if not rejection:
+                                download_start = time.perf_counter()
+                                content, rejection = await self._read_body(response)
+                                if self.metrics:
+                                    self.metrics.observe('download', time.perf_counter() - download_start,
+                                                         scraper=self.metrics_label)
+                        final_url = str(response.url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_failure(url)
+                # Erreurs de connexion et délais dépassés : transitoires
+                retryable = isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError)) \
+                    and not isinstance(e, aiohttp.ClientSSLError)
+                result = FetchResult(url, 'network_error', error=str(e) or type(e).__name__, retryable=retryable)
+            else:
+                if self.circuit_breaker:
+                    if status < 500 and status != 429:
+                        self.circuit_breaker.record_success(url)
+                    else:
+                        self.circuit_breaker.record_failure(url)
+
+                if rejection:
+                    return FetchResult(url, 'rejected', status_code=status, error=rejection,
+                                       attempts=attempt, elapsed=time.monotonic() - start)
+
+                if content is not None:
+                    if self.metrics:
+                        self.metrics.inc('bytes', len(content), scraper=self.metrics_label)
+                    encoding = detect_encoding(content, response.headers.get('Content-Type'))
+                    response = AsyncResponse(url=final_url, status_code=status, headers=response.headers,
+                                             content=content, encoding=encoding)
+                    return FetchResult(url, 'success', response=response, status_code=status,
+                                       attempts=attempt, elapsed=time.monotonic() - start)
+
+                result = FetchResult(url, 'http_error', status_code=status, error=f"HTTP {status}",
+                                     retryable=self.retry_policy.is_retryable(status_code=status))
+
+            if not result.retryable or attempt >= self.retry_policy.max_attempts:
+                result.attempts = attempt
+                result.elapsed = time.monotonic() - start
+                return result
+            await asyncio.sleep(self.retry_policy.delay(attempt, retry_after))
+
+    async def _read_body(self, response, chunk_size=64 * 1024):
+        """Lit le corps en flux dans la limite de taille ; renvoie (contenu, motif de refus)"""
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(chunk_size):
+            size += len(chunk)
+            rejection = self.rejection_reason(response.headers, size)
+            if rejection:
+                # Abandon de la connexion sans lire la suite
+                response.close()
+                return None, rejection
+            chunks.append(chunk)
+        return b''.join(chunks), None
+
+    async def scrape_article_content(self, url):
+        """Exemple d'extraction d'articles de blog"""
+        response = await self.get_page(url)
+        if not response:
+            return None
+
+        soup = self.parse_html(response.text)
+        return self._timed('extract', self.parse_article, soup, url)
+
+    async def scrape_table_data(self, url, table_selector='table'):
+        """Extrait les données d'un tableau HTML"""
+        response = await self.get_page(url)
+        if not response:
+            return None
+
+        soup = self.parse_html(response.text)
+        return self._timed('extract', self.parse_table, soup, table_selector)
+
+    async def fetch_many(self, urls, concurrency=None):
+        """Récupère une liste d'URLs et renvoie (url, réponse) dans l'ordre d'arrivée.
+
+        Les URLs sont consommées au fil de l'eau : seules `concurrency` requêtes
+        sont en vol à un instant donné, même pour un itérable très long. La
+        réponse vaut None en cas d'échec (voir fetch pour le détail).
+        """
+        await self.open()
+        workers_count = concurrency or self.concurrency
+        url_iterator = iter(urls)
+        results = asyncio.Queue(maxsize=workers_count)
+        done = object()
+
+        async def worker():
+            cancelled = False
+            try:
+                # Les workers partagent le même itérateur : pas de liste en mémoire
+                for url in url_iterator:
+                    try:
+                        response = await self.get_page(url)
+                    except Exception as e:
+                        # Erreur inattendue : l'URL est signalée en échec sans arrêter le worker
+                        print(f"Erreur lors de la récupération de {url}: {e}")
+                        response = None
+                    await results.put((url, response))
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Annulé (consommateur arrêté avant la fin) : personne n'attend le signal
+                # de fin, et l'attente sur une file pleine bloquerait le nettoyage
+                if not cancelled:
+                    await results.put(done)
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers_count)]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                item = await results.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Exemple d'utilisation
+async def exemple_scraping_concurrent(urls):
+    """Exemple de récupération concurrente de plusieurs pages"""
+    results = []
+
+    async with AsyncWebScraper("https://example.com", concurrency=10, per_host_limit=2) as scraper:
+        async for url, response in scraper.fetch_many(urls):
+            if response:
+                soup = scraper.parse_html(response.text)
+                title = soup.find('title')
+                results.append({"url": url, "status": "success",
+                                "title": title.get_text(strip=True) if title else ''})
+            else:
+                results.append({"url": url, "status": "failed"})
+            print(f"Terminé: {url}")
+
+    return results
+
+
+if __name__ == "__main__":
+    asyncio.run(exemple_scraping_concurrent([
+        "https://httpbin.org/html",
+        "https://httpbin.org/json",
+        "https://www.lemonde.fr/",
+    ]))
@@ -0,0 +1,157 @@
+"""Compare les backends de parsing sur des pages HTML sauvegardées.
+
+Pour chaque backend : temps de parsing, temps d'extraction (liens, images,
+article, tableau), mémoire maximale et cohérence des résultats avec le
+backend de référence 'html.parser'. Chaque backend tourne dans un processus
+séparé pour que la mesure de mémoire ne soit pas faussée par les autres.
+
+    python benchmark_parsers.py                      # fixtures/ + pages synthétiques
+    python benchmark_parsers.py --fixtures mes_pages/ --repeat 5 --json resultats.json
+"""
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from parsers import PARSER_BACKENDS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def generate_news_homepage(articles=2000):
+    """Génère une page d'accueil de site d'actualités volumineuse"""
+    parts = ['<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">',
+             '<title>Actualités</title></head><body><header><nav>']
+    parts += [f'<a href="/rubrique/{i}">Rubrique {i}</a>' for i in range(40)]
+    parts.append('</nav></header><main><h1 class="site-title">À la une</h1>')
+    for i in range(articles):
+        parts.append(
+            f'<div class="teaser"><h2 class="teaser-title"><a href="/article/{i}.html">'
+            f'Titre de l\'article numéro {i}</a></h2>'
+            f'<img src="/img/{i}.jpg" alt="Illustration {i}" loading="lazy">'
+            f'<p class="summary">Résumé de l\'article {i} avec <em>mise en forme</em> et du texte.</p>'
+            f'<span class="author">Rédaction {i % 17}</span></div>'
+        )
+    parts.append('<table class="cours"><thead><tr><th>Indice</th><th>Valeur</th></tr></thead><tbody>')
+    parts += [f'<tr><td>Indice {i}</td><td>{i * 3.7:.2f}</td></tr>' for i in range(500)]
+    parts.append('</tbody></table></main><footer><a href="https://example.org">Partenaire</a></footer></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def load_fixtures(directory, synthetic):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            pages[os.path.basename(path)] = f.read()
+    if synthetic:
+        pages['synthetic_homepage.html'] = generate_news_homepage(synthetic)
+    return pages
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sur macOS, en kilo-octets ailleurs
+    return peak / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak / 1024
+
+
+def run_backend(backend_name, pages, repeat):
+    """Mesure un backend (exécuté dans un processus dédié)"""
+    from web_extraction import WebScraper
+
+    scraper = WebScraper("https://example.com", parser=backend_name)
+
+    def parse_and_extract(html):
+        start = time.perf_counter()
+        doc = scraper.parse_html(html)
+        parsed = time.perf_counter()
+        results = (
+            scraper.extract_links(doc, "https://example.com/"),
+            scraper.extract_images(doc, "https://example.com/"),
+            scraper.parse_article(doc, "https://example.com/"),
+            scraper.parser.table_cells(doc, 'table'),
+        )
+        return results, parsed - start, time.perf_counter() - parsed
+
+    baseline_rss = _peak_rss_mb()
+
+    # Passe de chronométrage, sans tracemalloc qui ralentit le code Python
+    parse_time = extract_time = 0.0
+    digests = {}
+    for name, html in pages.items():
+        for _ in range(repeat):
+            results, parse_seconds, extract_seconds = parse_and_extract(html)
+            parse_time += parse_seconds
+            extract_time += extract_seconds
+        digests[name] = hashlib.sha256(repr(results).encode('utf-8')).hexdigest()
+    peak_rss = _peak_rss_mb()
+
+    # Passe mémoire : pic d'allocations Python par page
+    python_peak = 0
+    for html in pages.values():
+        tracemalloc.start()
+        parse_and_extract(html)
+        python_peak = max(python_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        'backend': backend_name,
+        'parse_seconds': parse_time / repeat,
+        'extract_seconds': extract_time / repeat,
+        'python_peak_mb': python_peak / (1024 * 1024),
+        # Inclut la mémoire allouée par les parseurs C (lxml, lexbor)
+        'rss_growth_mb': None if peak_rss is None else peak_rss - baseline_rss,
+        'digests': digests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="Dossier de pages .html sauvegardées")
+    parser.add_argument('--synthetic', type=int, default=2000,
+                        help="Nombre d'articles de la page synthétique (0 pour désactiver)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--backends', nargs='+', default=list(PARSER_BACKENDS))
+    parser.add_argument('--json', help="Fichier de sortie JSON")
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures, args.synthetic)
+    total_kb = sum(len(html) for html in pages.values()) / 1024
+    print(f"{len(pages)} pages, {total_kb:,.0f} Ko au total, {args.repeat} répétitions")
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for backend_name in args.backends:
+        with context.Pool(1) as pool:
+            try:
+                results.append(pool.apply(run_backend, (backend_name, pages, args.repeat)))
+            except ImportError as e:
+                print(f"{backend_name}: ignoré ({e})")
+
+    reference = next((r['digests'] for r in results if r['backend'] == 'html.parser'), None)
+    print(f"\n{'Backend':<12} {'Parse (s)':>10} {'Extract (s)':>12} {'Py peak (Mo)':>13} {'RSS +(Mo)':>10}  Résultats")
+    for result in results:
+        same = reference is None or result['digests'] == reference
+        rss = '-' if result['rss_growth_mb'] is None else f"{result['rss_growth_mb']:.1f}"
+        print(f"{result['backend']:<12} {result['parse_seconds']:>10.3f} {result['extract_seconds']:>12.3f} "
+              f"{result['python_peak_mb']:>13.1f} {rss:>10}  {'identiques' if same else 'DIFFÉRENTS'}")
+        result['matches_reference'] = same
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nRésultats sauvegardés dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import codecs
+import re
+
+from charset_normalizer import from_bytes
+
+# Types de contenu acceptés par défaut par WebScraper : le reste (PDF, images,
+# archives...) est refusé dès les en-têtes, sans télécharger le corps
+TEXT_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', 'text/xml',
+                      'application/xml', 'application/json')
+
+_CHARSET_PARAM = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# <meta charset="..."> et <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Comme les navigateurs : latin-1 déclaré signifie en pratique windows-1252
+_ALIASES = {'iso8859-1': 'cp1252', 'ascii': 'cp1252'}
+
+
+def _normalize(name):
+    try:
+        name = codecs.lookup(name).name
+    except LookupError:
+        return None
+    return _ALIASES.get(name, name)
+
+
+def detect_encoding(body, content_type=None, sniff_bytes=4096):
+    """Détermine l'encodage d'une page HTML du moins coûteux au plus coûteux.
+
+    1. charset de l'en-tête Content-Type ;
+    2. BOM en début de corps ;
+    3. balise <meta> dans les premiers `sniff_bytes` octets ;
+    4. décodage UTF-8 strict ;
+    5. détection statistique (charset_normalizer) en dernier recours.
+    """
+    if content_type:
+        match = _CHARSET_PARAM.search(content_type)
+        if match:
+            encoding = _normalize(match.group(1))
+            if encoding:
+                return encoding
+
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return encoding
+
+    match = _META_CHARSET.search(body[:sniff_bytes])
+    if match:
+        encoding = _normalize(match.group(1).decode('ascii', 'ignore'))
+        if encoding:
+            return encoding
+
+    try:
+        body.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    matches = from_bytes(body[:64 * 1024])
+    best = matches.best()
+    if best is None:
+        return 'cp1252'
+    # Les textes courts sont ambigus : à quasi-égalité, windows-1252 (défaut
+    # des navigateurs pour les pages occidentales) l'emporte
+    for match in matches:
+        if 'cp1252' in match.could_be_from_charset and match.chaos - best.chaos <= 0.02:
+            return 'cp1252'
+    return best.encoding
@@ -0,0 +1,193 @@
+import sqlite3
+import time
+
+PENDING, IN_PROGRESS, DONE, FAILED = 'pending', 'in_progress', 'done', 'failed'
+
+
+class JobStore:
+    """Journal persistant d'un lot de scraping (SQLite en mode WAL).
+
+    Enregistre la frontière, le statut de chaque URL, le nombre de
+    tentatives et la position de sortie. Les écritures sont regroupées :
+    elles sont validées en une transaction toutes les `flush_every`
+    opérations ou `flush_interval` secondes. Si un ResultSink est attaché,
+    chaque validation force d'abord l'écriture du fichier de sortie puis
+    enregistre sa taille dans la même transaction : à la reprise, la sortie
+    est tronquée à cette taille et seules les URLs non validées sont
+    retraitées, sans doublon dans le fichier.
+
+        store = JobStore("job.sqlite")
+        sink = ResultSink("resultats.jsonl", resume_offset=store.output_offset)
+        store.attach_sink(sink)
+    """
+
+    def __init__(self, path, flush_every=500, flush_interval=2.0):
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.sink = None
+
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                depth INTEGER DEFAULT 0,
+                priority REAL DEFAULT 0,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                output_records INTEGER,
+                error TEXT,
+                updated_at REAL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS urls_queue ON urls (status, priority)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+
+        # Les URLs prises en charge avant l'arrêt n'ont pas été validées : on les reprend
+        self._db.execute("UPDATE urls SET status = ? WHERE status = ?", (PENDING, IN_PROGRESS))
+
+        self._operations = []
+        self._last_flush = time.monotonic()
+        self.output_offset = self._meta('output_offset', 0)
+        self.output_records = self._meta('output_records', 0)
+
+    def _meta(self, key, default=None):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def attach_sink(self, sink):
+        """Associe un ResultSink dont la position est validée avec les statuts"""
+        self.sink = sink
+        sink.count = self.output_records
+
+    # --- Écritures groupées -------------------------------------------------
+
+    def _queue(self, sql, params):
+        self._operations.append((sql, params))
+        if (len(self._operations) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Valide en une transaction les opérations en attente (et la position de sortie)"""
+        operations, self._operations = self._operations, []
+        if self.sink is not None:
+            self.output_offset = self.sink.checkpoint()
+            self.output_records = self.sink.count
+            operations.append(("INSERT OR REPLACE INTO meta VALUES ('output_offset', ?)", (self.output_offset,)))
+            operations.append(("INSERT OR REPLACE INTO meta VALUES ('output_records', ?)", (self.output_records,)))
+        if operations:
+            self._db.execute("BEGIN")
+            for sql, params in operations:
+                self._db.execute(sql, params)
+            self._db.execute("COMMIT")
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    # --- Frontière ----------------------------------------------------------
+
+    def add(self, url, depth=0, priority=0):
+        """Ajoute une URL à traiter (ignorée si déjà connue)"""
+        self._queue("INSERT OR IGNORE INTO urls (url, depth, priority, updated_at) VALUES (?, ?, ?, ?)",
+                    (url, depth, priority, time.time()))
+
+    def add_many(self, urls, depth=0, priority=0):
+        for url in urls:
+            self.add(url, depth, priority)
+
+    def claim(self, limit=100):
+        """Prend en charge jusqu'à `limit` URLs en attente ; renvoie [(url, profondeur)]"""
+        self.flush()
+        self._db.execute("BEGIN IMMEDIATE")
+        rows = self._db.execute(
+            "SELECT url, depth FROM urls WHERE status = ? ORDER BY priority, rowid LIMIT ?",
+            (PENDING, limit),
+        ).fetchall()
+        self._db.executemany(
+            "UPDATE urls SET status = ?, attempts = attempts + 1, updated_at = ? WHERE url = ?",
+            [(IN_PROGRESS, time.time(), url) for url, _ in rows],
+        )
+        self._db.execute("COMMIT")
+        return rows
+
+    def mark_done(self, url):
+        """Marque l'URL comme traitée, avec le nombre d'enregistrements écrits jusque-là"""
+        records = self.sink.count if self.sink is not None else None
+        self._queue("UPDATE urls SET status = ?, output_records = ?, error = NULL, updated_at = ? WHERE url = ?",
+                    (DONE, records, time.time(), url))
+
+    def mark_failed(self, url, error=None, max_attempts=3):
+        """Enregistre un échec ; l'URL repasse en attente tant que max_attempts n'est pas atteint"""
+        self._queue(
+            "UPDATE urls SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, error = ?, updated_at = ? "
+            "WHERE url = ?",
+            (max_attempts, FAILED, PENDING, error, time.time(), url),
+        )
+
+    def known_urls(self):
+        """Itère sur toutes les URLs connues (pour reconstruire un ensemble d'URLs vues)"""
+        self.flush()
+        for (url,) in self._db.execute("SELECT url FROM urls"):
+            yield url
+
+    def counts(self):
+        """Nombre d'URLs par statut"""
+        self.flush()
+        return dict(self._db.execute("SELECT status, COUNT(*) FROM urls GROUP BY status").fetchall())
+
+
+def run_resumable(scraper, store, sink, process, claim_size=100):
+    """Traite toutes les URLs en attente du JobStore, en reprenant là où le lot s'est arrêté.
+
+    `process(url, response)` renvoie les enregistrements à écrire pour une page.
+    """
+    store.attach_sink(sink)
+    try:
+        while True:
+            jobs = store.claim(claim_size)
+            if not jobs:
+                break
+            for url, _ in jobs:
+                response = scraper.get_page(url)
+                if response is None:
+                    store.mark_failed(url, "échec du téléchargement")
+                    continue
+                for record in process(url, response):
+                    sink.write(record)
+                store.mark_done(url)
+    finally:
+        store.flush()
+
+
+# Exemple d'utilisation
+def exemple_scraping_avec_reprise(urls, job_path="job.sqlite", output_path="resultats.jsonl"):
+    """Lot interruptible : relancer la fonction reprend exactement où le lot s'est arrêté"""
+    from politeness import PolitenessScheduler
+    from sinks import ResultSink
+    from web_extraction import WebScraper
+
+    scraper = WebScraper("https://example.com", scheduler=PolitenessScheduler(rate=1.0))
+    store = JobStore(job_path)
+    store.add_many(urls)
+
+    def process(url, response):
+        soup = scraper.parse_html(response.text)
+        title = soup.find('title')
+        yield {'url': url, 'title': title.get_text(strip=True) if title else ''}
+
+    with ResultSink(output_path, resume_offset=store.output_offset) as sink:
+        run_resumable(scraper, store, sink, process)
+
+    print(f"Statuts: {store.counts()}")
+    store.close()
+
+
+if __name__ == "__main__":
+    exemple_scraping_avec_reprise([
+        "https://httpbin.org/html",
+        "https://httpbin.org/json",
+    ])
@@ -0,0 +1,231 @@
+import hashlib
+import heapq
+import math
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from url_utils import normalize_url
+
+
+class BloomFilter:
+    """Ensemble probabiliste à mémoire fixe pour les URLs déjà vues.
+
+    Aucun faux négatif ; les faux positifs (URL jamais vue considérée comme
+    vue) restent sous `error_rate` tant que `capacity` n'est pas dépassée.
+    10 millions d'URLs à 0,1 % tiennent dans environ 18 Mo.
+    """
+
+    def __init__(self, capacity=10_000_000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def add(self, item):
+        """Ajoute l'élément ; renvoie True s'il n'était pas encore présent"""
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+
+class CrawlScope:
+    """Règles de périmètre : domaines autorisés, préfixe de chemin, profondeur maximale"""
+
+    def __init__(self, allowed_domains=None, include_subdomains=False, path_prefix=None, max_depth=None):
+        self.allowed_domains = {domain.lower() for domain in allowed_domains} if allowed_domains else None
+        self.include_subdomains = include_subdomains
+        self.path_prefix = path_prefix
+        self.max_depth = max_depth
+
+    def allows(self, url, depth):
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            return False
+
+        if self.allowed_domains is not None:
+            host = (parsed.hostname or '').lower()
+            if host not in self.allowed_domains and not (
+                    self.include_subdomains
+                    and any(host.endswith('.' + domain) for domain in self.allowed_domains)):
+                return False
+
+        if self.path_prefix and not parsed.path.startswith(self.path_prefix):
+            return False
+        return True
+
+
+def breadth_first(url, depth):
+    """Priorité par défaut : les pages les moins profondes d'abord"""
+    return depth
+
+
+class Crawler:
+    """Crawler en largeur à partir d'URLs de départ, basé sur WebScraper.extract_links.
+
+    La frontière est une file de priorité (par défaut la profondeur, donc un
+    parcours en largeur) ; les URLs sont normalisées et dédupliquées par un
+    filtre de Bloom. Les téléchargements se font sur `concurrency` threads,
+    le fil principal ne fait que la tenue de la frontière (O(log n) par URL).
+
+        scraper = WebScraper("https://example.com", scheduler=PolitenessScheduler(rate=2))
+        crawler = Crawler(scraper, ["https://example.com/"], max_depth=2, max_pages=500)
+        for url, depth, soup in crawler.crawl():
+            ...
+
+    Sans `scope`, le crawl reste sur les domaines des URLs de départ. Avec
+    un `job_store` (checkpoint.JobStore), la frontière et les statuts sont
+    persistés : relancer le même crawl reprend là où il s'est arrêté.
+    """
+
+    def __init__(self, scraper, seeds, scope=None, max_depth=None, path_prefix=None,
+                 priority=breadth_first, max_pages=None, concurrency=8,
+                 expected_urls=10_000_000, error_rate=0.001, job_store=None):
+        self.scraper = scraper
+        self.scope = scope or CrawlScope(
+            allowed_domains={urlparse(seed).hostname for seed in seeds},
+            path_prefix=path_prefix,
+            max_depth=max_depth,
+        )
+        self.priority = priority
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+
+        self.seen = BloomFilter(expected_urls, error_rate)
+        self.frontier = []
+        self._counter = 0
+        self.stats = {'fetched': 0, 'failed': 0, 'discovered': 0}
+
+        self.job_store = job_store
+        self._claimed = deque()
+        if job_store is not None:
+            # Reprise : les URLs déjà connues du journal ne sont pas redécouvertes
+            for url in job_store.known_urls():
+                self.seen.add(url)
+
+        for seed in seeds:
+            self.add(seed, 0)
+
+    def add(self, url, depth):
+        """Ajoute une URL à la frontière si elle est dans le périmètre et jamais vue"""
+        try:
+            url = normalize_url(url)
+        except ValueError:
+            # Lien mal formé (port non numérique, IPv6 non fermé...) : ignoré sans arrêter le crawl
+            return False
+        if not self.scope.allows(url, depth) or not self.seen.add(url):
+            return False
+        if self.job_store is not None:
+            self.job_store.add(url, depth, self.priority(url, depth))
+        else:
+            self._counter += 1
+            heapq.heappush(self.frontier, (self.priority(url, depth), self._counter, url, depth))
+        self.stats['discovered'] += 1
+        return True
+
+    def _next_job(self):
+        """Renvoie la prochaine (url, profondeur) de la frontière, ou None"""
+        if self.job_store is None:
+            if not self.frontier:
+                return None
+            _, _, url, depth = heapq.heappop(self.frontier)
+            return url, depth
+
+        if not self._claimed:
+            self._claimed.extend(self.job_store.claim(self.concurrency * 4))
+        return self._claimed.popleft() if self._claimed else None
+
+    def _fetch(self, url):
+        """Télécharge, parse et extrait les liens (exécuté dans un thread)"""
+        response = self.scraper.get_page(url)
+        if response is None:
+            return None, []
+        soup = self.scraper.parse_html(response.text)
+        # Base des liens relatifs : URL finale après redirections
+        final_url = getattr(response, 'url', None) or url
+        links = [link['url'] for link in self.scraper.extract_links(soup, final_url)]
+        return soup, links
+
+    def crawl(self):
+        """Parcourt le site et renvoie (url, profondeur, soup) pour chaque page récupérée"""
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            in_flight = {}
+            while True:
+                while len(in_flight) < self.concurrency and (
+                        self.max_pages is None
+                        or self.stats['fetched'] + self.stats['failed'] + len(in_flight) < self.max_pages):
+                    job = self._next_job()
+                    if job is None:
+                        break
+                    url, depth = job
+                    in_flight[pool.submit(self._fetch, url)] = (url, depth)
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth = in_flight.pop(future)
+                    try:
+                        soup, links = future.result()
+                    except Exception as e:
+                        print(f"Erreur lors du crawl de {url}: {e}")
+                        soup, links = None, []
+
+                    if soup is None:
+                        self.stats['failed'] += 1
+                        if self.job_store is not None:
+                            self.job_store.mark_failed(url, "échec du téléchargement")
+                        continue
+
+                    self.stats['fetched'] += 1
+                    for link in links:
+                        self.add(link, depth + 1)
+                    yield url, depth, soup
+                    # Validé seulement une fois la page traitée par l'appelant
+                    if self.job_store is not None:
+                        self.job_store.mark_done(url)
+
+            if self.job_store is not None:
+                self.job_store.flush()
+
+
+# Exemple d'utilisation
+def exemple_crawl(start_url, max_pages=50):
+    """Exemple de crawl d'un site sur deux niveaux"""
+    from politeness import PolitenessScheduler
+    from web_extraction import WebScraper
+
+    scraper = WebScraper(start_url, scheduler=PolitenessScheduler(rate=2.0, burst=2))
+    crawler = Crawler(scraper, [start_url], max_depth=2, max_pages=max_pages)
+
+    titles = []
+    for url, depth, soup in crawler.crawl():
+        title = soup.find('title')
+        titles.append({'url': url, 'depth': depth, 'title': title.get_text(strip=True) if title else ''})
+        print(f"[{depth}] {url}")
+
+    print(f"Pages récupérées: {crawler.stats['fetched']}, URLs découvertes: {crawler.stats['discovered']}")
+    return titles
+
+
+if __name__ == "__main__":
+    exemple_crawl("https://www.lemonde.fr/")
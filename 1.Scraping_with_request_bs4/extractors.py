@@ -0,0 +1,134 @@
+import re
+from functools import lru_cache
+from urllib.parse import urljoin
+
+import soupsieve
+from bs4 import Tag
+
+from parsers import BeautifulSoupBackend, rows_to_records
+
+# Sélecteurs candidats par champ d'article, du plus spécifique au plus générique
+ARTICLE_SELECTORS = {
+    'title': ['h1', '.title', '#title', '[class*="title"]'],
+    'content': ['.content', '#content', 'article', '.post-content'],
+    'author': ['.author', '.by-author', '[class*="author"]'],
+}
+
+ALL_EXTRACTORS = ('links', 'images', 'article', 'table')
+
+_TAG_SELECTOR = re.compile(r'^[a-zA-Z][a-zA-Z0-9]*$')
+_CLASS_SELECTOR = re.compile(r'^\.([\w-]+)$')
+_ID_SELECTOR = re.compile(r'^#([\w-]+)$')
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector):
+    """Compile un sélecteur CSS en fonction de test élément -> bool.
+
+    Le résultat est mis en cache et réutilisé pour tous les documents. Les
+    formes simples (balise, .classe, #id) évitent le moteur CSS générique.
+    """
+    if _TAG_SELECTOR.match(selector):
+        name = selector.lower()
+        return lambda element: element.name == name
+
+    match = _CLASS_SELECTOR.match(selector)
+    if match:
+        class_name = match.group(1)
+        return lambda element: class_name in (element.get('class') or ())
+
+    match = _ID_SELECTOR.match(selector)
+    if match:
+        element_id = match.group(1)
+        return lambda element: element.get('id') == element_id
+
+    return soupsieve.compile(selector).match
+
+
+class MultiExtractor:
+    """Extraction en une seule passe sur un arbre BeautifulSoup.
+
+    Au lieu d'appeler extract_links, extract_images, parse_article et
+    parse_table (chacun parcourant tout l'arbre, parse_article jusqu'à quatre
+    fois par champ), l'arbre est parcouru une fois et chaque élément est
+    testé contre les extracteurs demandés. Les résultats sont identiques à
+    ceux des méthodes individuelles de WebScraper.
+
+        extractor = MultiExtractor(['links', 'article'])
+        results = extractor.extract(soup, url)
+    """
+
+    def __init__(self, extractors=ALL_EXTRACTORS, article_selectors=None, table_selector='table'):
+        unknown = set(extractors) - set(ALL_EXTRACTORS)
+        if unknown:
+            raise ValueError(f"Extracteurs inconnus: {', '.join(sorted(unknown))}")
+        self.extractors = set(extractors)
+
+        selectors = article_selectors or ARTICLE_SELECTORS
+        self.article_matchers = {
+            field: [compile_selector(selector) for selector in candidates]
+            for field, candidates in selectors.items()
+        }
+        self.table_matcher = compile_selector(table_selector)
+        self._table_backend = BeautifulSoupBackend()
+
+    def extract(self, soup, base_url):
+        """Parcourt l'arbre une fois et renvoie un dict {extracteur: résultat}"""
+        want_links = 'links' in self.extractors
+        want_images = 'images' in self.extractors
+        want_table = 'table' in self.extractors
+        want_article = 'article' in self.extractors
+
+        links, images = [], []
+        table = None
+        # Pour chaque champ : (rang du meilleur sélecteur trouvé, élément)
+        best = {field: (len(matchers), None) for field, matchers in self.article_matchers.items()}
+        open_fields = set(best) if want_article else set()
+
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            name = element.name
+
+            if want_links and name == 'a' and element.has_attr('href'):
+                links.append({
+                    'text': element.get_text(strip=True),
+                    'url': urljoin(base_url, element['href'])
+                })
+            elif want_images and name == 'img':
+                src = element.get('src')
+                if src:
+                    images.append({
+                        'src': urljoin(base_url, src),
+                        'alt': element.get('alt', ''),
+                        'title': element.get('title', '')
+                    })
+
+            if want_table and table is None and self.table_matcher(element):
+                table = element
+
+            for field in list(open_fields):
+                rank = best[field][0]
+                # Premier élément (ordre du document) du sélecteur le mieux classé
+                for candidate, matches in enumerate(self.article_matchers[field][:rank]):
+                    if matches(element):
+                        best[field] = (candidate, element)
+                        if candidate == 0:
+                            open_fields.discard(field)
+                        break
+
+        results = {}
+        if want_links:
+            results['links'] = links
+        if want_images:
+            results['images'] = images
+        if want_article:
+            article = {'title': '', 'content': '', 'author': '', 'date': '', 'url': base_url}
+            for field, (_, element) in best.items():
+                if element is not None:
+                    article[field] = element.get_text(strip=True)
+            results['article'] = article
+        if want_table:
+            results['table'] = (rows_to_records(*self._table_backend.table_element_cells(table))
+                                if table is not None else None)
+        return results
@@ -0,0 +1,167 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from charset import detect_encoding
+from url_utils import normalize_url
+
+
+class HttpCache:
+    """Cache HTTP persistant sur disque avec revalidation conditionnelle.
+
+    Les réponses sont indexées par URL normalisée et stockées dans une base
+    SQLite (corps, ETag, Last-Modified, Cache-Control). Une entrée encore
+    fraîche (max-age) est servie sans requête ; sinon WebScraper envoie
+    If-None-Match / If-Modified-Since et réutilise le corps en cas de 304.
+    La taille totale est bornée par éviction LRU.
+    """
+
+    def __init__(self, directory='.http_cache', max_bytes=200 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, 'cache.sqlite'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                cache_control TEXT,
+                stored_at REAL,
+                last_access REAL,
+                size INTEGER
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._db.commit()
+
+        self.stats = {'hits': 0, 'misses': 0, 'revalidations': 0, 'stores': 0, 'evictions': 0}
+
+    def close(self):
+        self._db.close()
+
+    def lookup(self, url):
+        """Renvoie l'entrée en cache pour l'URL, ou None"""
+        key = normalize_url(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, status, headers, body, etag, last_modified, cache_control, stored_at "
+                "FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+
+        return {
+            'url': row[0],
+            'status': row[1],
+            'headers': json.loads(row[2]),
+            'body': row[3],
+            'etag': row[4],
+            'last_modified': row[5],
+            'cache_control': row[6] or '',
+            'stored_at': row[7],
+        }
+
+    def is_fresh(self, entry):
+        """Vrai si l'entrée peut être servie sans revalidation (Cache-Control max-age)"""
+        cache_control = entry['cache_control'].lower()
+        if 'no-cache' in cache_control:
+            return False
+        match = re.search(r'max-age=(\d+)', cache_control)
+        if not match:
+            return False
+        return time.time() - entry['stored_at'] < int(match.group(1))
+
+    def conditional_headers(self, entry):
+        """En-têtes de revalidation pour une entrée en cache"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def to_response(self, entry, url):
+        """Reconstruit un requests.Response à partir d'une entrée"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.url = url
+        response.encoding = detect_encoding(entry['body'], response.headers.get('Content-Type'))
+        return response
+
+    def hit(self, entry, url):
+        """Sert une entrée fraîche sans requête réseau"""
+        self.stats['hits'] += 1
+        return self.to_response(entry, url)
+
+    def revalidated(self, entry, url, not_modified):
+        """Traite une réponse 304 : rafraîchit l'entrée et renvoie le corps en cache"""
+        self.stats['revalidations'] += 1
+        headers = dict(entry['headers'])
+        # Un 304 peut mettre à jour les métadonnées de fraîcheur
+        for name in ('ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Date'):
+            if name in not_modified.headers:
+                headers[name] = not_modified.headers[name]
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET headers = ?, etag = ?, last_modified = ?, cache_control = ?, stored_at = ? "
+                "WHERE key = ?",
+                (json.dumps(headers), headers.get('ETag'), headers.get('Last-Modified'),
+                 headers.get('Cache-Control'), time.time(), normalize_url(url)),
+            )
+            self._db.commit()
+        entry = dict(entry, headers=headers)
+        return self.to_response(entry, url)
+
+    def store(self, url, response):
+        """Enregistre une réponse complète (compte comme un miss)"""
+        self.stats['misses'] += 1
+        cache_control = response.headers.get('Cache-Control', '')
+        if 'no-store' in cache_control.lower() or response.status_code != 200:
+            return
+
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), url, response.status_code, json.dumps(dict(response.headers)), body,
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), cache_control,
+                 now, now, len(body)),
+            )
+            self.stats['stores'] += 1
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.stats['evictions'] += 1
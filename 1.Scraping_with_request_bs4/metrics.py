@@ -0,0 +1,275 @@
+import bisect
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Bornes des histogrammes (secondes) : de la milliseconde (parsing) à la minute (LLM)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+COUNTER_HELP = {
+    'fetches': "Pages demandées, par résultat",
+    'bytes': "Octets de corps de page reçus",
+    'errors': "Échecs de récupération, par type",
+    'cache_hits': "Pages servies par le cache HTTP (fraîches ou revalidées)",
+}
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in items) + '}'
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Timer:
+    """Chronomètre d'une phase (gestionnaire de contexte)"""
+
+    __slots__ = ('registry', 'phase', 'labels', 'start', 'profiler')
+
+    def __init__(self, registry, phase, labels):
+        self.registry = registry
+        self.phase = phase
+        self.labels = labels
+
+    def __enter__(self):
+        self.profiler = self.registry._start_profile(self.phase)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.phase, time.perf_counter() - self.start, **self.labels)
+        if self.profiler is not None:
+            self.registry._stop_profile(self.profiler)
+
+
+class MetricsRegistry:
+    """Mesures de durée par phase et compteurs, exportables pour Prometheus.
+
+    Chaque phase (dns, connect, ttfb, download, parse, extract, render, crawl,
+    llm...) alimente un histogramme `<namespace>_phase_seconds` étiqueté par
+    phase et par scraper ; les compteurs (octets, erreurs, accès cache...)
+    deviennent `<namespace>_<nom>_total`. Le coût d'une mesure est une
+    recherche dichotomique et une addition sous verrou : on peut le laisser
+    actif en production.
+
+        metrics = MetricsRegistry()
+        scraper = WebScraper("https://example.com", metrics=metrics)
+        ...
+        metrics.write("scraper.prom")      # collecteur textfile de node_exporter
+        metrics.serve(9108)                # ou endpoint /metrics
+
+    `profile_phases` active un profilage cProfile échantillonné : une fraction
+    `profile_sample_rate` des exécutions de ces phases est profilée et les
+    statistiques sont cumulées (voir profile_report).
+    """
+
+    def __init__(self, namespace='scraper', buckets=DEFAULT_BUCKETS, profile_phases=(), profile_sample_rate=0.01):
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self.profile_phases = set(profile_phases)
+        self.profile_sample_rate = profile_sample_rate
+
+        # (phase, étiquettes) -> [effectif par tranche..., effectif +Inf, somme]
+        self._histograms = {}
+        # (nom, étiquettes) -> valeur
+        self._counters = {}
+        self._lock = threading.Lock()
+
+        self._profiling = threading.Lock()
+        self._profile_stats = None
+        self._server = None
+
+    # --- Enregistrement -----------------------------------------------------
+
+    def observe(self, phase, seconds, **labels):
+        """Enregistre la durée d'une phase"""
+        key = (phase, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            histogram[index] += 1
+            histogram[-1] += seconds
+
+    def inc(self, name, value=1, **labels):
+        """Incrémente un compteur"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def timer(self, phase, **labels):
+        """Chronomètre un bloc : `with metrics.timer('parse', scraper='requests'):`"""
+        return _Timer(self, phase, labels)
+
+    def record_fetch(self, result, scraper='requests'):
+        """Enregistre un FetchResult (voir retry.py) : durée, résultat, accès cache, erreurs"""
+        self.observe('fetch', result.elapsed, scraper=scraper)
+        self.inc('fetches', outcome=result.outcome, scraper=scraper)
+        if result.outcome in ('cached', 'revalidated'):
+            self.inc('cache_hits', kind=result.outcome, scraper=scraper)
+        elif not result.ok:
+            self.inc('errors', kind=result.outcome, scraper=scraper)
+
+    # --- Profilage échantillonné --------------------------------------------
+
+    def _start_profile(self, phase):
+        if phase not in self.profile_phases or random.random() >= self.profile_sample_rate:
+            return None
+        # Un seul profil à la fois : cProfile ne supporte pas les profils imbriqués
+        if not self._profiling.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Un autre profileur est déjà actif dans le processus
+            self._profiling.release()
+            return None
+        return profiler
+
+    def _stop_profile(self, profiler):
+        profiler.disable()
+        self._profiling.release()
+        with self._lock:
+            if self._profile_stats is None:
+                self._profile_stats = pstats.Stats(profiler)
+            else:
+                self._profile_stats.add(profiler)
+
+    def profile_report(self, limit=20, sort='cumulative'):
+        """Fonctions les plus coûteuses des exécutions profilées (texte)"""
+        if self._profile_stats is None:
+            return "Aucune exécution profilée"
+        output = io.StringIO()
+        with self._lock:
+            self._profile_stats.stream = output
+            self._profile_stats.sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def dump_profile(self, path):
+        """Sauvegarde les statistiques cumulées (lisibles avec pstats ou snakeviz)"""
+        if self._profile_stats is not None:
+            with self._lock:
+                self._profile_stats.dump_stats(path)
+
+    # --- Export ---------------------------------------------------------------
+
+    def render(self, openmetrics=False):
+        """Exposition au format texte Prometheus (ou OpenMetrics)"""
+        with self._lock:
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+            counters = dict(self._counters)
+
+        name = f"{self.namespace}_phase_seconds"
+        lines = [f"# HELP {name} Durée des phases de scraping en secondes", f"# TYPE {name} histogram"]
+        for (phase, labels), values in sorted(histograms.items()):
+            labels = (('phase', phase),) + labels
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), values[:-1]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_number(bound)))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(values[-1])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+        for counter in sorted({counter for counter, _ in counters}):
+            name = f"{self.namespace}_{counter}"
+            # OpenMetrics : le type porte le nom sans suffixe, les échantillons le suffixe _total
+            declared = name if openmetrics else f"{name}_total"
+            lines.append(f"# HELP {declared} {COUNTER_HELP.get(counter, counter)}")
+            lines.append(f"# TYPE {declared} counter")
+            for (other, labels), value in sorted(counters.items()):
+                if other == counter:
+                    lines.append(f"{name}_total{_format_labels(labels)} {_format_number(value)}")
+
+        if openmetrics:
+            lines.append("# EOF")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path, openmetrics=False):
+        """Écrit l'exposition dans un fichier (remplacement atomique)"""
+        temporary = path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(self.render(openmetrics))
+        os.replace(temporary, path)
+
+    def serve(self, port=9108, host='0.0.0.0'):
+        """Sert /metrics dans un thread d'arrière-plan (format choisi selon l'en-tête Accept)"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                body = registry.render(openmetrics).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def aiohttp_trace_config(metrics, scraper='async'):
+    """TraceConfig aiohttp mesurant les phases DNS, connexion et TTFB de chaque requête"""
+    import aiohttp
+
+    async def on_request_start(session, context, params):
+        context.start = time.perf_counter()
+
+    async def on_dns_resolvehost_start(session, context, params):
+        context.dns_start = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, context, params):
+        metrics.observe('dns', time.perf_counter() - context.dns_start, scraper=scraper)
+
+    async def on_connection_create_start(session, context, params):
+        context.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, context, params):
+        metrics.observe('connect', time.perf_counter() - context.connect_start, scraper=scraper)
+
+    async def on_request_end(session, context, params):
+        # En-têtes de réponse reçus : DNS et connexion inclus pour une nouvelle connexion
+        metrics.observe('ttfb', time.perf_counter() - context.start, scraper=scraper)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
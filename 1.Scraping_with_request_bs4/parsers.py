@@ -0,0 +1,153 @@
+from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+
+# Backend rapide optionnel (pip install selectolax)
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+class BeautifulSoupBackend:
+    """Backend BeautifulSoup, avec le parseur pur Python ('html.parser') ou 'lxml'"""
+
+    def __init__(self, features='html.parser'):
+        self.name = features
+        self.features = features
+
+    def parse(self, html_content):
+        soup = BeautifulSoup(html_content, self.features)
+        # Contenu de <template> inerte (jamais affiché) : retiré pour que ses liens
+        # ne soient pas extraits, comme avec lexbor qui le place hors du document
+        for template in soup.find_all('template'):
+            template.decompose()
+        return soup
+
+    def iter_links(self, doc):
+        """Renvoie (href, texte) pour chaque lien <a href>"""
+        for link in doc.find_all('a', href=True):
+            yield link['href'], link.get_text(strip=True)
+
+    def iter_images(self, doc):
+        """Renvoie (src, alt, title) pour chaque image"""
+        for img in doc.find_all('img'):
+            yield img.get('src'), img.get('alt', ''), img.get('title', '')
+
+    def select_text(self, doc, selector):
+        """Texte du premier élément correspondant au sélecteur CSS, ou None"""
+        element = doc.select_one(selector)
+        return element.get_text(strip=True) if element else None
+
+    def table_cells(self, doc, selector):
+        """Renvoie (en-têtes, lignes) du premier tableau correspondant, ou None.
+
+        Les lignes de données sont les <tr> du tableau hors <thead> et <tfoot>,
+        chaque ligne étant la liste des textes de ses cellules.
+        """
+        table = doc.select_one(selector)
+        if not table:
+            return None
+        return self.table_element_cells(table)
+
+    def table_element_cells(self, table):
+        """Renvoie (en-têtes, lignes) d'un élément <table> déjà localisé"""
+        headers = []
+        thead = table.find('thead')
+        if thead:
+            headers = [cell.get_text(strip=True) for cell in thead.find_all(['th', 'td'])]
+
+        rows = []
+        for row in table.find_all('tr'):
+            section = row.find_parent(['thead', 'tfoot', 'table'])
+            if section is not None and section.name != 'table':
+                continue
+            rows.append([cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])])
+        return headers, rows
+
+
+class SelectolaxBackend:
+    """Backend rapide basé sur lexbor (selectolax), même interface que BeautifulSoupBackend"""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        if LexborHTMLParser is None:
+            raise ImportError("Le backend 'selectolax' nécessite : pip install selectolax")
+
+    def parse(self, html_content):
+        if isinstance(html_content, bytes):
+            # Même détection d'encodage que BeautifulSoup pour des résultats identiques
+            html_content = UnicodeDammit(html_content, is_html=True).unicode_markup
+        doc = LexborHTMLParser(html_content)
+        # get_text de BeautifulSoup ignore scripts et styles : retirés une fois pour toutes
+        # pour que le texte extrait soit identique sur tous les backends (le contenu des
+        # <template> est déjà hors du document pour lexbor)
+        doc.strip_tags(['script', 'style'])
+        return doc
+
+    @staticmethod
+    def _text(node):
+        return node.text(deep=True, separator='', strip=True)
+
+    def iter_links(self, doc):
+        for link in doc.css('a[href]'):
+            yield link.attributes.get('href') or '', self._text(link)
+
+    def iter_images(self, doc):
+        for img in doc.css('img'):
+            attributes = img.attributes
+            yield attributes.get('src'), attributes.get('alt', ''), attributes.get('title', '')
+
+    def select_text(self, doc, selector):
+        element = doc.css_first(selector)
+        return self._text(element) if element is not None else None
+
+    @staticmethod
+    def _cells(row):
+        return [node for node in row.traverse(include_text=False) if node.tag in ('td', 'th')]
+
+    def table_cells(self, doc, selector):
+        table = doc.css_first(selector)
+        if table is None:
+            return None
+
+        headers = []
+        thead = table.css_first('thead')
+        if thead is not None:
+            headers = [self._text(cell) for cell in self._cells(thead)]
+
+        rows = []
+        for row in table.css('tr'):
+            parent = row.parent
+            while parent is not None and parent.tag not in ('thead', 'tfoot', 'table'):
+                parent = parent.parent
+            if parent is not None and parent.tag != 'table':
+                continue
+            rows.append([self._text(cell) for cell in self._cells(row)])
+        return headers, rows
+
+
+def rows_to_records(headers, rows):
+    """Associe chaque ligne aux en-têtes, avec repli sur column_{i}"""
+    records = []
+    for cells in rows:
+        if cells:  # Ignorer les lignes vides
+            records.append({
+                (headers[i] if i < len(headers) else f'column_{i}'): cell
+                for i, cell in enumerate(cells)
+            })
+    return records
+
+
+PARSER_BACKENDS = {
+    'html.parser': lambda: BeautifulSoupBackend('html.parser'),
+    'lxml': lambda: BeautifulSoupBackend('lxml'),
+    'selectolax': SelectolaxBackend,
+}
+
+
+def get_parser_backend(name):
+    """Instancie un backend de parsing à partir de son nom"""
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Parseur inconnu: {name} (disponibles: {', '.join(PARSER_BACKENDS)})")
+    return PARSER_BACKENDS[name]()
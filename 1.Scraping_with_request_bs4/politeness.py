@@ -0,0 +1,268 @@
+import asyncio
+import heapq
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+
+def host_of(url):
+    """Renvoie l'hôte (netloc) normalisé d'une URL"""
+    return urlparse(url).netloc.lower()
+
+
+class TokenBucket:
+    """Seau à jetons : `rate` requêtes par seconde en régime établi, `burst` en rafale"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Délai avant qu'un jeton soit disponible, sans le consommer"""
+        self._refill(now)
+        wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        return max(wait, self.blocked_until - now)
+
+    def reserve(self, now):
+        """Réserve un jeton et renvoie le délai à attendre avant de l'utiliser.
+
+        Le solde peut devenir négatif : les appelants suivants attendent
+        d'autant plus longtemps, ce qui garantit le débit même en concurrence.
+        """
+        wait = self.wait_time(now)
+        self.tokens -= 1
+        if self.blocked_until > now:
+            # Le jeton sera consommé à la fin du blocage, pas maintenant
+            self.tokens = min(self.tokens, 0.0)
+        return wait
+
+    def set_rate(self, rate, burst=None):
+        self._refill(time.monotonic())
+        self.rate = rate
+        if burst is not None:
+            self.burst = burst
+            self.tokens = min(self.tokens, burst)
+
+
+class PolitenessScheduler:
+    """Ordonnanceur de politesse partagé entre WebScraper et SeleniumScraper.
+
+    Chaque hôte dispose de son propre seau à jetons (débit et rafale
+    configurables, éventuellement par hôte). Le Crawl-delay de robots.txt et
+    les en-têtes Retry-After ralentissent ou bloquent temporairement l'hôte
+    concerné. Deux modes d'utilisation :
+
+    - acquire(url) / aacquire(url) avant chaque requête : attend le temps
+      nécessaire pour cet hôte uniquement ;
+    - add(url) puis next_url() : file d'attente multi-hôtes qui renvoie
+      toujours l'URL prête le plus tôt, le débit total croît donc avec le
+      nombre d'hôtes tandis que la charge de chacun reste bornée.
+    """
+
+    def __init__(self, rate=1.0, burst=1, host_limits=None, respect_robots=True, user_agent='*',
+                 robots_timeout=5):
+        self.rate = rate
+        self.burst = burst
+        # {hôte: (rate, burst)} pour surcharger les valeurs par défaut
+        self.host_limits = host_limits or {}
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self.robots_timeout = robots_timeout
+
+        self._buckets = {}
+        self._robots_checked = set()
+        self._lock = threading.Lock()
+
+        # File d'attente multi-hôtes
+        self._pending = {}
+        self._ready_heap = []
+        self._counter = 0
+        # URLs sorties de la file dont le créneau est déjà réservé
+        self._granted = {}
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.host_limits.get(host, (self.rate, self.burst))
+            bucket = TokenBucket(rate, burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    # --- Règles issues du site --------------------------------------------
+
+    def set_crawl_delay(self, host, delay):
+        """Limite l'hôte à une requête toutes les `delay` secondes"""
+        if delay and delay > 0:
+            with self._lock:
+                bucket = self._bucket(host)
+                bucket.set_rate(min(bucket.rate, 1.0 / delay), burst=1)
+
+    def _check_robots(self, url):
+        """Lit le Crawl-delay de robots.txt une seule fois par hôte"""
+        host = host_of(url)
+        if not self.respect_robots:
+            return
+        with self._lock:
+            if host in self._robots_checked:
+                return
+            self._robots_checked.add(host)
+
+        # Lecture avec délai maximal : RobotFileParser.read() peut bloquer indéfiniment
+        parsed = urlparse(url)
+        try:
+            response = requests.get(f"{parsed.scheme}://{parsed.netloc}/robots.txt", timeout=self.robots_timeout)
+        except requests.exceptions.RequestException as e:
+            print(f"robots.txt illisible pour {host}: {e}")
+            return
+        if not response.ok:
+            # Pas de robots.txt exploitable : aucun Crawl-delay à appliquer
+            return
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+        self.set_crawl_delay(host, parser.crawl_delay(self.user_agent))
+
+    def register_retry_after(self, url, retry_after):
+        """Bloque l'hôte selon un en-tête Retry-After (secondes ou date HTTP)"""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return
+        if delay <= 0:
+            return
+
+        with self._lock:
+            bucket = self._bucket(host_of(url))
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+
+    # --- Mode requête par requête -----------------------------------------
+
+    def reserve(self, url):
+        """Réserve un créneau pour l'URL et renvoie le délai à attendre"""
+        self._check_robots(url)
+        with self._lock:
+            granted = self._granted.get(url)
+            if granted:
+                # Créneau déjà attribué par next_url()
+                if granted == 1:
+                    del self._granted[url]
+                else:
+                    self._granted[url] = granted - 1
+                return 0.0
+            return self._bucket(host_of(url)).reserve(time.monotonic())
+
+    def release(self, url):
+        """Abandonne le créneau attribué par next_url() à une URL finalement non requêtée"""
+        with self._lock:
+            granted = self._granted.get(url)
+            if granted == 1:
+                del self._granted[url]
+            elif granted:
+                self._granted[url] = granted - 1
+
+    def acquire(self, url):
+        """Attend que l'hôte de l'URL puisse recevoir une requête"""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, url):
+        """Équivalent asyncio de acquire()"""
+        loop = asyncio.get_running_loop()
+        wait = await loop.run_in_executor(None, self.reserve, url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # --- Mode file d'attente multi-hôtes ----------------------------------
+
+    def add(self, url):
+        """Ajoute une URL à la file d'attente"""
+        host = host_of(url)
+        with self._lock:
+            queue = self._pending.get(host)
+            if queue is None:
+                queue = self._pending[host] = deque()
+            if not queue:
+                self._push_host(host, time.monotonic())
+            queue.append(url)
+
+    def _push_host(self, host, now):
+        self._counter += 1
+        ready_at = now + self._bucket(host).wait_time(now)
+        heapq.heappush(self._ready_heap, (ready_at, self._counter, host))
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(queue) for queue in self._pending.values())
+
+    def next_url(self, block=True):
+        """Renvoie la prochaine URL prête, tous hôtes confondus.
+
+        Attend si aucun hôte n'est encore prêt (sauf si block=False, auquel
+        cas renvoie None). Renvoie None quand la file est vide. Le créneau de
+        l'URL renvoyée est réservé : le acquire() qui suit ne la retarde pas.
+        """
+        self._check_pending_robots()
+        while True:
+            with self._lock:
+                if not self._ready_heap:
+                    return None
+
+                ready_at, _, host = self._ready_heap[0]
+                now = time.monotonic()
+                bucket = self._bucket(host)
+                wait = bucket.wait_time(now)
+                if wait > 0 and now + wait > ready_at + 1e-6:
+                    # L'hôte a été ralenti entre-temps (Retry-After, Crawl-delay)
+                    self._counter += 1
+                    heapq.heapreplace(self._ready_heap, (now + wait, self._counter, host))
+                    continue
+
+                if wait <= 0:
+                    heapq.heappop(self._ready_heap)
+                    bucket.reserve(now)
+                    queue = self._pending[host]
+                    url = queue.popleft()
+                    self._granted[url] = self._granted.get(url, 0) + 1
+                    if queue:
+                        self._push_host(host, now)
+                    else:
+                        del self._pending[host]
+                    return url
+
+                delay = wait
+
+            if not block:
+                return None
+            time.sleep(delay)
+
+    def _check_pending_robots(self):
+        if not self.respect_robots:
+            return
+        with self._lock:
+            unchecked = [queue[0] for host, queue in self._pending.items()
+                         if host not in self._robots_checked and queue]
+        for url in unchecked:
+            self._check_robots(url)
+
+    def __iter__(self):
+        """Itère sur les URLs de la file au rythme autorisé"""
+        while True:
+            url = self.next_url()
+            if url is None:
+                return
+            yield url
@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+# Erreurs réseau transitoires : la même requête a une chance d'aboutir plus tard
+RETRYABLE_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+# Erreurs définitives malgré leur type (certificat invalide, URL mal formée...)
+FATAL_EXCEPTIONS = (requests.exceptions.SSLError, requests.exceptions.InvalidURL,
+                    requests.exceptions.InvalidSchema, requests.exceptions.MissingSchema,
+                    requests.exceptions.TooManyRedirects)
+
+
+class FetchResult:
+    """Résultat structuré d'une récupération de page.
+
+    `outcome` vaut 'success', 'cached', 'revalidated', 'http_error',
+    'network_error', 'circuit_open' ou 'rejected' (type de contenu non
+    accepté ou page trop volumineuse).
+    """
+
+    def __init__(self, url, outcome, response=None, status_code=None, error=None,
+                 attempts=0, elapsed=0.0, retryable=False):
+        self.url = url
+        self.outcome = outcome
+        self.response = response
+        self.status_code = status_code
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.retryable = retryable
+
+    @property
+    def ok(self):
+        return self.outcome in ('success', 'cached', 'revalidated')
+
+    def __repr__(self):
+        return (f"FetchResult(url={self.url!r}, outcome={self.outcome!r}, status_code={self.status_code}, "
+                f"attempts={self.attempts}, error={self.error!r})")
+
+
+def parse_retry_after(value):
+    """Convertit un en-tête Retry-After (secondes ou date HTTP) en secondes, ou None"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class RetryPolicy:
+    """Politique de nouvelle tentative avec backoff exponentiel et jitter.
+
+    Sont retentées : les erreurs réseau transitoires et les statuts de
+    `retry_statuses`. Les autres erreurs (404, SSL, URL invalide...) sont
+    définitives. Un Retry-After du serveur remplace le backoff calculé
+    (plafonné à `max_retry_after`).
+    """
+
+    def __init__(self, max_attempts=3, backoff_base=0.5, backoff_max=30.0,
+                 retry_statuses=(429, 500, 502, 503, 504), max_retry_after=120.0):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = set(retry_statuses)
+        self.max_retry_after = max_retry_after
+
+    def is_retryable(self, status_code=None, exception=None):
+        if exception is not None:
+            return isinstance(exception, RETRYABLE_EXCEPTIONS) and not isinstance(exception, FATAL_EXCEPTIONS)
+        return status_code in self.retry_statuses
+
+    def delay(self, attempt, retry_after=None):
+        """Délai avant la tentative suivante (attempt commence à 1)"""
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        # "Full jitter" : évite que tous les workers relancent en même temps
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Disjoncteur par hôte : coupe les requêtes vers un hôte qui échoue en boucle.
+
+    Après `failure_threshold` échecs consécutifs, l'hôte est ouvert : les
+    requêtes sont refusées immédiatement pendant `reset_timeout` secondes.
+    Ensuite une seule requête d'essai passe (semi-ouvert) ; si elle réussit
+    le circuit se referme, sinon il se rouvre.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url):
+        return urlparse(url).netloc.lower()
+
+    def allow(self, url):
+        """Vrai si une requête vers l'hôte de l'URL peut être envoyée"""
+        with self._lock:
+            state = self._hosts.get(self._host(url))
+            if state is None or state['opened_at'] is None:
+                return True
+            if state['probing']:
+                return False
+            if time.monotonic() - state['opened_at'] >= self.reset_timeout:
+                state['probing'] = True
+                return True
+            return False
+
+    def record_success(self, url):
+        with self._lock:
+            self._hosts.pop(self._host(url), None)
+
+    def record_failure(self, url):
+        with self._lock:
+            state = self._hosts.setdefault(self._host(url), {'failures': 0, 'opened_at': None, 'probing': False})
+            state['failures'] += 1
+            if state['probing'] or state['failures'] >= self.failure_threshold:
+                state['opened_at'] = time.monotonic()
+                state['probing'] = False
+
+    def open_hosts(self):
+        """Liste des hôtes actuellement coupés"""
+        with self._lock:
+            return [host for host, state in self._hosts.items() if state['opened_at'] is not None]
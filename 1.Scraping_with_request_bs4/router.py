@@ -0,0 +1,184 @@
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+# Racines d'applications JavaScript (React, Vue, Next, Nuxt, Angular...) livrées vides
+EMPTY_APP_ROOT = re.compile(
+    r'<(?:div|main|app-root)[^>]*(?:id|class)=["\']?(?:root|app|__next|__nuxt|main-app|app-root)["\' ][^>]*>\s*'
+    r'</(?:div|main|app-root)>', re.IGNORECASE)
+NOSCRIPT_WARNING = re.compile(
+    r'<noscript[^>]*>(?:(?!</noscript).){0,500}?(?:enable javascript|javascript is required|requires javascript|'
+    r'activer (?:le )?javascript|javascript (?:est )?(?:requis|nécessaire))', re.IGNORECASE | re.DOTALL)
+INVISIBLE_BLOCKS = re.compile(r'<(script|style|noscript|template|svg)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+TAGS = re.compile(r'<[^>]+>')
+SPACES = re.compile(r'\s+')
+
+STATIC, RENDERED = 'static', 'rendered'
+
+
+def visible_text_length(html):
+    """Longueur approximative du texte visible (sans scripts, styles ni balises)"""
+    text = TAGS.sub(' ', INVISIBLE_BLOCKS.sub(' ', html))
+    return len(SPACES.sub(' ', text).strip())
+
+
+def rendering_reason(html, scraper=None, expected_selectors=(), min_text_ratio=0.02, min_text_chars=500):
+    """Renvoie la raison pour laquelle la page semble nécessiter un navigateur, ou None.
+
+    Indices vérifiés, du moins coûteux au plus coûteux : racine d'application
+    vide, message <noscript> demandant JavaScript, peu de texte visible
+    (moins de `min_text_chars` caractères et moins de `min_text_ratio` du
+    HTML), puis sélecteurs attendus absents ou vides (parsing avec le
+    backend de `scraper`).
+    """
+    if EMPTY_APP_ROOT.search(html):
+        return "racine d'application vide"
+    if NOSCRIPT_WARNING.search(html):
+        return "JavaScript requis (noscript)"
+
+    text_length = visible_text_length(html)
+    if text_length < min_text_chars and text_length < min_text_ratio * len(html):
+        return f"peu de texte visible ({text_length} caractères pour {len(html)} de HTML)"
+
+    if expected_selectors and scraper is not None:
+        doc = scraper.parse_html(html)
+        for selector in expected_selectors:
+            if not scraper.parser.select_text(doc, selector):
+                return f"sélecteur attendu absent : {selector}"
+    return None
+
+
+def selenium_renderer(selenium_scraper):
+    """Adapte un SeleniumScraper (2.Scraping_with_selenium) en renderer : url -> HTML rendu"""
+    def render(url):
+        if not selenium_scraper.get_page(url):
+            return None
+        return selenium_scraper.driver.page_source
+    return render
+
+
+class RoutedPage:
+    """Page obtenue par le routeur, avec le chemin emprunté"""
+
+    def __init__(self, url, html=None, mode=STATIC, reason=None, fetch_result=None):
+        self.url = url
+        self.html = html
+        # 'static' (requête HTTP simple) ou 'rendered' (navigateur)
+        self.mode = mode
+        # Pourquoi le rendu a été jugé nécessaire (None en statique)
+        self.reason = reason
+        self.fetch_result = fetch_result
+
+    @property
+    def ok(self):
+        return self.html is not None
+
+    def __repr__(self):
+        return f"RoutedPage(url={self.url!r}, mode={self.mode!r}, reason={self.reason!r})"
+
+
+class FetchRouter:
+    """Choisit entre la requête HTTP simple et le navigateur, site par site.
+
+    Chaque page est d'abord demandée avec WebScraper ; si son contenu semble
+    nécessiter JavaScript (voir rendering_reason), elle est rendue par
+    `renderer(url)` (navigateur, crawl4ai...) qui renvoie le HTML. La
+    décision est mémorisée par domaine (ou par domaine + premiers segments
+    de chemin avec `path_depth`) : les domaines connus comme dynamiques
+    passent directement par le navigateur, et sont re-testés en statique
+    toutes les `reprobe_after` secondes au cas où le site aurait changé.
+
+        router = FetchRouter(WebScraper("https://example.com"), selenium_renderer(selenium_scraper),
+                             state_path="routes.json")
+        page = router.fetch(url)
+        soup = router.scraper.parse_html(page.html)
+
+    Avec `state_path`, les décisions sont relues au démarrage et sauvegardées
+    par save().
+    """
+
+    def __init__(self, scraper, renderer, expected_selectors=(), path_depth=0, reprobe_after=24 * 3600,
+                 min_text_ratio=0.02, min_text_chars=500, state_path=None):
+        self.scraper = scraper
+        self.renderer = renderer
+        self.expected_selectors = tuple(expected_selectors)
+        self.path_depth = path_depth
+        self.reprobe_after = reprobe_after
+        self.min_text_ratio = min_text_ratio
+        self.min_text_chars = min_text_chars
+        self.state_path = state_path
+
+        self.routes = {}
+        self.stats = {STATIC: 0, RENDERED: 0, 'escalations': 0, 'reprobes': 0}
+        self._lock = threading.Lock()
+        if state_path and os.path.exists(state_path):
+            with open(state_path, encoding='utf-8') as f:
+                self.routes = json.load(f)
+
+    def route_key(self, url):
+        """Clé de mémorisation : domaine, plus `path_depth` segments de chemin"""
+        parsed = urlparse(url)
+        key = (parsed.hostname or '').lower()
+        if self.path_depth:
+            segments = [segment for segment in parsed.path.split('/') if segment][:self.path_depth]
+            key += '/' + '/'.join(segments)
+        return key
+
+    def _decide(self, key, mode, reason=None):
+        with self._lock:
+            self.routes[key] = {'mode': mode, 'reason': reason, 'decided_at': time.time()}
+
+    def _route(self, key):
+        """Chemin à essayer en premier pour cette clé"""
+        with self._lock:
+            route = self.routes.get(key)
+        if route is None or route['mode'] == STATIC:
+            return STATIC
+        if time.time() - route['decided_at'] >= self.reprobe_after:
+            with self._lock:
+                self.stats['reprobes'] += 1
+            return STATIC
+        return RENDERED
+
+    def fetch(self, url):
+        """Récupère une page par le chemin le moins coûteux qui donne le contenu"""
+        key = self.route_key(url)
+        reason = None
+        result = None
+
+        if self._route(key) == STATIC:
+            result = self.scraper.fetch(url)
+            if not result.ok:
+                return RoutedPage(url, mode=STATIC, fetch_result=result)
+            html = result.response.text
+            reason = rendering_reason(html, self.scraper, self.expected_selectors,
+                                      self.min_text_ratio, self.min_text_chars)
+            if reason is None:
+                self._decide(key, STATIC)
+                with self._lock:
+                    self.stats[STATIC] += 1
+                return RoutedPage(url, html, STATIC, fetch_result=result)
+            with self._lock:
+                self.stats['escalations'] += 1
+            self._decide(key, RENDERED, reason)
+        else:
+            reason = self.routes[key]['reason']
+
+        html = self.renderer(url)
+        with self._lock:
+            self.stats[RENDERED] += 1
+        return RoutedPage(url, html, RENDERED, reason, fetch_result=result)
+
+    def save(self):
+        """Sauvegarde les décisions par domaine dans `state_path`"""
+        if not self.state_path:
+            return
+        with self._lock:
+            routes = dict(self.routes)
+        temporary = self.state_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(routes, f, indent=2)
+        os.replace(temporary, self.state_path)
@@ -0,0 +1,282 @@
+import csv
+import gzip
+import json
+import os
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+
+
+def _infer_format(path):
+    stem, extension = os.path.splitext(path)
+    if extension == '.gz':
+        extension = os.path.splitext(stem)[1]
+    if extension not in FORMATS:
+        raise ValueError(f"Format inconnu pour {path} (extensions: {', '.join(FORMATS)})")
+    return FORMATS[extension]
+
+
+def _open_text(path, mode, compression):
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+class ResultSink:
+    """Écriture incrémentale de résultats en CSV, JSON Lines ou Parquet.
+
+    Accepte un enregistrement à la fois (ou un itérable via write_all) et
+    écrit par lots de `batch_size` : seul le lot courant est en mémoire. Les
+    nouveaux champs apparus en cours de route sont gérés :
+
+    - CSV : le fichier est réécrit (en flux, sur disque) avec l'en-tête élargi ;
+    - JSON Lines : chaque ligne porte ses propres clés ;
+    - Parquet : un nouveau fichier est ouvert avec le schéma élargi ; le
+      premier devient `<nom>-000.parquet`, les suivants `<nom>-001.parquet`...
+      (l'ordre alphabétique est l'ordre d'écriture). Les colonnes d'un lot
+      sont l'union des clés de tous ses enregistrements, et une colonne aux
+      types incompatibles (int et str...) est écrite en texte. Les parties
+      n'ont pas toutes le même schéma : les relire avec le schéma unifié,
+      `sink.dataset()` ou `ds.dataset(sink.parquet_paths, schema=sink.schema)`.
+
+    `compression='gzip'` compresse le CSV / JSON Lines ; pour Parquet, la
+    valeur est transmise à pyarrow ('snappy', 'zstd', 'gzip'...).
+
+        with ResultSink("resultats.jsonl.gz", compression='gzip') as sink:
+            sink.write_all(scraper.stream_table_data(url))
+
+    Pour la reprise après incident (voir checkpoint.py), `resume_offset`
+    tronque un fichier CSV / JSON Lines non compressé à la dernière position
+    validée puis reprend l'écriture à la suite. JSON Lines est préférable
+    pour les longs lots : l'élargissement d'en-tête CSV réécrit le fichier.
+    """
+
+    def __init__(self, path, format=None, compression=None, batch_size=1000, resume_offset=None):
+        self.path = path
+        self.format = format or _infer_format(path)
+        if path.endswith('.gz') and compression is None and self.format != 'parquet':
+            compression = 'gzip'
+        self.compression = compression
+        self.batch_size = batch_size
+        self.resume_offset = resume_offset
+        self.count = 0
+
+        self._batch = []
+        self._file = None
+        self._writer = None
+        self._fieldnames = []
+        self._parquet_schema = None
+        self._parquet_part = 0
+        # Fichiers Parquet écrits, dans l'ordre
+        self.parquet_paths = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, record):
+        """Ajoute un enregistrement (dict, ou liste de valeurs pour le CSV)"""
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_all(self, records):
+        """Consomme un itérable d'enregistrements au fil de l'eau"""
+        for record in records:
+            self.write(record)
+        self.flush()
+
+    def flush(self):
+        """Écrit le lot en attente"""
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        getattr(self, f'_write_{self.format}')(batch)
+        self.count += len(batch)
+
+    def checkpoint(self):
+        """Écrit le lot en attente, force l'écriture disque et renvoie la taille du fichier"""
+        self._check_resumable()
+        self.flush()
+        if self._file is None:
+            return self.resume_offset or 0
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return os.path.getsize(self.path)
+
+    def _check_resumable(self):
+        if self.format == 'parquet' or self.compression:
+            raise ValueError("La reprise n'est possible qu'en CSV / JSON Lines non compressé")
+
+    def _open_output(self):
+        """Ouvre le fichier de sortie ; renvoie True s'il s'agit d'une reprise"""
+        if self.resume_offset:
+            self._check_resumable()
+            # Supprime ce qui a été écrit après le dernier point de reprise validé
+            with open(self.path, 'r+b') as f:
+                f.truncate(self.resume_offset)
+            self._file = _open_text(self.path, 'a', None)
+            return True
+        self._file = _open_text(self.path, 'w', self.compression)
+        return False
+
+    def close(self):
+        self.flush()
+        if self._writer is not None and self.format == 'parquet':
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+            if self.format != 'parquet' and not self.compression:
+                # Position de reprise pour un checkpoint() après fermeture
+                self.resume_offset = os.path.getsize(self.path)
+        self._file = self._writer = None
+
+    # --- CSV ---------------------------------------------------------------
+
+    def _write_csv(self, batch):
+        if not isinstance(batch[0], dict):
+            # Lignes brutes (listes), comme l'ancien save_to_csv
+            if self._file is None:
+                self._open_output()
+                self._writer = csv.writer(self._file)
+            self._writer.writerows(batch)
+            return
+
+        new_fields = []
+        known = set(self._fieldnames)
+        for record in batch:
+            for key in record:
+                if key not in known:
+                    known.add(key)
+                    new_fields.append(key)
+
+        if self._file is None:
+            if self._open_output():
+                with open(self.path, encoding='utf-8', newline='') as f:
+                    self._fieldnames = next(csv.reader(f), [])
+                new_fields = [field for field in new_fields if field not in self._fieldnames]
+                self._writer = csv.DictWriter(self._file, fieldnames=self._fieldnames)
+            else:
+                self._fieldnames = new_fields
+                new_fields = []
+                self._writer = csv.DictWriter(self._file, fieldnames=self._fieldnames)
+                self._writer.writeheader()
+        if new_fields:
+            self._widen_csv(self._fieldnames + new_fields)
+
+        self._writer.writerows(batch)
+
+    def _widen_csv(self, fieldnames):
+        """Réécrit le CSV déjà produit avec un en-tête élargi (copie en flux)"""
+        self._file.close()
+        temporary = self.path + '.tmp'
+        with _open_text(self.path, 'r', self.compression) as source, \
+                _open_text(temporary, 'w', self.compression) as target:
+            writer = csv.DictWriter(target, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in csv.DictReader(source):
+                writer.writerow(row)
+        os.replace(temporary, self.path)
+
+        self._fieldnames = fieldnames
+        self._file = _open_text(self.path, 'a', self.compression)
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+
+    # --- JSON Lines ---------------------------------------------------------
+
+    def _write_jsonl(self, batch):
+        if self._file is None:
+            self._open_output()
+        self._file.write(''.join(json.dumps(record, ensure_ascii=False, default=str) + '\n'
+                                 for record in batch))
+
+    # --- Parquet ------------------------------------------------------------
+
+    @property
+    def schema(self):
+        """Schéma Parquet unifié de toutes les parties écrites (None avant le premier lot)"""
+        return self._parquet_schema
+
+    def dataset(self):
+        """Parties Parquet relues comme un seul pyarrow.dataset, avec le schéma unifié"""
+        import pyarrow.dataset as ds
+        return ds.dataset(self.parquet_paths, schema=self._parquet_schema, format='parquet')
+
+    def _parquet_part_path(self, part):
+        stem, extension = os.path.splitext(self.path)
+        return f"{stem}-{part:03d}{extension}"
+
+    def _write_parquet(self, batch):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Le format Parquet nécessite : pip install pyarrow")
+
+        # Colonnes : union des clés de tous les enregistrements du lot (pas seulement du premier)
+        names = list(dict.fromkeys(key for record in batch for key in record))
+        columns = {name: _parquet_column(pa, [record.get(name) for record in batch]) for name in names}
+        schema = pa.schema([(name, column.type) for name, column in columns.items()])
+
+        if self._parquet_schema is not None:
+            schema = _merge_parquet_schemas(pa, self._parquet_schema, schema)
+            if not schema.equals(self._parquet_schema):
+                # Schéma élargi : nouveau fichier avec le schéma unifié
+                self._writer.close()
+                if self._parquet_part == 0:
+                    # Première partie renommée <nom>-000 : le tri des noms suit l'ordre d'écriture
+                    os.replace(self.path, self._parquet_part_path(0))
+                    self.parquet_paths[0] = self._parquet_part_path(0)
+                self._parquet_part += 1
+                self._writer = None
+        if self._writer is None:
+            self._parquet_schema = schema
+            path = self._parquet_part_path(self._parquet_part) if self._parquet_part else self.path
+            self._writer = pq.ParquetWriter(path, schema, compression=self.compression or 'snappy')
+            self.parquet_paths.append(path)
+
+        table = pa.table([_cast_parquet_column(pa, columns.get(field.name), field.type, len(batch))
+                          for field in schema], schema=schema)
+        self._writer.write_table(table)
+
+
+def _parquet_text(values):
+    """Valeurs converties en texte (None conservé), pour les colonnes aux types incompatibles"""
+    return [value if value is None or isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+            for value in values]
+
+
+def _parquet_column(pa, values):
+    """Colonne Arrow d'un lot ; types incompatibles dans le lot (int et str...) : colonne texte"""
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return pa.array(_parquet_text(values), pa.string())
+
+
+def _merge_parquet_schemas(pa, current, new):
+    """Schéma courant élargi aux colonnes du lot ; un conflit de types non promouvable donne une colonne texte"""
+    fields = []
+    for field in current:
+        if field.name in new.names and not new.field(field.name).type.equals(field.type):
+            try:
+                field = pa.unify_schemas([pa.schema([field]), pa.schema([new.field(field.name)])],
+                                         promote_options='permissive').field(0)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                field = pa.field(field.name, pa.string())
+        fields.append(field)
+    fields.extend(field for field in new if field.name not in current.names)
+    return pa.schema(fields)
+
+
+def _cast_parquet_column(pa, column, target_type, length):
+    """Colonne convertie au type du schéma (colonne absente du lot : valeurs nulles)"""
+    if column is None:
+        return pa.nulls(length, target_type)
+    if column.type.equals(target_type):
+        return column
+    try:
+        return column.cast(target_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return pa.array(_parquet_text(column.to_pylist()), target_type)
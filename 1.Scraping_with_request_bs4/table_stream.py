@@ -0,0 +1,212 @@
+import re
+
+from lxml import etree
+
+_SIMPLE_SELECTOR = re.compile(r'^(?P<tag>[a-zA-Z][a-zA-Z0-9]*)?(?P<rest>(?:[.#][\w-]+)*)$')
+
+
+def _compile_table_selector(selector):
+    """Compile un sélecteur simple (balise, #id, .classe combinés) en test sur un élément lxml.
+
+    Le parsing en flux ne connaît pas la suite du document : seuls les
+    sélecteurs portant sur l'élément <table> lui-même sont acceptés.
+    """
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match or not (match.group('tag') or match.group('rest')):
+        raise ValueError(f"Sélecteur non supporté en mode flux: {selector!r} "
+                         "(utiliser balise, #id et/ou .classe)")
+
+    tag = (match.group('tag') or 'table').lower()
+    ids = re.findall(r'#([\w-]+)', match.group('rest'))
+    classes = re.findall(r'\.([\w-]+)', match.group('rest'))
+
+    def matches(element):
+        if element.tag != tag:
+            return False
+        if ids and element.get('id') not in ids:
+            return False
+        element_classes = (element.get('class') or '').split()
+        return all(name in element_classes for name in classes)
+
+    return matches
+
+
+# Éléments dont le texte n'est pas du contenu (exclus aussi par get_text de BeautifulSoup)
+_NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+def _cell_text(element):
+    """Équivalent de get_text(strip=True) de BeautifulSoup (scripts, styles et commentaires exclus)"""
+    parts = []
+
+    def collect(node):
+        if node.text:
+            parts.append(node.text.strip())
+        for child in node:
+            # Commentaires (tag non textuel) et scripts ignorés, mais pas le texte qui les suit
+            if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+                collect(child)
+            if child.tail:
+                parts.append(child.tail.strip())
+
+    collect(element)
+    return ''.join(parts)
+
+
+def _span(element, attribute):
+    try:
+        return max(1, int(element.get(attribute, 1)))
+    except ValueError:
+        return 1
+
+
+class _SpanGrid:
+    """Place les cellules d'une ligne en tenant compte des colspan/rowspan en cours"""
+
+    def __init__(self):
+        # {colonne: [lignes restantes, texte]} pour les rowspan actifs
+        self.pending = {}
+        self.row = []
+
+    def start_row(self):
+        self.row = []
+
+    def _fill_pending(self):
+        while len(self.row) in self.pending:
+            column = len(self.row)
+            remaining, text = self.pending[column]
+            self.row.append(text)
+            if remaining <= 1:
+                del self.pending[column]
+            else:
+                self.pending[column][0] = remaining - 1
+
+    def add_cell(self, text, colspan, rowspan):
+        self._fill_pending()
+        for _ in range(colspan):
+            if rowspan > 1:
+                self.pending[len(self.row)] = [rowspan - 1, text]
+            self.row.append(text)
+
+    def end_row(self):
+        self._fill_pending()
+        return self.row
+
+
+def _header_names(header_rows):
+    """Combine les lignes d'en-tête (grille déjà étendue) en un nom unique par colonne"""
+    width = max((len(row) for row in header_rows), default=0)
+    names, seen = [], {}
+    for column in range(width):
+        labels = []
+        for row in header_rows:
+            label = row[column] if column < len(row) else ''
+            if label and label not in labels:
+                labels.append(label)
+        name = ' / '.join(labels)
+        # Un en-tête étalé sur plusieurs colonnes ne doit pas écraser les autres
+        count = seen.get(name, 0) + 1
+        seen[name] = count
+        names.append(name if count == 1 else f'{name}_{count}')
+    return names
+
+
+def iter_table_rows(chunks, table_selector='table', encoding=None):
+    """Parse un tableau HTML en flux et renvoie ses lignes une par une.
+
+    `chunks` est un itérable de morceaux de HTML (bytes ou str), par exemple
+    response.iter_content(). Chaque ligne est un dict {en-tête: texte} avec
+    repli sur column_{i}, comme parse_table. Les lignes traitées sont
+    supprimées de l'arbre au fur et à mesure : la mémoire reste constante
+    quelle que soit la taille du tableau. Les colspan/rowspan sont répartis
+    sur les colonnes concernées.
+    """
+    matches = _compile_table_selector(table_selector)
+    parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+
+    table = None
+    nested = 0
+    section = None
+    header_rows = []
+    headers = None
+    grid = _SpanGrid()
+    header_grid = _SpanGrid()
+
+    def process(event, element):
+        nonlocal table, nested, section, headers
+        tag = element.tag
+
+        if event == 'start':
+            if tag == 'table':
+                if table is None and matches(element):
+                    table = element
+                elif table is not None:
+                    nested += 1
+            elif table is not None and nested == 0:
+                if tag in ('thead', 'tbody', 'tfoot'):
+                    section = tag
+                elif tag == 'tr':
+                    (header_grid if section == 'thead' else grid).start_row()
+            return None
+
+        # Événement 'end'
+        if table is None:
+            # Contenu hors tableau : inutile de le garder en mémoire
+            element.clear()
+            return None
+
+        if tag == 'table':
+            if nested:
+                nested -= 1
+                return None
+            return StopIteration
+
+        if nested:
+            return None
+
+        if tag in ('td', 'th'):
+            current = header_grid if section == 'thead' else grid
+            current.add_cell(_cell_text(element), _span(element, 'colspan'), _span(element, 'rowspan'))
+            element.clear()
+        elif tag in ('thead', 'tbody', 'tfoot'):
+            section = None
+        elif tag == 'tr':
+            row = None
+            if section == 'thead':
+                header_rows.append(header_grid.end_row())
+            else:
+                cells = grid.end_row()
+                if section != 'tfoot' and cells:
+                    if headers is None:
+                        headers = _header_names(header_rows)
+                    row = {
+                        (headers[i] if i < len(headers) else f'column_{i}'): cell
+                        for i, cell in enumerate(cells)
+                    }
+            # Libère la ligne et celles déjà traitées avant elle
+            element.clear()
+            parent = element.getparent()
+            while element.getprevious() is not None:
+                del parent[0]
+            return row
+        return None
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            result = process(event, element)
+            if result is StopIteration:
+                return
+            if result is not None:
+                yield result
+
+    parser.close()
+    for event, element in parser.read_events():
+        result = process(event, element)
+        if result is StopIteration:
+            return
+        if result is not None:
+            yield result
+
+    if table is None:
+        print("Aucun tableau trouvé")
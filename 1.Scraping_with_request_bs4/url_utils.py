@@ -0,0 +1,29 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """Normalise une URL pour servir de clé (cache, ensemble des URLs vues).
+
+    Schéma et hôte en minuscules, port par défaut retiré, fragment supprimé,
+    chemin vide remplacé par '/' et paramètres de requête triés. Lève
+    ValueError pour une URL mal formée (port invalide, hôte IPv6 non fermé...).
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        # Hôte IPv6 : crochets conservés, sinon le port devient ambigu
+        host = f"[{host}]"
+
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else '')
+        netloc = f"{credentials}@{netloc}"
+
+    path = parts.path or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ''))
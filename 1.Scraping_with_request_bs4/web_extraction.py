@@ -1,13 +1,39 @@
 import requests
-from bs4 import BeautifulSoup
-import csv
 import time
 from urllib.parse import urljoin, urlparse
 
+from charset import TEXT_CONTENT_TYPES, detect_encoding
+from extractors import ARTICLE_SELECTORS, MultiExtractor
+from parsers import BeautifulSoupBackend, get_parser_backend, rows_to_records
+from politeness import PolitenessScheduler
+from retry import CircuitBreaker, FetchResult, RetryPolicy, parse_retry_after
+from sinks import ResultSink
+from table_stream import iter_table_rows
+
 class WebScraper:
-    def __init__(self, base_url, headers=None):
+    # Étiquette `scraper` des mesures (voir metrics.py)
+    metrics_label = 'requests'
+    
+    def __init__(self, base_url, headers=None, scheduler=None, cache=None, parser='html.parser',
+                 retry_policy=None, circuit_breaker=None, max_body_bytes=10 * 1024 * 1024,
+                 allowed_content_types=TEXT_CONTENT_TYPES, metrics=None):
         self.base_url = base_url
         self.session = requests.Session()
+        # Backend de parsing : 'html.parser', 'lxml' ou 'selectolax' (voir parsers.py)
+        self.parser = get_parser_backend(parser)
+        self._extractors = {}
+        # Ordonnanceur de politesse optionnel (voir politeness.py)
+        self.scheduler = scheduler
+        # Cache HTTP persistant optionnel (voir http_cache.py)
+        self.cache = cache
+        # Nouvelles tentatives (une seule par défaut) et disjoncteur par hôte (voir retry.py)
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+        self.circuit_breaker = circuit_breaker
+        # Taille maximale d'une page et types de contenu acceptés (None : pas de limite)
+        self.max_body_bytes = max_body_bytes
+        self.allowed_content_types = allowed_content_types
+        # Mesures par phase optionnelles (voir metrics.py)
+        self.metrics = metrics
         
         # Headers par défaut pour éviter d'être bloqué
         default_headers = {
@@ -20,28 +46,160 @@ class WebScraper:
         self.session.headers.update(default_headers)
     
     def get_page(self, url):
-        """Récupère le contenu d'une page web"""
-        try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()  # Lève une exception si erreur HTTP
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la récupération de {url}: {e}")
-            return None
+        """Récupère le contenu d'une page web (None en cas d'échec, détail via fetch)"""
+        return self.fetch(url).response
+    
+    def fetch(self, url):
+        """Récupère une page avec nouvelles tentatives et renvoie un FetchResult structuré"""
+        result = self._fetch(url)
+        if self.metrics:
+            self.metrics.record_fetch(result, self.metrics_label)
+        return result
+    
+    def _fetch(self, url):
+        start = time.monotonic()
+        cached = None
+        request_headers = {}
+        if self.cache:
+            cached = self.cache.lookup(url)
+            if cached and self.cache.is_fresh(cached):
+                if self.scheduler:
+                    # Aucune requête : le créneau éventuellement réservé par next_url() est rendu
+                    self.scheduler.release(url)
+                return FetchResult(url, 'cached', response=self.cache.hit(cached, url),
+                                   status_code=cached['status'], elapsed=time.monotonic() - start)
+            request_headers = self.cache.conditional_headers(cached)
+        
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.circuit_breaker and not self.circuit_breaker.allow(url):
+                if self.scheduler and attempt == 1:
+                    self.scheduler.release(url)
+                return FetchResult(url, 'circuit_open', error="Hôte désactivé après des échecs répétés",
+                                   attempts=attempt - 1, elapsed=time.monotonic() - start)
+            
+            retry_after = None
+            try:
+                if self.scheduler:
+                    self.scheduler.acquire(url)
+                # Corps lu en flux : on peut abandonner avant de tout télécharger
+                response = self.session.get(url, timeout=10, headers=request_headers, stream=True)
+            except requests.exceptions.RequestException as e:
+                retryable = self.retry_policy.is_retryable(exception=e)
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_failure(url)
+                result = FetchResult(url, 'network_error', error=str(e), retryable=retryable)
+            else:
+                if 'Retry-After' in response.headers:
+                    retry_after = parse_retry_after(response.headers['Retry-After'])
+                    if self.scheduler:
+                        self.scheduler.register_retry_after(url, response.headers['Retry-After'])
+                
+                status = response.status_code
+                if self.metrics:
+                    # Jusqu'à la réception des en-têtes (DNS et connexion compris)
+                    self.metrics.observe('ttfb', response.elapsed.total_seconds(), scraper=self.metrics_label)
+                if status < 500 and status != 429 and self.circuit_breaker:
+                    # L'hôte répond normalement, même si la page est en erreur (404...)
+                    self.circuit_breaker.record_success(url)
+                elif self.circuit_breaker:
+                    self.circuit_breaker.record_failure(url)
+                
+                # Page inchangée depuis la dernière visite : on réutilise le corps en cache
+                if cached and status == 304:
+                    response.close()
+                    return FetchResult(url, 'revalidated', response=self.cache.revalidated(cached, url, response),
+                                       status_code=status, attempts=attempt, elapsed=time.monotonic() - start)
+                
+                if response.ok:
+                    try:
+                        rejection = self._timed('download', self._read_body, response)
+                    except requests.exceptions.RequestException as e:
+                        result = FetchResult(url, 'network_error', status_code=status, error=str(e),
+                                             retryable=self.retry_policy.is_retryable(exception=e))
+                    else:
+                        if rejection:
+                            return FetchResult(url, 'rejected', status_code=status, error=rejection,
+                                               attempts=attempt, elapsed=time.monotonic() - start)
+                        if self.cache:
+                            self.cache.store(url, response)
+                        if self.metrics:
+                            self.metrics.inc('bytes', len(response.content), scraper=self.metrics_label)
+                        return FetchResult(url, 'success', response=response, status_code=status,
+                                           attempts=attempt, elapsed=time.monotonic() - start)
+                else:
+                    response.close()
+                    result = FetchResult(url, 'http_error', status_code=status, error=f"HTTP {status}",
+                                         retryable=self.retry_policy.is_retryable(status_code=status))
+            
+            if not result.retryable or attempt >= self.retry_policy.max_attempts:
+                result.attempts = attempt
+                result.elapsed = time.monotonic() - start
+                return result
+            time.sleep(self.retry_policy.delay(attempt, retry_after))
+    
+    def rejection_reason(self, headers, size=None):
+        """Motif de refus d'une réponse (type de contenu ou taille), ou None"""
+        mime = headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if self.allowed_content_types and mime and mime not in self.allowed_content_types:
+            return f"Type de contenu ignoré: {mime}"
+        if size is None:
+            length = headers.get('Content-Length', '')
+            size = int(length) if length.isdigit() else 0
+        if self.max_body_bytes and size > self.max_body_bytes:
+            return f"Page trop volumineuse (plus de {self.max_body_bytes} octets)"
+        return None
+    
+    def _read_body(self, response, chunk_size=64 * 1024):
+        """Lit le corps en flux dans la limite de taille et fixe son encodage.
+        
+        Renvoie le motif de refus (la connexion est alors fermée) ou None.
+        """
+        rejection = self.rejection_reason(response.headers)
+        if rejection:
+            response.close()
+            return rejection
+        
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size):
+            size += len(chunk)
+            # Taille après décompression : protège aussi des corps gzip démesurés
+            rejection = self.rejection_reason(response.headers, size)
+            if rejection:
+                response.close()
+                return rejection
+            chunks.append(chunk)
+        
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+        response.encoding = detect_encoding(response._content, response.headers.get('Content-Type'))
+        return None
     
     def parse_html(self, html_content):
-        """Parse le contenu HTML avec Beautiful Soup"""
-        return BeautifulSoup(html_content, 'html.parser')
+        """Parse le contenu HTML avec le backend choisi (Beautiful Soup par défaut).
+        
+        Passer response.text (déjà décodé par fetch) évite au parseur de
+        deviner l'encodage à partir des octets.
+        """
+        return self._timed('parse', self.parser.parse, html_content)
+    
+    def _timed(self, phase, function, *args):
+        """Appelle function(*args) en mesurant la phase si des métriques sont actives"""
+        if not self.metrics:
+            return function(*args)
+        with self.metrics.timer(phase, scraper=self.metrics_label):
+            return function(*args)
     
     def extract_links(self, soup, base_url):
         """Extrait tous les liens d'une page"""
         links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
+        for href, text in self.parser.iter_links(soup):
             # Convertit les liens relatifs en liens absolus
             absolute_url = urljoin(base_url, href)
             links.append({
-                'text': link.get_text(strip=True),
+                'text': text,
                 'url': absolute_url
             })
         return links
@@ -49,25 +207,47 @@ class WebScraper:
     def extract_images(self, soup, base_url):
         """Extrait toutes les images d'une page"""
         images = []
-        for img in soup.find_all('img'):
-            src = img.get('src')
+        for src, alt, title in self.parser.iter_images(soup):
             if src:
                 absolute_url = urljoin(base_url, src)
                 images.append({
                     'src': absolute_url,
-                    'alt': img.get('alt', ''),
-                    'title': img.get('title', '')
+                    'alt': alt,
+                    'title': title
                 })
         return images
     
+    def extract_all(self, soup, base_url, extractors=('links', 'images', 'article', 'table'),
+                    table_selector='table'):
+        """Extrait liens, images, article et tableau en un seul parcours de l'arbre"""
+        if isinstance(self.parser, BeautifulSoupBackend):
+            # Extracteur mis en cache : sélecteurs compilés une fois pour toutes les pages
+            key = (tuple(extractors), table_selector)
+            extractor = self._extractors.get(key)
+            if extractor is None:
+                extractor = self._extractors[key] = MultiExtractor(extractors, table_selector=table_selector)
+            return self._timed('extract', extractor.extract, soup, base_url)
+        
+        # Backends C (selectolax) : les méthodes individuelles sont déjà rapides
+        methods = {
+            'links': lambda: self.extract_links(soup, base_url),
+            'images': lambda: self.extract_images(soup, base_url),
+            'article': lambda: self.parse_article(soup, base_url),
+            'table': lambda: self.parse_table(soup, table_selector),
+        }
+        return self._timed('extract', lambda: {name: methods[name]() for name in extractors})
+    
     def scrape_article_content(self, url):
         """Exemple d'extraction d'articles de blog"""
         response = self.get_page(url)
         if not response:
             return None
         
-        soup = self.parse_html(response.content)
-        
+        soup = self.parse_html(response.text)
+        return self._timed('extract', self.parse_article, soup, url)
+    
+    def parse_article(self, soup, url):
+        """Extrait les champs d'un article depuis une page déjà parsée"""
         # Adaptation selon la structure du site
         article_data = {
             'title': '',
@@ -77,29 +257,13 @@ class WebScraper:
             'url': url
         }
         
-        # Extraire le titre (plusieurs sélecteurs possibles)
-        title_selectors = ['h1', '.title', '#title', '[class*="title"]']
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                article_data['title'] = title_elem.get_text(strip=True)
-                break
-        
-        # Extraire le contenu
-        content_selectors = ['.content', '#content', 'article', '.post-content']
-        for selector in content_selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem:
-                article_data['content'] = content_elem.get_text(strip=True)
-                break
-        
-        # Extraire l'auteur
-        author_selectors = ['.author', '.by-author', '[class*="author"]']
-        for selector in author_selectors:
-            author_elem = soup.select_one(selector)
-            if author_elem:
-                article_data['author'] = author_elem.get_text(strip=True)
-                break
+        # Plusieurs sélecteurs possibles par champ (titre, contenu, auteur)
+        for field, selectors in ARTICLE_SELECTORS.items():
+            for selector in selectors:
+                value = self.parser.select_text(soup, selector)
+                if value is not None:
+                    article_data[field] = value
+                    break
         
         return article_data
     
@@ -109,52 +273,52 @@ class WebScraper:
         if not response:
             return None
         
-        soup = self.parse_html(response.content)
-        table = soup.select_one(table_selector)
+        soup = self.parse_html(response.text)
+        return self._timed('extract', self.parse_table, soup, table_selector)
+    
+    def parse_table(self, soup, table_selector='table'):
+        """Extrait les lignes d'un tableau depuis une page déjà parsée"""
+        table = self.parser.table_cells(soup, table_selector)
         
         if not table:
             print("Aucun tableau trouvé")
             return None
         
-        data = []
-        
-        # Extraire les en-têtes
-        headers = []
-        header_row = table.find('thead')
-        if header_row:
-            for th in header_row.find_all(['th', 'td']):
-                headers.append(th.get_text(strip=True))
-        
-        # Extraire les données
-        tbody = table.find('tbody') or table
-        for row in tbody.find_all('tr'):
-            cells = row.find_all(['td', 'th'])
-            if cells:  # Ignorer les lignes vides
-                row_data = {}
-                for i, cell in enumerate(cells):
-                    header = headers[i] if i < len(headers) else f'column_{i}'
-                    row_data[header] = cell.get_text(strip=True)
-                data.append(row_data)
+        headers, rows = table
+        return rows_to_records(headers, rows)
+    
+    def stream_table_data(self, url, table_selector='table', chunk_size=64 * 1024):
+        """Extrait un tableau HTML en flux : renvoie les lignes une par une (générateur).
         
-        return data
+        La mémoire reste constante quelle que soit la taille du tableau ;
+        `table_selector` doit porter sur le <table> lui-même (balise, #id, .classe).
+        """
+        try:
+            if self.scheduler:
+                self.scheduler.acquire(url)
+            with self.session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                # Encodage uniquement s'il est déclaré, sinon lxml lit la balise <meta>
+                content_type = response.headers.get('Content-Type', '')
+                encoding = response.encoding if 'charset=' in content_type.lower() else None
+                yield from iter_table_rows(response.iter_content(chunk_size), table_selector, encoding)
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur lors de la récupération de {url}: {e}")
     
     def save_to_csv(self, data, filename):
-        """Sauvegarde les données dans un fichier CSV"""
-        if not data:
+        """Sauvegarde les données dans un fichier CSV (liste ou itérateur de lignes)"""
+        self.save_results(data, filename, format='csv')
+    
+    def save_results(self, data, filename, format=None, compression=None):
+        """Sauvegarde les données en flux en CSV, JSON Lines ou Parquet (voir sinks.py)"""
+        if isinstance(data, list) and not data:
             print("Aucune donnée à sauvegarder")
             return
         
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            if isinstance(data[0], dict):
-                fieldnames = data[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(data)
-            else:
-                writer = csv.writer(csvfile)
-                writer.writerows(data)
+        with ResultSink(filename, format=format, compression=compression) as sink:
+            sink.write_all(data)
         
-        print(f"Données sauvegardées dans {filename}")
+        print(f"{sink.count} lignes sauvegardées dans {filename}")
 
 # Exemples d'utilisation
 def exemple_scraping_simple(url):
@@ -165,7 +329,7 @@ def exemple_scraping_simple(url):
     
     response = scraper.get_page(url) #("https://httpbin.org/html")
     if response:
-        soup = scraper.parse_html(response.content)
+        soup = scraper.parse_html(response.text)
         
         # Extraire le titre
         title = soup.find('title')
@@ -186,7 +350,12 @@ def exemple_scraping_simple(url):
 
 def exemple_scraping_avec_delai():
     """Exemple avec gestion des délais pour éviter la surcharge"""
-    scraper = WebScraper("https://example.com")
+    # Une requête par seconde et par hôte : les hôtes différents avancent en parallèle
+    scheduler = PolitenessScheduler(rate=1.0, burst=1)
+    # Erreurs transitoires retentées ; un hôte qui échoue en boucle est mis de côté
+    scraper = WebScraper("https://example.com", scheduler=scheduler,
+                         retry_policy=RetryPolicy(max_attempts=3),
+                         circuit_breaker=CircuitBreaker(failure_threshold=5))
     
     urls_to_scrape = [
         "https://httpbin.org/html",
@@ -197,18 +366,18 @@ def exemple_scraping_avec_delai():
     results = []
     
     for url in urls_to_scrape:
+        scheduler.add(url)
+    
+    # Le scheduler renvoie l'URL prête le plus tôt, tous hôtes confondus
+    for url in scheduler:
         print(f"Scraping: {url}")
-        response = scraper.get_page(url)
+        result = scraper.fetch(url)
         
-        if response:
-            soup = scraper.parse_html(response.content)
+        if result.ok:
+            soup = scraper.parse_html(result.response.text)
             # Traitement des données...
-            results.append({"url": url, "status": "success"})
-        else:
-            results.append({"url": url, "status": "failed"})
-        
-        # Délai entre les requêtes pour être respectueux
-        time.sleep(1)
+        results.append({"url": url, "status": result.outcome, "attempts": result.attempts,
+                        "error": result.error})
     
     return results
 
@@ -0,0 +1,287 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from readiness import install_network_tracker
+from web_extraction import SeleniumScraper
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Messages indiquant que le navigateur lui-même est hors service
+CRASH_MESSAGES = ('chrome not reachable', 'session deleted', 'disconnected', 'no such window',
+                  'target window already closed', 'tab crashed')
+# Démarrage d'un remplaçant : tentatives et attente initiale entre deux essais (doublée à chaque échec)
+REPLACEMENT_ATTEMPTS = 3
+REPLACEMENT_BACKOFF = 1.0
+# Intervalle de vérification du pool pendant l'attente d'un driver
+LEASE_POLL_SECONDS = 0.5
+
+
+class PooledDriver:
+    """Driver Chrome du pool avec son nombre de pages servies"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.started_at = time.monotonic()
+
+
+class DriverPool:
+    """Pool de drivers Chrome headless gardés au chaud et prêtés page par page.
+
+    Le démarrage de Chrome coûte plusieurs secondes : le pool démarre `size`
+    navigateurs en parallèle une fois pour toutes, puis les prête. Entre deux
+    prêts, l'état est remis à zéro (onglets supplémentaires, cookies,
+    stockage local). Un driver est remplacé après `max_pages` pages, quand
+    la mémoire de son navigateur dépasse `max_memory_mb`, ou s'il a planté ;
+    le remplaçant démarre en arrière-plan (avec nouvelles tentatives ; si
+    aucun ne démarre, le pool rétrécit et lease lève RuntimeError une fois
+    vide au lieu d'attendre indéfiniment).
+
+        with DriverPool(size=4) as pool:
+            for url, title in pool.map(lambda scraper, url: scraper.driver.title, urls):
+                ...
+
+    La mesure mémoire utilise psutil s'il est installé (RSS de tous les
+    processus du navigateur), sinon le tas JavaScript de la page.
+    """
+
+    def __init__(self, size=4, headless=True, window_size="1920,1080", max_pages=100,
+                 max_memory_mb=1500, options_factory=None, render_profile=None):
+        self.size = size
+        # Profil de rendu allégé appliqué à chaque navigateur (voir render_profile.py)
+        self.render_profile = render_profile
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        # Mêmes options Chrome que SeleniumScraper par défaut
+        self.options_factory = options_factory or (
+            lambda: SeleniumScraper(headless=headless, window_size=window_size,
+                                    render_profile=render_profile).options)
+
+        self._idle = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._replacements = []
+        # Drivers en service : disponibles, prêtés ou en cours de remplacement
+        self._live = 0
+        self.stats = {'started': 0, 'recycled': 0, 'crashed': 0, 'leases': 0}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        """Démarre les navigateurs en parallèle"""
+        with ThreadPoolExecutor(self.size) as executor:
+            for pooled in executor.map(lambda _: self._create(), range(self.size)):
+                if pooled is not None:
+                    self._live += 1
+                    self._idle.put(pooled)
+        if self._idle.empty():
+            raise RuntimeError("Aucun driver n'a pu démarrer (ChromeDriver est-il installé ?)")
+        return self
+
+    def close(self):
+        """Ferme tous les navigateurs"""
+        self._closed = True
+        for thread in list(self._replacements):
+            thread.join()
+        while not self._idle.empty():
+            self._quit(self._idle.get_nowait())
+
+    def _create(self):
+        try:
+            pooled = PooledDriver(webdriver.Chrome(options=self.options_factory()))
+        except WebDriverException as e:
+            print(f"Erreur lors du démarrage du driver: {e}")
+            return None
+        install_network_tracker(pooled.driver)
+        if self.render_profile:
+            self.render_profile.apply(pooled.driver)
+        with self._lock:
+            self.stats['started'] += 1
+        return pooled
+
+    def _quit(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def _replace(self, pooled):
+        """Ferme un driver et démarre son remplaçant en arrière-plan"""
+        def replace():
+            self._quit(pooled)
+            replaced = False
+            for attempt in range(REPLACEMENT_ATTEMPTS):
+                if self._closed:
+                    break
+                replacement = self._create()
+                if replacement is not None:
+                    self._idle.put(replacement)
+                    replaced = True
+                    break
+                if attempt + 1 < REPLACEMENT_ATTEMPTS:
+                    time.sleep(REPLACEMENT_BACKOFF * 2 ** attempt)
+            with self._lock:
+                if not replaced:
+                    # Remplaçant impossible à démarrer : le pool compte un driver de moins
+                    self._live -= 1
+                self._replacements.remove(thread)
+
+        thread = threading.Thread(target=replace, daemon=True)
+        with self._lock:
+            self._replacements.append(thread)
+        thread.start()
+
+    # --- Prêt ---------------------------------------------------------------
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Prête un driver : `with pool.lease() as driver:`"""
+        if self._closed:
+            raise RuntimeError("Pool fermé")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._live <= 0 and self._idle.empty():
+                    raise RuntimeError("Pool vide : aucun driver de remplacement n'a pu démarrer")
+            wait = LEASE_POLL_SECONDS if deadline is None else min(LEASE_POLL_SECONDS, deadline - time.monotonic())
+            if wait <= 0:
+                raise TimeoutError("Aucun driver disponible")
+            try:
+                # Attente par tranches : un pool vidé entre-temps est détecté
+                pooled = self._idle.get(timeout=wait)
+                break
+            except queue.Empty:
+                continue
+        with self._lock:
+            self.stats['leases'] += 1
+
+        crashed = False
+        try:
+            yield pooled.driver
+        except WebDriverException as e:
+            crashed = self._is_crash(e)
+            raise
+        finally:
+            pooled.pages += 1
+            self._release(pooled, crashed)
+
+    @contextmanager
+    def scraper(self, timeout=None, **kwargs):
+        """Prête un SeleniumScraper branché sur un driver du pool"""
+        with self.lease(timeout) as driver:
+            kwargs.setdefault('render_profile', self.render_profile)
+            scraper = SeleniumScraper(**kwargs)
+            scraper.driver = driver
+            scraper.wait = WebDriverWait(driver, 10)
+            yield scraper
+
+    def map(self, function, urls, workers=None):
+        """Appelle function(scraper, url) pour chaque URL sur tous les drivers du pool.
+
+        Renvoie (url, résultat) dans l'ordre des URLs (pas dans l'ordre de fin
+        des traitements) ; le résultat vaut None en cas d'erreur.
+        """
+        def run(url):
+            try:
+                with self.scraper() as scraper:
+                    if not scraper.get_page(url):
+                        return url, None
+                    return url, function(scraper, url)
+            except Exception as e:
+                print(f"Erreur lors du traitement de {url}: {e}")
+                return url, None
+
+        with ThreadPoolExecutor(workers or self.size) as executor:
+            yield from executor.map(run, urls)
+
+    @staticmethod
+    def _is_crash(error):
+        if isinstance(error, InvalidSessionIdException):
+            return True
+        message = (error.msg or str(error)).lower()
+        return any(text in message for text in CRASH_MESSAGES)
+
+    def _release(self, pooled, crashed):
+        if self._closed:
+            self._quit(pooled)
+            return
+
+        reason = None
+        if crashed:
+            reason = 'crashed'
+        elif pooled.pages >= self.max_pages:
+            reason = 'recycled'
+        elif not self._reset(pooled.driver):
+            reason = 'crashed'
+        elif self.max_memory_mb and self._memory_mb(pooled.driver) > self.max_memory_mb:
+            reason = 'recycled'
+
+        if reason is None:
+            self._idle.put(pooled)
+            return
+        with self._lock:
+            self.stats[reason] += 1
+        self._replace(pooled)
+
+    def _reset(self, driver):
+        """Remet le navigateur dans un état neutre ; renvoie False s'il ne répond plus"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            # Stockage de l'origine courante (localStorage, IndexedDB, service workers...)
+            origin = driver.execute_script("return window.location.origin")
+            if origin and origin.startswith('http'):
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            # Cookies de tous les domaines, pas seulement celui de la page courante
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.get('about:blank')
+            return True
+        except WebDriverException:
+            return False
+
+    def _memory_mb(self, driver):
+        """Mémoire du navigateur en Mo (0 si elle ne peut pas être mesurée)"""
+        try:
+            if psutil is not None:
+                service = psutil.Process(driver.service.process.pid)
+                processes = [service] + service.children(recursive=True)
+                return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+            heap = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : 0")
+            return (heap or 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+
+# Exemple d'utilisation
+def exemple_pool(urls):
+    """Récupère les titres de plusieurs pages sur 4 navigateurs en parallèle"""
+    with DriverPool(size=4, max_pages=50) as pool:
+        titles = {url: title for url, title in pool.map(lambda scraper, url: scraper.driver.title, urls)}
+        print(f"Statistiques du pool: {pool.stats}")
+    return titles
+
+
+if __name__ == "__main__":
+    exemple_pool([
+        "https://example.com",
+        "https://www.python.org",
+        "https://www.tours.fr/",
+    ])
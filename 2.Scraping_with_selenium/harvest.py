@@ -0,0 +1,128 @@
+import json
+
+# Champs par défaut, identiques à SeleniumScraper.extract_item_data
+DEFAULT_FIELD_MAP = {
+    'text': (None, 'text'),
+    'html': (None, 'html'),
+    'title': ('h2, h3, .title', 'text'),
+    'link': ('a', 'href'),
+}
+
+# Lit les champs d'un élément : [nom, sous-sélecteur ou null, 'text' | 'html' | attribut]
+READ_FIELDS_JS = """
+function readFields(node, fields) {
+    var item = {};
+    for (var i = 0; i < fields.length; i++) {
+        var name = fields[i][0], selector = fields[i][1], attribute = fields[i][2];
+        var target = selector ? node.querySelector(selector) : node;
+        if (!target) { item[name] = ''; continue; }
+        if (attribute === 'text') item[name] = target.innerText || target.textContent || '';
+        else if (attribute === 'html') item[name] = target.innerHTML;
+        // href et src : URL absolue, comme get_attribute de Selenium
+        else if (attribute === 'href' || attribute === 'src') item[name] = target[attribute] || '';
+        else item[name] = target.getAttribute(attribute) || '';
+    }
+    return item;
+}
+"""
+
+# Tous les éléments d'un conteneur, en un seul aller-retour WebDriver
+BULK_EXTRACT_SCRIPT = READ_FIELDS_JS + """
+var nodes = document.querySelectorAll(arguments[0]), fields = arguments[1], limit = arguments[2];
+var items = [];
+for (var i = 0; i < nodes.length && (!limit || items.length < limit); i++) items.push(readFields(nodes[i], fields));
+return JSON.stringify(items);
+"""
+
+# Un seul élément déjà trouvé (WebElement passé en argument)
+ELEMENT_FIELDS_SCRIPT = READ_FIELDS_JS + """
+return JSON.stringify(readFields(arguments[0], arguments[1]));
+"""
+
+# Renvoie en JSON les éléments apparus depuis l'appel précédent (un seul aller-retour WebDriver).
+# L'état (éléments déjà vus, empreintes) reste dans la page : rien n'est renvoyé deux fois.
+HARVEST_SCRIPT = READ_FIELDS_JS + """
+var selector = arguments[0], fields = arguments[1], limit = arguments[2];
+var state = window.__scraperHarvest;
+if (!state || state.selector !== selector) {
+    state = window.__scraperHarvest = {selector: selector, nodes: new WeakSet(), keys: new Set()};
+}
+
+// Empreinte stable : identifiant de donnée si présent, sinon hachage (53 bits) du texte et du lien
+function hash(text) {
+    var h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+    for (var i = 0; i < text.length; i++) {
+        var c = text.charCodeAt(i);
+        h1 = Math.imul(h1 ^ c, 2654435761);
+        h2 = Math.imul(h2 ^ c, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(36);
+}
+
+var items = [];
+var nodes = document.querySelectorAll(selector);
+for (var i = 0; i < nodes.length && (!limit || items.length < limit); i++) {
+    var node = nodes[i];
+    if (state.nodes.has(node)) continue;
+    state.nodes.add(node);
+
+    var link = node.querySelector('a');
+    var key = node.getAttribute('data-id') || node.getAttribute('data-key') || node.id
+        || hash((node.innerText || '') + '|' + (link ? link.href : ''));
+    if (state.keys.has(key)) continue;
+    state.keys.add(key);
+
+    var item = readFields(node, fields);
+    // Nom réservé : ne masque pas un champ « id » demandé dans field_map
+    item._key = key;
+    items.push(item);
+}
+return JSON.stringify(items);
+"""
+
+
+def normalize_field_map(field_map):
+    """Convertit un dictionnaire de champs en liste [nom, sous-sélecteur, attribut] pour le script.
+
+    Chaque valeur peut être un sous-sélecteur (texte de l'élément trouvé),
+    un tuple (sous-sélecteur, attribut) ou (None, attribut) pour le
+    conteneur lui-même ; l'attribut vaut 'text', 'html' ou un nom d'attribut.
+    """
+    fields = []
+    for name, spec in field_map.items():
+        selector, attribute = (spec, 'text') if isinstance(spec, str) or spec is None else spec
+        fields.append([name, selector or None, attribute])
+    return fields
+
+
+def extract_items(driver, container_selector, field_map=None, limit=None):
+    """Extrait les champs de tous les éléments du conteneur en un seul appel"""
+    fields = normalize_field_map(field_map or DEFAULT_FIELD_MAP)
+    return json.loads(driver.execute_script(BULK_EXTRACT_SCRIPT, container_selector, fields, limit or 0))
+
+
+def extract_element(driver, element, field_map=None):
+    """Extrait les champs d'un WebElement en un seul appel"""
+    fields = normalize_field_map(field_map or DEFAULT_FIELD_MAP)
+    return json.loads(driver.execute_script(ELEMENT_FIELDS_SCRIPT, element, fields))
+
+
+def harvest_new_items(driver, item_selector, include_html=False, limit=None, field_map=None):
+    """Éléments correspondant au sélecteur apparus depuis le dernier appel, sans doublon"""
+    if field_map is None:
+        field_map = dict(DEFAULT_FIELD_MAP)
+        if not include_html:
+            del field_map['html']
+    fields = normalize_field_map(field_map)
+    items = json.loads(driver.execute_script(HARVEST_SCRIPT, item_selector, fields, limit or 0))
+    for item in items:
+        # L'empreinte sert d'« id » sauf si field_map définit déjà ce champ
+        item.setdefault('id', item.pop('_key'))
+    return items
+
+
+def reset_harvest(driver):
+    """Oublie les éléments déjà récoltés sur la page courante"""
+    driver.execute_script("delete window.__scraperHarvest;")
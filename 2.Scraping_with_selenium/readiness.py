@@ -0,0 +1,194 @@
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Compte les requêtes fetch / XHR en cours ; installé avant les scripts de la page
+NETWORK_TRACKER_SCRIPT = """
+(function () {
+    if (window.__scraperNetwork) return;
+    var state = window.__scraperNetwork = {inflight: 0, last: 0};
+    function start() { state.inflight++; state.last = performance.now(); }
+    function end() { state.inflight = Math.max(0, state.inflight - 1); state.last = performance.now(); }
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () { start(); return originalFetch.apply(this, arguments).finally(end); };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        start();
+        this.addEventListener('loadend', end);
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+# Vrai si la page est chargée et qu'aucune requête n'a eu lieu depuis `idle` ms
+NETWORK_IDLE_SCRIPT = """
+var idle = arguments[0], since = arguments[1] || 0;
+var state = window.__scraperNetwork || {inflight: 0, last: 0};
+var last = Math.max(state.last, since);
+var entries = performance.getEntriesByType('resource');
+if (entries.length) last = Math.max(last, entries[entries.length - 1].responseEnd);
+return document.readyState === 'complete' && state.inflight === 0 && performance.now() - last >= idle;
+"""
+
+# Se termine quand le DOM n'a pas changé pendant `quiet` ms (true) ou après `timeout` ms (false) ;
+# les changements d'attributs ne comptent qu'avec `attributes` (animations, tickers...)
+DOM_QUIET_SCRIPT = """
+var quiet = arguments[0], timeout = arguments[1], attributes = arguments[2], done = arguments[arguments.length - 1];
+var timer;
+var observer = new MutationObserver(function () { clearTimeout(timer); timer = setTimeout(finish, quiet); });
+function finish() { observer.disconnect(); clearTimeout(limit); done(true); }
+var limit = setTimeout(function () { observer.disconnect(); clearTimeout(timer); done(false); }, timeout);
+observer.observe(document, {childList: true, subtree: true, attributes: attributes, characterData: true});
+timer = setTimeout(finish, quiet);
+"""
+
+
+def install_network_tracker(driver):
+    """Installe le suivi des requêtes pour toutes les pages suivantes (Chrome, via CDP)"""
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': NETWORK_TRACKER_SCRIPT})
+        return True
+    except (AttributeError, WebDriverException):
+        # Navigateur sans CDP : le suivi sera installé à la demande par NetworkIdle
+        return False
+
+
+def page_now(driver):
+    """Horloge de la page (performance.now(), en ms), pour NetworkIdle.wait(since=...)"""
+    return driver.execute_script("return performance.now()")
+
+
+class NetworkIdle:
+    """Prête quand aucune requête réseau n'est en cours depuis `idle_ms` millisecondes.
+
+    Les requêtes fetch / XHR sont suivies par un script installé au démarrage
+    du driver (install_network_tracker) ; les autres ressources (images,
+    scripts...) via l'API Resource Timing.
+    """
+
+    def __init__(self, idle_ms=500, timeout=10, poll_frequency=0.1):
+        self.idle_ms = idle_ms
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+
+    def is_idle(self, driver, since=None):
+        return driver.execute_script(NETWORK_IDLE_SCRIPT, self.idle_ms, since)
+
+    def wait(self, driver, since=None, timeout=None):
+        """Attend le calme réseau ; renvoie False si `timeout` (par défaut self.timeout) est atteint"""
+        if not driver.execute_script("return !!window.__scraperNetwork"):
+            # Suivi absent (pas de CDP) : installé maintenant pour les requêtes à venir
+            driver.execute_script(NETWORK_TRACKER_SCRIPT)
+        try:
+            WebDriverWait(driver, self.timeout if timeout is None else timeout, self.poll_frequency).until(
+                lambda d: self.is_idle(d, since))
+            return True
+        except TimeoutException:
+            return False
+
+
+class DomQuiet:
+    """Prête quand le DOM n'a plus changé depuis `quiet_ms` millisecondes (MutationObserver).
+
+    Par défaut seuls les ajouts / retraits de nœuds et les changements de
+    texte comptent : avec `attributes=True`, une page animée (classes, styles
+    modifiés en continu) n'est jamais stable et attend tout le `timeout`.
+    """
+
+    def __init__(self, quiet_ms=300, timeout=10, attributes=False):
+        self.quiet_ms = quiet_ms
+        self.timeout = timeout
+        self.attributes = attributes
+
+    def wait(self, driver, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        # Délai global des scripts du driver : rétabli après l'attente
+        try:
+            previous = driver.timeouts.script
+        except (AttributeError, WebDriverException):
+            previous = None
+        driver.set_script_timeout(timeout + 5)
+        try:
+            return bool(driver.execute_async_script(DOM_QUIET_SCRIPT, self.quiet_ms, int(timeout * 1000),
+                                                    self.attributes))
+        except TimeoutException:
+            return False
+        finally:
+            if previous is not None:
+                driver.set_script_timeout(previous)
+
+
+class SelectorCount:
+    """Prête quand au moins `count` éléments correspondent au sélecteur"""
+
+    def __init__(self, selector, count=1, timeout=10, by=By.CSS_SELECTOR, poll_frequency=0.1):
+        self.selector = selector
+        self.count = count
+        self.timeout = timeout
+        self.by = by
+        self.poll_frequency = poll_frequency
+
+    def wait(self, driver, timeout=None):
+        try:
+            WebDriverWait(driver, self.timeout if timeout is None else timeout, self.poll_frequency).until(
+                lambda d: len(d.find_elements(self.by, self.selector)) >= self.count)
+            return True
+        except TimeoutException:
+            return False
+
+
+class AllOf:
+    """Combine plusieurs stratégies, attendues l'une après l'autre.
+
+    Avec `timeout`, les stratégies partagent une échéance commune : chacune
+    dispose du temps restant (au plus son propre timeout), et l'attente
+    totale ne dépasse pas `timeout` au lieu de la somme des timeouts.
+    """
+
+    def __init__(self, *strategies, timeout=None):
+        self.strategies = strategies
+        self.timeout = timeout
+
+    def wait(self, driver, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ready = True
+        for strategy in self.strategies:
+            if deadline is None:
+                ready = strategy.wait(driver) and ready
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Échéance atteinte : stratégies restantes non vérifiées
+                return False
+            own_timeout = getattr(strategy, 'timeout', None)
+            ready = strategy.wait(driver, timeout=remaining if own_timeout is None else min(remaining, own_timeout)) \
+                and ready
+        return ready
+
+
+def default_readiness(timeout=5):
+    """Stratégie par défaut : réseau calme puis DOM stable, en `timeout` secondes au total"""
+    return AllOf(NetworkIdle(idle_ms=500, timeout=timeout), DomQuiet(quiet_ms=300, timeout=timeout),
+                 timeout=timeout)
+
+
+def wait_for_growth(driver, script, previous, timeout, network_idle=None, poll_frequency=0.1):
+    """Attend que `script` renvoie une valeur différente de `previous`.
+
+    Avec `network_idle`, s'arrête aussi dès que le réseau est calme depuis
+    l'appel (plus rien ne va arriver). Renvoie la dernière valeur lue.
+    """
+    since = page_now(driver) if network_idle else None
+    deadline = time.monotonic() + timeout
+    while True:
+        value = driver.execute_script(script)
+        if value != previous or time.monotonic() >= deadline:
+            return value
+        if network_idle and network_idle.is_idle(driver, since):
+            return value
+        time.sleep(poll_frequency)
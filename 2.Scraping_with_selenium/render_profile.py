@@ -0,0 +1,181 @@
+import json
+
+from selenium.common.exceptions import WebDriverException
+
+# Extensions par type de ressource
+RESOURCE_EXTENSIONS = {
+    'image': ('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'ogg', 'mp3', 'wav', 'm4a', 'm3u8', 'mpd'),
+    'stylesheet': ('css',),
+}
+# Motifs d'URL par type de ressource (syntaxe de Network.setBlockedURLs : * = joker, motif
+# appliqué à toute l'URL). '*.png' ne couvre que les URLs qui se terminent par l'extension :
+# '*.png?*' ajoute les ressources versionnées ou redimensionnées (img.png?w=800, font.woff2?v=3)
+RESOURCE_PATTERNS = {
+    resource_type: tuple(pattern for extension in extensions for pattern in (f'*.{extension}', f'*.{extension}?*'))
+    for resource_type, extensions in RESOURCE_EXTENSIONS.items()
+}
+
+# Régies publicitaires et traceurs courants
+AD_TRACKER_PATTERNS = (
+    '*doubleclick.net*', '*googlesyndication.com*', '*google-analytics.com*', '*googletagmanager.com*',
+    '*googleadservices.com*', '*adservice.google.*', '*facebook.net*', '*connect.facebook.*',
+    '*scorecardresearch.com*', '*criteo.*', '*taboola.com*', '*outbrain.com*', '*hotjar.com*',
+    '*amazon-adsystem.com*', '*adnxs.com*', '*quantserve.com*', '*chartbeat.com*', '*smartadserver.com*',
+)
+
+# Désactive animations et transitions CSS dès le chargement du document
+NO_ANIMATION_SCRIPT = """
+document.addEventListener('DOMContentLoaded', function () {
+    var style = document.createElement('style');
+    style.textContent = '*, *::before, *::after { animation: none !important; transition: none !important; '
+        + 'scroll-behavior: auto !important; }';
+    document.head.appendChild(style);
+});
+"""
+
+
+class RenderProfile:
+    """Profil de rendu allégé : bloque les ressources inutiles à l'extraction.
+
+    - `block_types` : types de ressources bloqués ('image', 'font', 'media',
+      'stylesheet'), reconnus à l'extension de l'URL ;
+    - `block_patterns` : motifs d'URL supplémentaires (par défaut, publicités
+      et traceurs courants) ;
+    - `disable_images` : désactive aussi les images dans les préférences de
+      Chrome (y compris celles sans extension reconnaissable) ;
+    - `disable_animations` : coupe animations et transitions CSS et active
+      prefers-reduced-motion.
+
+    Le blocage passe par le protocole DevTools (Network.setBlockedURLs) ;
+    les requêtes bloquées et les octets transférés de chaque page sont lus
+    dans le journal de performance de Chrome (voir report).
+
+        profile = RenderProfile(block_types=('image', 'font', 'media'))
+        scraper = SeleniumScraper(render_profile=profile)
+    """
+
+    def __init__(self, block_types=('image', 'font', 'media'), block_patterns=AD_TRACKER_PATTERNS,
+                 disable_images=True, disable_animations=True):
+        self.block_types = tuple(block_types)
+        self.block_patterns = tuple(block_patterns)
+        self.disable_images = disable_images
+        self.disable_animations = disable_animations
+
+    @classmethod
+    def full(cls):
+        """Profil sans blocage (rendu complet), pour comparaison"""
+        return cls(block_types=(), block_patterns=(), disable_images=False, disable_animations=False)
+
+    def blocked_urls(self):
+        patterns = list(self.block_patterns)
+        for resource_type in self.block_types:
+            patterns.extend(RESOURCE_PATTERNS[resource_type])
+        return patterns
+
+    def apply_options(self, options):
+        """Options Chrome à fixer avant le démarrage du driver"""
+        if self.disable_images:
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+            options.add_argument('--blink-settings=imagesEnabled=false')
+        # Journal réseau nécessaire pour le rapport par page
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def apply(self, driver):
+        """Active le blocage sur un driver démarré (Chrome uniquement)"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls()})
+            if self.disable_animations:
+                driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': NO_ANIMATION_SCRIPT})
+                driver.execute_cdp_cmd('Emulation.setEmulatedMedia', {
+                    'features': [{'name': 'prefers-reduced-motion', 'value': 'reduce'}]})
+            return True
+        except WebDriverException as e:
+            print(f"Profil de rendu non appliqué (CDP indisponible): {e}")
+            return False
+
+    # --- Rapport par page ------------------------------------------------------
+
+    @staticmethod
+    def _network_events(driver):
+        try:
+            entries = driver.get_log('performance')
+        except (WebDriverException, ValueError):
+            return None
+        events = []
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            if message['method'].startswith('Network.'):
+                events.append(message)
+        return events
+
+    def start_page(self, driver):
+        """Vide le journal réseau avant une navigation"""
+        self._network_events(driver)
+
+    def report(self, driver, url=None):
+        """Temps de chargement, octets transférés et requêtes bloquées de la dernière page"""
+        timing = driver.execute_script(
+            "var entry = performance.getEntriesByType('navigation')[0];"
+            "return entry ? {load: entry.loadEventEnd || entry.domContentLoadedEventEnd,"
+            " size: entry.transferSize} : null;")
+        report = {
+            'url': url or driver.current_url,
+            'load_ms': round(timing['load'], 1) if timing else None,
+            'bytes': 0,
+            'requests': 0,
+            'blocked_requests': 0,
+            'blocked_by_type': {},
+        }
+
+        events = self._network_events(driver)
+        if events is None:
+            # Pas de journal de performance : ressources visibles via Resource Timing
+            report['bytes'] = driver.execute_script(
+                "return performance.getEntriesByType('resource').reduce(function (total, entry) {"
+                " return total + entry.transferSize; }, 0);") + ((timing or {}).get('size') or 0)
+            return report
+
+        types = {}
+        for event in events:
+            params = event['params']
+            if event['method'] == 'Network.requestWillBeSent':
+                report['requests'] += 1
+                types[params['requestId']] = params.get('type', 'Other')
+            elif event['method'] == 'Network.loadingFinished':
+                report['bytes'] += int(params.get('encodedDataLength', 0))
+            elif event['method'] == 'Network.loadingFailed' and params.get('blockedReason'):
+                report['blocked_requests'] += 1
+                resource_type = params.get('type') or types.get(params['requestId'], 'Other')
+                report['blocked_by_type'][resource_type] = report['blocked_by_type'].get(resource_type, 0) + 1
+        return report
+
+    def compare(self, driver, url, wait=None):
+        """Charge la page sans puis avec le profil : temps et octets économisés.
+
+        `wait(driver)` attend que la page soit prête (par exemple
+        SeleniumScraper.readiness.wait). Le blocage par préférences Chrome
+        (disable_images) reste actif pendant les deux chargements.
+        """
+        reports = []
+        for blocked in (False, True):
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls() if blocked else []})
+            driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+            self.start_page(driver)
+            driver.get(url)
+            if wait:
+                wait(driver)
+            reports.append(self.report(driver, url))
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': False})
+
+        full, light = reports
+        return {
+            'url': url,
+            'full': full,
+            'light': light,
+            'bytes_saved': full['bytes'] - light['bytes'],
+            'load_ms_saved': None if full['load_ms'] is None or light['load_ms'] is None
+            else round(full['load_ms'] - light['load_ms'], 1),
+        }
@@ -3,15 +3,46 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 import time
 import csv
 import json
 
+from harvest import extract_element, extract_items, harvest_new_items, reset_harvest
+from readiness import NetworkIdle, default_readiness, install_network_tracker, wait_for_growth
+
+# Codes d'erreur réseau de Chrome pour lesquels une nouvelle tentative a un sens
+TRANSIENT_NET_ERRORS = ('ERR_CONNECTION_RESET', 'ERR_CONNECTION_CLOSED', 'ERR_CONNECTION_REFUSED',
+                        'ERR_TIMED_OUT', 'ERR_CONNECTION_TIMED_OUT', 'ERR_NETWORK_CHANGED',
+                        'ERR_EMPTY_RESPONSE')
+
+# Entrée Navigation Timing de la dernière navigation (durées en millisecondes)
+NAVIGATION_TIMING_SCRIPT = ("var entry = performance.getEntriesByType('navigation')[0];"
+                            "return entry ? entry.toJSON() : null;")
+
 class SeleniumScraper:
-    def __init__(self, headless=True, window_size="1920,1080"):
-        """Initialise le driver Selenium"""
+    def __init__(self, headless=True, window_size="1920,1080", scheduler=None,
+                 retry_policy=None, circuit_breaker=None, metrics=None, readiness=None,
+                 render_profile=None):
+        """Initialise le driver Selenium.
+
+        `scheduler` accepte un PolitenessScheduler (1.Scraping_with_request_bs4/politeness.py)
+        ou tout objet exposant acquire(url), pour partager les limites par hôte
+        avec WebScraper. De même, `retry_policy` et `circuit_breaker` acceptent
+        les RetryPolicy et CircuitBreaker de 1.Scraping_with_request_bs4/retry.py.
+        `metrics` accepte un MetricsRegistry (1.Scraping_with_request_bs4/metrics.py).
+        `readiness` décide quand une page est prête (voir readiness.py) ; par
+        défaut : réseau calme puis DOM stable (5 s au plus), au lieu d'un délai fixe.
+        `render_profile` (voir render_profile.py) bloque images, polices,
+        médias et traceurs ; load_page rapporte alors temps et octets par page.
+        """
         self.options = Options()
+        self.scheduler = scheduler
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.metrics = metrics
+        self.readiness = readiness or default_readiness()
+        self.render_profile = render_profile
         
         if headless:
             self.options.add_argument('--headless')
@@ -21,6 +52,8 @@ class SeleniumScraper:
         self.options.add_argument('--disable-dev-shm-usage')
         self.options.add_argument('--disable-gpu')
         self.options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        if render_profile:
+            render_profile.apply_options(self.options)
         
         self.driver = None
         self.wait = None
@@ -30,6 +63,10 @@ class SeleniumScraper:
         try:
             self.driver = webdriver.Chrome(options=self.options)
             self.wait = WebDriverWait(self.driver, 10)
+            # Suivi des requêtes en cours, utilisé par l'attente de calme réseau
+            install_network_tracker(self.driver)
+            if self.render_profile:
+                self.render_profile.apply(self.driver)
             print("Driver Selenium démarré avec succès")
         except Exception as e:
             print(f"Erreur lors du démarrage du driver: {e}")
@@ -42,19 +79,89 @@ class SeleniumScraper:
             print("Driver fermé")
     
     def get_page(self, url, wait_time=10):
-        """Charge une page et attend qu'elle soit prête"""
+        """Charge une page et attend qu'elle soit prête (détail via load_page)"""
+        return self.load_page(url, wait_time)['ok']
+    
+    def load_page(self, url, wait_time=10):
+        """Charge une page avec nouvelles tentatives et renvoie un résultat structuré"""
+        if self.render_profile:
+            self.render_profile.start_page(self.driver)
+        result = self._load_page(url, wait_time)
+        if self.render_profile and result['ok']:
+            # Temps de chargement, octets transférés et requêtes bloquées
+            result['render'] = self.render_profile.report(self.driver, url)
+        if self.metrics:
+            self.metrics.observe('fetch', result['elapsed'], scraper='selenium')
+            self.metrics.inc('fetches', outcome=result['outcome'], scraper='selenium')
+            if result['ok']:
+                self._record_navigation_timing()
+            else:
+                self.metrics.inc('errors', kind=result['outcome'], scraper='selenium')
+        return result
+    
+    def _record_navigation_timing(self):
+        """Enregistre les phases réseau et de rendu mesurées par le navigateur (Navigation Timing)"""
         try:
-            self.driver.get(url)
-            # Attendre que la page soit entièrement chargée
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(2)  # Délai supplémentaire pour le JavaScript
-            return True
-        except TimeoutException:
-            print(f"Timeout lors du chargement de {url}")
-            return False
-        except Exception as e:
-            print(f"Erreur lors du chargement de {url}: {e}")
-            return False
+            timing = self.driver.execute_script(NAVIGATION_TIMING_SCRIPT)
+        except WebDriverException:
+            return
+        if not timing:
+            return
+        
+        # Fin du rendu : événement load, ou DOMContentLoaded s'il n'est pas encore terminé
+        render_end = timing['loadEventEnd'] or timing['domContentLoadedEventEnd']
+        phases = {
+            'dns': timing['domainLookupEnd'] - timing['domainLookupStart'],
+            'connect': timing['connectEnd'] - timing['connectStart'],
+            'ttfb': timing['responseStart'] - timing['requestStart'],
+            'download': timing['responseEnd'] - timing['responseStart'],
+            'render': render_end - timing['responseEnd'],
+        }
+        for phase, milliseconds in phases.items():
+            if milliseconds >= 0:
+                self.metrics.observe(phase, milliseconds / 1000, scraper='selenium')
+        self.metrics.inc('bytes', timing.get('transferSize') or 0, scraper='selenium')
+    
+    def _load_page(self, url, wait_time):
+        start = time.monotonic()
+        max_attempts = self.retry_policy.max_attempts if self.retry_policy else 1
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.circuit_breaker and not self.circuit_breaker.allow(url):
+                if self.scheduler and attempt == 1:
+                    # Aucune requête : le créneau éventuellement réservé par next_url() est rendu
+                    self.scheduler.release(url)
+                return {'url': url, 'ok': False, 'outcome': 'circuit_open', 'attempts': attempt - 1,
+                        'error': "Hôte désactivé après des échecs répétés", 'elapsed': time.monotonic() - start}
+            try:
+                if self.scheduler:
+                    self.scheduler.acquire(url)
+                self.driver.get(url)
+                # Attendre que la page soit entièrement chargée
+                WebDriverWait(self.driver, wait_time).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                # Attendre que le JavaScript ait fini (réseau calme, DOM stable), sans délai fixe
+                self.readiness.wait(self.driver)
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_success(url)
+                return {'url': url, 'ok': True, 'outcome': 'success', 'attempts': attempt,
+                        'error': None, 'elapsed': time.monotonic() - start}
+            except TimeoutException:
+                outcome, error, retryable = 'timeout', f"Timeout lors du chargement de {url}", True
+            except WebDriverException as e:
+                # Erreurs réseau transitoires de Chrome (connexion coupée, délai dépassé)
+                error = e.msg or str(e)
+                retryable = any(code in error for code in TRANSIENT_NET_ERRORS)
+                outcome = 'network_error'
+            except Exception as e:
+                outcome, error, retryable = 'error', str(e), False
+            
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure(url)
+            if not retryable or attempt >= max_attempts:
+                return {'url': url, 'ok': False, 'outcome': outcome, 'attempts': attempt,
+                        'error': error, 'elapsed': time.monotonic() - start}
+            time.sleep(self.retry_policy.delay(attempt))
     
     def wait_for_element(self, selector, by=By.CSS_SELECTOR, timeout=10):
         """Attend qu'un élément soit présent"""
@@ -78,25 +185,41 @@ class SeleniumScraper:
             return False
     
     def scroll_to_bottom(self, pause_time=1):
-        """Fait défiler jusqu'en bas de la page"""
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        """Fait défiler jusqu'en bas de la page.
+        
+        `pause_time` est l'attente maximale après chaque défilement : on
+        continue dès que la page s'allonge, et on s'arrête dès que le réseau
+        est calme sans nouveau contenu.
+        """
+        height_script = "return document.body.scrollHeight"
+        network_idle = NetworkIdle(idle_ms=300)
+        last_height = self.driver.execute_script(height_script)
         
         while True:
             # Scroll vers le bas
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             
-            # Attendre que la page charge
-            time.sleep(pause_time)
-            
-            # Calculer la nouvelle hauteur de scroll
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            # Attendre que la page s'allonge (ou que plus rien ne se charge)
+            new_height = wait_for_growth(self.driver, height_script, last_height, pause_time, network_idle)
             
             if new_height == last_height:
                 break
             last_height = new_height
     
-    def scrape_infinite_scroll(self, item_selector, max_items=None):
-        """Scraper une page avec scroll infini"""
+    def scrape_infinite_scroll(self, item_selector, max_items=None, incremental=False, include_html=False,
+                               field_map=None):
+        """Scraper une page avec scroll infini
+        
+        Avec `incremental=True`, la récolte se fait par lots dans la page
+        (voir iter_infinite_scroll) : nombre d'allers-retours constant par
+        défilement, et `html` seulement si `include_html`.
+        """
+        if incremental:
+            items = []
+            for batch in self.iter_infinite_scroll(item_selector, max_items, include_html, field_map=field_map):
+                items.extend(batch)
+            return items
+        
         items = []
         seen_items = set()
         
@@ -132,28 +255,69 @@ class SeleniumScraper:
         
         return items
     
-    def extract_item_data(self, element):
-        """Extrait les données d'un élément (à personnaliser selon le site)"""
-        try:
-            data = {
-                'text': element.text,
-                'html': element.get_attribute('innerHTML')
-            }
-            
-            # Exemple: extraire des données spécifiques
-            try:
-                title = element.find_element(By.CSS_SELECTOR, 'h2, h3, .title')
-                data['title'] = title.text
-            except NoSuchElementException:
-                data['title'] = ''
+    def iter_infinite_scroll(self, item_selector, max_items=None, include_html=False, pause_time=1,
+                             field_map=None):
+        """Récolte un scroll infini par lots : renvoie les nouveaux éléments après chaque défilement.
+        
+        Un seul script injecté (voir harvest.py) renvoie en JSON les éléments
+        apparus depuis le lot précédent ; le dédoublonnage se fait dans la
+        page par empreinte (data-id, id, ou hachage du texte et du lien).
+        Les éléments retirés du DOM par les listes virtualisées sont récoltés
+        avant de disparaître. `field_map` choisit les champs (voir
+        extract_items_bulk).
+        """
+        reset_harvest(self.driver)
+        height_script = "return document.body.scrollHeight"
+        network_idle = NetworkIdle(idle_ms=300)
+        count = 0
+        finished = False
+        
+        while True:
+            remaining = max_items - count if max_items else None
+            batch = harvest_new_items(self.driver, item_selector, include_html, remaining, field_map)
+            if batch:
+                count += len(batch)
+                print(f"Éléments trouvés: {count}")
+                yield batch
             
-            try:
-                link = element.find_element(By.CSS_SELECTOR, 'a')
-                data['link'] = link.get_attribute('href')
-            except NoSuchElementException:
-                data['link'] = ''
+            if finished or (max_items and count >= max_items):
+                return
             
-            return data
+            # Scroll vers le bas, puis attendre que la page s'allonge
+            last_height = self.driver.execute_script(height_script)
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            new_height = wait_for_growth(self.driver, height_script, last_height, pause_time, network_idle)
+            # Page qui ne s'allonge plus : dernière récolte puis arrêt
+            finished = new_height == last_height
+    
+    def extract_items_bulk(self, container_selector, field_map=None, limit=None):
+        """Extrait tous les éléments d'une page en un seul appel exécuté dans le navigateur.
+        
+        `field_map` associe chaque champ à un sous-sélecteur (texte de
+        l'élément trouvé) ou à un tuple (sous-sélecteur, attribut), l'attribut
+        valant 'text', 'html' ou un nom d'attribut ; un sous-sélecteur None
+        désigne l'élément lui-même. Un champ introuvable vaut ''.
+        
+            scraper.extract_items_bulk('.product', {
+                'name': 'h2',
+                'price': '.price',
+                'url': ('a', 'href'),
+                'sku': (None, 'data-sku'),
+            })
+        
+        Sans `field_map`, mêmes champs qu'extract_item_data.
+        """
+        try:
+            return extract_items(self.driver, container_selector, field_map, limit)
+        except WebDriverException as e:
+            print(f"Erreur lors de l'extraction: {e}")
+            return []
+    
+    def extract_item_data(self, element, field_map=None):
+        """Extrait les données d'un élément (à personnaliser selon le site)"""
+        try:
+            # Un seul aller-retour WebDriver pour tous les champs (texte, html, titre, lien)
+            return extract_element(self.driver, element, field_map)
         except Exception as e:
             print(f"Erreur lors de l'extraction: {e}")
             return {'error': str(e)}
@@ -166,7 +330,11 @@ class SeleniumScraper:
                 close_button = self.driver.find_element(By.CSS_SELECTOR, close_button_selector)
                 close_button.click()
                 print("Popup fermé")
-                time.sleep(1)
+                # Attendre la disparition du popup plutôt qu'un délai fixe
+                try:
+                    WebDriverWait(self.driver, 2, 0.1).until(EC.invisibility_of_element(popup))
+                except TimeoutException:
+                    pass
         except NoSuchElementException:
             pass  # Pas de popup trouvé
     
@@ -185,8 +353,8 @@ class SeleniumScraper:
             for link_selector in navigation_links:
                 try:
                     if self.click_element(link_selector):
-                        # Attendre que le contenu se charge
-                        time.sleep(3)
+                        # Attendre que le contenu se charge (réseau calme, DOM stable)
+                        self.readiness.wait(self.driver)
                         
                         # Extraire le contenu
                         content = self.wait_for_element(content_selector)
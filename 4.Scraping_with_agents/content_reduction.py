@@ -0,0 +1,181 @@
+import re
+from typing import Dict, List, Tuple
+
+# Lignes sans valeur pour l'extraction : images seules, liens d'évitement
+BOILERPLATE_LINE = re.compile(
+    r"^\s*(?:[*+-]\s*)?(?:"
+    r"!\[[^\]]*\]\([^)]*\)\s*"                                      # image seule
+    r"|\[?(?:skip to (?:main )?content|aller au contenu|passer au contenu)[^\n]*"
+    r")$",
+    re.IGNORECASE,
+)
+# Bandeaux cookies et mentions légales : uniquement des lignes courtes et isolées (boutons, liens,
+# pied de page), jamais un titre ou un paragraphe qui parle de cookies ou cite un article de loi
+BANNER_MAX_WORDS = 8
+LEGAL_MAX_WORDS = 12
+COOKIE_WORD = re.compile(r"\b(?:cookies?|consentement|consent)\b", re.IGNORECASE)
+CONSENT_ACTION = re.compile(r"\b(?:accept\w*|refus\w*|param[eè]tr\w*|manage|gérer|personnaliser|settings)\b",
+                            re.IGNORECASE)
+LINKS_ONLY = re.compile(r"^(?:\s*\[[^\]]*\]\([^)]*\)\s*[|·•/-]?)+\s*$")
+COPYRIGHT_START = re.compile(r"^(?:©|\(c\)\s|copyright\b)", re.IGNORECASE)
+RIGHTS_RESERVED = re.compile(r"\b(?:all rights reserved|tous droits réservés)\b", re.IGNORECASE)
+BULLET = re.compile(r"^\s*[*+-]\s+")
+# Image dans une ligne de texte : seul le texte alternatif est gardé
+INLINE_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+# Lien markdown [texte](cible) et URL nue <https://...>
+MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\((?:[^()\s]|\([^)]*\))*(?:\s+\"[^\"]*\")?\)")
+BARE_URL = re.compile(r"<https?://[^>]+>")
+HEADING = re.compile(r"^#{1,6}\s")
+SPACES = re.compile(r"[ \t]+")
+TOKEN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation du nombre de tokens (mots et signes de ponctuation, +10 % pour les mots découpés)."""
+    return int(len(TOKEN.findall(text)) * 1.1)
+
+
+def is_banner_line(line: str) -> bool:
+    """Ligne de bandeau cookies ou de mentions légales (courte, isolée, hors titres)."""
+    text = BULLET.sub("", line).strip()
+    if not text or HEADING.match(text):
+        return False
+    words = len(MARKDOWN_LINK.sub(r"\1", text).split())
+    if COOKIE_WORD.search(text):
+        # Liens seuls ("[Accepter les cookies](...)"), ou bandeau court avec une action qui est un lien
+        # ou un bouton ("Paramétrer les cookies") plutôt qu'une phrase
+        if words > BANNER_MAX_WORDS:
+            return False
+        is_button = bool(MARKDOWN_LINK.search(text)) or not text.endswith((".", "!", "?", "…", ":"))
+        return bool(LINKS_ONLY.match(text)) or (bool(CONSENT_ACTION.search(text)) and is_button)
+    if COPYRIGHT_START.match(text):
+        return words <= LEGAL_MAX_WORDS
+    return words <= LEGAL_MAX_WORDS and bool(RIGHTS_RESERVED.search(text))
+
+
+def strip_boilerplate(markdown: str, keep_links: bool = True) -> str:
+    """Supprime images, bandeaux cookies, liens d'évitement et mentions légales du markdown.
+
+    Avec `keep_links=False`, les liens sont réduits à leur texte (cibles
+    extraites par ailleurs, voir pre_extraction.py).
+    """
+    lines = []
+    for line in markdown.splitlines():
+        if BOILERPLATE_LINE.match(line) or is_banner_line(line):
+            continue
+        line = INLINE_IMAGE.sub(r"\1", line)
+        if not keep_links:
+            line = BARE_URL.sub("", MARKDOWN_LINK.sub(r"\1", line))
+        lines.append(SPACES.sub(" ", line).rstrip())
+    return "\n".join(lines)
+
+
+def split_blocks(markdown: str) -> List[str]:
+    """Découpe le markdown en blocs (paragraphes, listes), un titre commençant toujours un bloc."""
+    blocks, current = [], []
+    for line in markdown.splitlines():
+        if not line.strip() or HEADING.match(line):
+            if current:
+                blocks.append("\n".join(current))
+            current = [line] if line.strip() else []
+        else:
+            current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def deduplicate_blocks(blocks: List[str]) -> List[str]:
+    """Garde la première occurrence de chaque bloc (menus répétés en haut et en bas de page...)."""
+    seen = set()
+    unique = []
+    for block in blocks:
+        key = SPACES.sub(" ", block.strip().lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(block)
+    return unique
+
+
+def reduce_content(markdown: str, keep_links: bool = True) -> Tuple[str, Dict[str, int]]:
+    """Nettoie le markdown d'une page : boilerplate supprimé, blocs répétés dédoublonnés
+    (et liens réduits à leur texte avec `keep_links=False`).
+
+    Renvoie le contenu réduit et des statistiques (caractères et tokens estimés,
+    avant et après).
+    """
+    blocks = deduplicate_blocks(split_blocks(strip_boilerplate(markdown, keep_links)))
+    reduced = "\n\n".join(blocks)
+    stats = {
+        "original_chars": len(markdown),
+        "reduced_chars": len(reduced),
+        "original_tokens": estimate_tokens(markdown),
+        "reduced_tokens": estimate_tokens(reduced),
+        "blocks": len(blocks),
+    }
+    return reduced, stats
+
+
+def _split_oversized(block: str, max_tokens: int) -> List[str]:
+    """Découpe un bloc trop long ligne par ligne, puis mot par mot si une ligne dépasse encore."""
+    pieces, current, current_tokens = [], [], 0
+    for line in block.splitlines():
+        line_tokens = estimate_tokens(line)
+        if line_tokens > max_tokens:
+            words = line.split(" ")
+            step = max(1, int(len(words) * max_tokens / line_tokens))
+            parts = [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+        else:
+            parts = [line]
+        for part in parts:
+            part_tokens = estimate_tokens(part)
+            if current and current_tokens + part_tokens > max_tokens:
+                pieces.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += part_tokens
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def chunk_content(markdown: str, max_tokens: int = 6000) -> List[str]:
+    """Regroupe les blocs en morceaux d'au plus `max_tokens` tokens estimés, sans couper un bloc
+    (sauf s'il dépasse à lui seul le budget). Un contenu qui tient dans le budget donne un seul morceau.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for block in split_blocks(markdown):
+        block_tokens = estimate_tokens(block)
+        pieces = _split_oversized(block, max_tokens) if block_tokens > max_tokens else [block]
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks or [""]
+
+
+if __name__ == "__main__":
+    # Non-régression : chaque fixtures/<nom>.md réduit (liens réduits à leur texte) doit
+    # donner exactement fixtures/<nom>.expected.md
+    import os
+    import sys
+
+    fixtures_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+    failures = 0
+    for name in sorted(os.listdir(fixtures_dir)):
+        if not name.endswith(".md") or name.endswith(".expected.md"):
+            continue
+        with open(os.path.join(fixtures_dir, name), encoding="utf-8") as f:
+            reduced, stats = reduce_content(f.read(), keep_links=False)
+        with open(os.path.join(fixtures_dir, name[:-3] + ".expected.md"), encoding="utf-8") as f:
+            expected = f.read().rstrip("\n")
+        ok = reduced == expected
+        failures += not ok
+        print(f"{'OK ' if ok else 'ÉCHEC'} {name} : ~{stats['original_tokens']} → ~{stats['reduced_tokens']} tokens")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+
+def normalize_content(text: str) -> str:
+    """Normalise le contenu avant hachage (Unicode NFC, espaces en fin de ligne, lignes vides répétées)."""
+    lines = [line.rstrip() for line in unicodedata.normalize("NFC", text).strip().splitlines()]
+    normalized = []
+    for line in lines:
+        if line or (normalized and normalized[-1]):
+            normalized.append(line)
+    return "\n".join(normalized)
+
+
+class LLMCache:
+    """Cache persistant des extractions structurées par LLM (SQLite).
+
+    La clé est un hachage du contenu normalisé, du schéma du modèle de
+    réponse (PageInformation, WebPageData...), des instructions de l'agent
+    et de l'identifiant du modèle : une page inchangée est resservie sans
+    appel au LLM, et tout changement de prompt, de schéma ou de modèle
+    invalide l'entrée. Les entrées expirent après `ttl` secondes (None :
+    jamais) et les moins récemment utilisées sont supprimées au-delà de
+    `max_entries`.
+
+        cache = LLMCache("llm_cache.sqlite", ttl=7 * 24 * 3600)
+        result, hit = cache.run(agent, prompt, content=page_content)
+
+    Passer le contenu seul (`content`) plutôt que le prompt complet : un
+    prompt contenant l'URL donnerait une clé par URL et non par contenu.
+    """
+
+    def __init__(self, path: str = "llm_cache.sqlite", ttl: Optional[float] = 7 * 24 * 3600,
+                 max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                value TEXT,
+                stored_at REAL,
+                last_access REAL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS extractions_lru ON extractions (last_access)")
+        self._db.commit()
+
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def close(self):
+        self._db.close()
+
+    @staticmethod
+    def make_key(content: str, response_model: Type[BaseModel], instructions: Any = None,
+                 model_id: Optional[str] = None) -> str:
+        """Empreinte SHA-256 de (contenu normalisé, schéma, instructions, modèle)."""
+        parts = {
+            "content": normalize_content(content),
+            "schema": response_model.model_json_schema() if response_model else None,
+            "instructions": instructions,
+            "model": model_id,
+        }
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def key_for(self, agent: Any, content: str) -> str:
+        """Clé d'un contenu pour un agent agno (schéma, instructions et modèle lus sur l'agent)."""
+        model = getattr(agent, "model", None)
+        return self.make_key(content, agent.response_model, getattr(agent, "instructions", None),
+                             getattr(model, "id", None))
+
+    def get(self, key: str, response_model: Type[BaseModel]) -> Optional[BaseModel]:
+        """Résultat validé en cache, ou None (absent, expiré ou ne respectant plus le schéma)."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, stored_at FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row and self.ttl is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            try:
+                value = response_model.model_validate_json(row[0])
+            except ValidationError:
+                self._db.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                self._db.commit()
+                self.stats["misses"] += 1
+                return None
+            self._db.execute("UPDATE extractions SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, key: str, value: BaseModel):
+        now = time.time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?, ?)",
+                             (key, type(value).__name__, value.model_dump_json(), now, now))
+            self.stats["stores"] += 1
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_entries."""
+        count = self._db.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._db.execute("DELETE FROM extractions WHERE key IN "
+                             "(SELECT key FROM extractions ORDER BY last_access LIMIT ?)", (excess,))
+            self.stats["evictions"] += excess
+
+    def run(self, agent: Any, prompt: str, content: Optional[str] = None) -> Tuple[Any, bool]:
+        """agent.run(prompt) avec cache : renvoie (résultat structuré, trouvé en cache).
+
+        La clé porte sur `content` (contenu de la page inclus dans le prompt),
+        ou sur le prompt entier à défaut.
+        """
+        key = self.key_for(agent, prompt if content is None else content)
+        cached = self.get(key, agent.response_model)
+        if cached is not None:
+            return cached, True
+        result = agent.run(prompt).content
+        if isinstance(result, BaseModel):
+            # Seules les réponses conformes au schéma sont mises en cache (pas le texte brut)
+            self.put(key, result)
+        return result, False
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import os
+import re
+import time
+import typing
+from typing import Any, Optional, Type
+
+from pydantic import BaseModel
+
+from content_reduction import estimate_tokens
+
+DEFAULT_MODEL_ID = "mistral-large-2411"
+HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+# Contenu de la page dans les prompts des scripts (après "WEBPAGE CONTENT:" ou la première ligne vide)
+PAGE_CONTENT = re.compile(r"WEBPAGE CONTENT:\s*\n(.*)", re.DOTALL)
+
+
+class OfflineModelError(Exception):
+    """Échec simulé par le modèle hors ligne (voir failure_rate)."""
+
+
+class OfflineResponse:
+    """Réponse au format de agno (attribut content)."""
+
+    def __init__(self, content: Any):
+        self.content = content
+
+
+class OfflineModel:
+    """Paramètres du modèle simulé : latence fixe, débit de sortie et taux d'échec."""
+
+    def __init__(self, latency_seconds: float = 1.0, tokens_per_second: float = 50.0,
+                 failure_rate: float = 0.0, seed: int = 0):
+        self.id = "offline-stand-in"
+        self.latency_seconds = latency_seconds
+        self.tokens_per_second = tokens_per_second
+        self.failure_rate = failure_rate
+        self.seed = seed
+
+
+def _page_content(prompt: str) -> str:
+    match = PAGE_CONTENT.search(prompt)
+    if match:
+        return match.group(1)
+    return prompt.split("\n\n", 1)[-1]
+
+
+def _placeholder(annotation: Any, name: str, content: str) -> Any:
+    """Valeur valide pour un type de champ, tirée du contenu quand le nom du champ s'y prête."""
+    origin = typing.get_origin(annotation)
+    arguments = typing.get_args(annotation)
+    if origin is typing.Union:
+        # Optional[X] : X pour les champs utiles au débit (listes, textes), sinon None
+        inner = [argument for argument in arguments if argument is not type(None)]
+        if name in ("headlines", "categories", "content_sections", "description", "page_type"):
+            return _placeholder(inner[0], name, content)
+        return None
+    if origin in (list, typing.List):
+        headings = HEADING.findall(content)[:10]
+        if name == "content_sections" and arguments and isinstance(arguments[0], type) \
+                and issubclass(arguments[0], BaseModel):
+            return [arguments[0].model_validate({"heading": heading, "content": heading}) for heading in headings]
+        return headings if name in ("headlines", "categories") else []
+    if origin in (dict, typing.Dict):
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return build_placeholder(annotation, content)
+    if annotation is str:
+        if name == "title":
+            headings = HEADING.findall(content)
+            return headings[0] if headings else content.strip().split("\n", 1)[0][:120]
+        if name in ("main_content", "content"):
+            return content.strip()[:2000]
+        if name == "page_type":
+            return "webpage"
+        return content.strip()[:200]
+    if annotation is bool:
+        return True
+    if annotation in (int, float):
+        return annotation(0)
+    return None
+
+
+def build_placeholder(response_model: Type[BaseModel], content: str) -> BaseModel:
+    """Instance valide de `response_model`, déterministe, construite à partir du contenu de la page."""
+    values = {name: _placeholder(field.annotation, name, content)
+              for name, field in response_model.model_fields.items()}
+    return response_model.model_validate(values)
+
+
+class OfflineAgent:
+    """Remplaçant local et déterministe d'un agent agno pour les tests de charge.
+
+    Même interface que les agents des scripts (run, arun, response_model,
+    instructions, model.id) : la réponse est une instance valide du modèle
+    de réponse (PageInformation, WebPageData...) construite à partir du
+    contenu du prompt, après une attente simulant l'appel réel (latence fixe
+    + tokens de sortie / débit). Une fraction `failure_rate` des prompts
+    échoue, toujours les mêmes pour une graine donnée.
+    """
+
+    def __init__(self, response_model: Optional[Type[BaseModel]] = None, instructions: Any = None,
+                 model: Optional[OfflineModel] = None):
+        self.response_model = response_model
+        self.instructions = instructions
+        self.model = model or OfflineModel()
+        self.stats = {"calls": 0, "failures": 0, "input_tokens": 0, "output_tokens": 0}
+
+    def _respond(self, prompt: str) -> tuple[Any, float]:
+        """Réponse et durée simulée de l'appel."""
+        self.stats["calls"] += 1
+        self.stats["input_tokens"] += estimate_tokens(prompt)
+        digest = hashlib.sha256(f"{self.model.seed}:{prompt}".encode("utf-8")).digest()
+        if int.from_bytes(digest[:8], "big") / 2 ** 64 < self.model.failure_rate:
+            self.stats["failures"] += 1
+            raise OfflineModelError("Échec simulé du modèle hors ligne")
+
+        content = _page_content(prompt)
+        if self.response_model is None:
+            response = content.strip()[:2000]
+            output = response
+        else:
+            response = build_placeholder(self.response_model, content)
+            output = response.model_dump_json()
+        output_tokens = estimate_tokens(output)
+        self.stats["output_tokens"] += output_tokens
+        return response, self.model.latency_seconds + output_tokens / self.model.tokens_per_second
+
+    def run(self, prompt: str) -> OfflineResponse:
+        response, duration = self._respond(prompt)
+        time.sleep(duration)
+        return OfflineResponse(response)
+
+    async def arun(self, prompt: str) -> OfflineResponse:
+        response, duration = self._respond(prompt)
+        await asyncio.sleep(duration)
+        return OfflineResponse(response)
+
+
+def selected_backend(backend: Optional[str] = None) -> str:
+    """Backend demandé : `backend`, sinon AGENT_MODEL_BACKEND (par défaut 'mistral')."""
+    return (backend or os.environ.get("AGENT_MODEL_BACKEND", "mistral")).lower()
+
+
+def make_agent(response_model: Optional[Type[BaseModel]] = None, instructions: Any = None,
+               model_id: str = DEFAULT_MODEL_ID, backend: Optional[str] = None,
+               offline_model: Optional[OfflineModel] = None, **agent_options):
+    """Agent d'extraction selon le backend : 'mistral' (agno + MistralChat) ou 'offline' (OfflineAgent).
+
+    Sans `backend`, la variable d'environnement AGENT_MODEL_BACKEND est lue
+    (par défaut 'mistral') ; les options du modèle hors ligne se règlent
+    avec OFFLINE_LLM_LATENCY, OFFLINE_LLM_TOKENS_PER_SECOND et
+    OFFLINE_LLM_FAILURE_RATE.
+    """
+    backend = selected_backend(backend)
+    if backend == "offline":
+        if offline_model is None:
+            offline_model = OfflineModel(
+                latency_seconds=float(os.environ.get("OFFLINE_LLM_LATENCY", 1.0)),
+                tokens_per_second=float(os.environ.get("OFFLINE_LLM_TOKENS_PER_SECOND", 50.0)),
+                failure_rate=float(os.environ.get("OFFLINE_LLM_FAILURE_RATE", 0.0)),
+            )
+        return OfflineAgent(response_model, instructions, offline_model)
+    if backend != "mistral":
+        raise ValueError(f"Backend de modèle inconnu: {backend}")
+
+    from agno.agent import Agent
+    from agno.models.mistral import MistralChat
+    return Agent(model=MistralChat(id=model_id), instructions=instructions, response_model=response_model,
+                 **agent_options)
@@ -0,0 +1,272 @@
+import json
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+# Réseaux sociaux reconnus au domaine du lien
+SOCIAL_DOMAINS = {
+    "facebook.com": "facebook",
+    "twitter.com": "twitter",
+    "x.com": "x",
+    "instagram.com": "instagram",
+    "linkedin.com": "linkedin",
+    "youtube.com": "youtube",
+    "tiktok.com": "tiktok",
+    "pinterest.com": "pinterest",
+    "github.com": "github",
+    "mastodon.social": "mastodon",
+    "threads.net": "threads",
+    "bsky.app": "bluesky",
+    "whatsapp.com": "whatsapp",
+    "t.me": "telegram",
+}
+# Conteneurs dont les liens sont des liens de navigation
+NAVIGATION_TAGS = {"nav", "header", "footer"}
+NAVIGATION_ROLES = {"navigation", "menu", "menubar", "banner", "contentinfo"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+DATE_META = {"article:published_time", "article:modified_time", "date", "dc.date", "pubdate", "publishdate",
+             "og:updated_time"}
+EMAIL = re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}\b", re.IGNORECASE)
+# Numéros à 10 chiffres groupés par deux (01 23 45 67 89) ou internationaux (+33 1 23 45 67 89)
+PHONE = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?(?:\(0\)\s?)?\d|0\d)(?:[\s.-]?\d{2}){4}(?!\d)")
+SPACES = re.compile(r"\s+")
+# Texte minimal (en mots) d'un lien interne hors navigation pour le compter comme lien d'article
+ARTICLE_LINK_MIN_WORDS = 3
+
+
+def site_domain(url: str) -> str:
+    """Domaine d'une URL sans 'www.', pour comparer interne / externe."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _social_platform(url: str) -> Optional[str]:
+    domain = site_domain(url)
+    for social_domain, platform in SOCIAL_DOMAINS.items():
+        if domain == social_domain or domain.endswith("." + social_domain):
+            return platform
+    return None
+
+
+class _PageScanner(HTMLParser):
+    """Parcours unique du HTML : langue, balises meta, liens (avec leur contexte), JSON-LD, <time>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.language = None
+        self.meta = {}
+        self.links = []
+        self.json_ld = []
+        self.times = []
+        self.text = []
+        self._stack = []
+        self._link = None
+        self._json_ld = None
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or "" for name, value in attrs}
+        if tag == "html" and attrs.get("lang"):
+            self.language = attrs["lang"]
+        elif tag == "meta":
+            name = (attrs.get("name") or attrs.get("property") or attrs.get("http-equiv") or "").lower()
+            if name and attrs.get("content"):
+                self.meta.setdefault(name, attrs["content"].strip())
+        elif tag == "time" and attrs.get("datetime"):
+            self.times.append(attrs["datetime"])
+        elif tag == "a" and attrs.get("href"):
+            self._link = {"href": attrs["href"], "text": [], "navigation": self._in_navigation()}
+        elif tag == "script" and "ld+json" in attrs.get("type", ""):
+            self._json_ld = []
+        if tag in ("script", "style", "template"):
+            self._skip += 1
+        if tag not in VOID_TAGS:
+            self._stack.append((tag, attrs.get("role", "").lower()))
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._link is not None:
+            self._link["text"] = SPACES.sub(" ", "".join(self._link["text"])).strip()
+            self.links.append(self._link)
+            self._link = None
+        elif tag == "script" and self._json_ld is not None:
+            self.json_ld.append("".join(self._json_ld))
+            self._json_ld = None
+        if tag in ("script", "style", "template"):
+            self._skip = max(0, self._skip - 1)
+        # Fermeture tolérante : on dépile jusqu'à la balise ouvrante correspondante
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                del self._stack[i:]
+                break
+
+    def handle_data(self, data):
+        if self._json_ld is not None:
+            self._json_ld.append(data)
+        elif not self._skip:
+            self.text.append(data)
+            if self._link is not None:
+                self._link["text"].append(data)
+
+    def _in_navigation(self):
+        return any(tag in NAVIGATION_TAGS or role in NAVIGATION_ROLES for tag, role in self._stack)
+
+
+def _parse_json_ld(blocks: List[str]) -> List[Any]:
+    """Blocs JSON-LD de la page, blocs invalides ignorés."""
+    parsed = []
+    for block in blocks:
+        try:
+            parsed.append(json.loads(block))
+        except ValueError:
+            continue
+    return parsed
+
+
+def _json_ld_objects(blocks: List[Any]) -> List[Dict[str, Any]]:
+    """Objets JSON-LD des blocs, listes et @graph aplatis."""
+    objects = []
+    for data in blocks:
+        pending = list(data) if isinstance(data, list) else [data]
+        for item in pending:
+            if isinstance(item, dict):
+                objects.append(item)
+                if isinstance(item.get("@graph"), list):
+                    pending.extend(node for node in item["@graph"] if isinstance(node, dict))
+    return objects
+
+
+def _names(value: Any) -> List[str]:
+    """Noms d'auteurs JSON-LD (chaîne, objet Person ou liste)."""
+    values = value if isinstance(value, list) else [value]
+    names = []
+    for item in values:
+        if isinstance(item, str):
+            names.append(item)
+        elif isinstance(item, dict) and item.get("name"):
+            names.append(str(item["name"]))
+    return names
+
+
+def _text(value: Any) -> Optional[str]:
+    """Valeur JSON-LD textuelle : la chaîne elle-même, ou la première chaîne d'une liste."""
+    values = value if isinstance(value, list) else [value]
+    return next((item.strip() for item in values if isinstance(item, str) and item.strip()), None)
+
+
+def _address_part(part: Any) -> Optional[str]:
+    """Élément d'adresse JSON-LD : texte, nombre (code postal 75001) ou objet nommé (Country)."""
+    if isinstance(part, str):
+        return part
+    if isinstance(part, (int, float)) and not isinstance(part, bool):
+        return str(part)
+    if isinstance(part, dict) and isinstance(part.get("name"), str):
+        return part["name"]
+    return None
+
+
+def _address(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        return next((address for address in map(_address, value) if address), None)
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        parts = [value.get(key) for key in ("streetAddress", "postalCode", "addressLocality", "addressCountry")]
+        return ", ".join(part for part in map(_address_part, parts) if part) or None
+    return None
+
+
+def _unique(values):
+    return list(dict.fromkeys(value for value in values if value))
+
+
+def pre_extract(html: str, url: str) -> Dict[str, Any]:
+    """Champs de PageInformation calculables sans LLM, en un seul parcours du HTML.
+
+    Renvoie un dictionnaire avec description, language, dates, authors,
+    navigation_links / article_links / external_links (dictionnaires url /
+    text / category), social_media, contact_info et metadata (JSON-LD et
+    Open Graph). Les champs introuvables valent None.
+    """
+    scanner = _PageScanner()
+    scanner.feed(html)
+    scanner.close()
+    meta = scanner.meta
+    json_ld_blocks = _parse_json_ld(scanner.json_ld)
+    json_ld = _json_ld_objects(json_ld_blocks)
+    domain = site_domain(url)
+
+    # Liens : mêmes règles que WebScraper.extract_links (URL absolue), puis classement par domaine
+    navigation, articles, external, social = [], [], [], {}
+    contact = {"email": None, "phone": None, "address": None}
+    seen = set()
+    for link in scanner.links:
+        href = link["href"].strip()
+        if href.startswith("mailto:"):
+            contact["email"] = contact["email"] or href[7:].split("?")[0]
+            continue
+        if href.startswith("tel:"):
+            contact["phone"] = contact["phone"] or href[4:]
+            continue
+        if href.startswith(("#", "javascript:")):
+            continue
+        absolute_url = urljoin(url, href)
+        if absolute_url in seen:
+            continue
+        seen.add(absolute_url)
+
+        platform = _social_platform(absolute_url)
+        if platform:
+            social.setdefault(platform, absolute_url)
+        info = {"url": absolute_url, "text": link["text"]}
+        if site_domain(absolute_url) != domain:
+            external.append(dict(info, category="external"))
+        elif link["navigation"]:
+            navigation.append(dict(info, category="navigation"))
+        elif len(link["text"].split()) >= ARTICLE_LINK_MIN_WORDS:
+            articles.append(dict(info, category="article"))
+
+    text = " ".join(scanner.text)
+    if not contact["email"]:
+        match = EMAIL.search(text)
+        contact["email"] = match.group(0) if match else None
+    if not contact["phone"]:
+        match = PHONE.search(text)
+        contact["phone"] = match.group(0).strip() if match else None
+
+    dates, authors = [], []
+    for item in json_ld:
+        dates.extend(item.get(key) for key in ("datePublished", "dateModified", "dateCreated")
+                     if isinstance(item.get(key), str))
+        authors.extend(_names(item.get("author")))
+        contact["email"] = contact["email"] or _text(item.get("email"))
+        contact["phone"] = contact["phone"] or _text(item.get("telephone"))
+        contact["address"] = contact["address"] or _address(item.get("address"))
+        same_as_values = item.get("sameAs") or []
+        for same_as in [same_as_values] if isinstance(same_as_values, str) else same_as_values:
+            platform = _social_platform(same_as) if isinstance(same_as, str) else None
+            if platform:
+                social.setdefault(platform, same_as)
+    dates.extend(value for name, value in meta.items() if name in DATE_META)
+    dates.extend(scanner.times)
+
+    metadata = {}
+    if json_ld_blocks:
+        metadata["json_ld"] = json_ld_blocks
+    open_graph = {name: value for name, value in meta.items() if name.startswith("og:")}
+    if open_graph:
+        metadata["open_graph"] = open_graph
+
+    language = scanner.language or meta.get("content-language") or meta.get("og:locale")
+    return {
+        "description": meta.get("description") or meta.get("og:description") or meta.get("twitter:description"),
+        "language": language.replace("_", "-") if language else None,
+        "dates": _unique(dates) or None,
+        "authors": _unique(authors + [meta.get("author")]) or None,
+        "navigation_links": navigation or None,
+        "article_links": articles or None,
+        "external_links": external or None,
+        "social_media": social or None,
+        "contact_info": contact if any(contact.values()) else None,
+        "metadata": metadata or None,
+    }
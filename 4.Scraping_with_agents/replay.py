@@ -0,0 +1,254 @@
+"""Rejeu hors ligne du pipeline d'extraction agent (crawl4ai + LLM).
+
+Deux commandes :
+
+    python replay.py record --urls https://www.lemonde.fr/ https://techcrunch.com --recordings enregistrements/
+    python replay.py run --recordings enregistrements/ --repeat 50 --llm-latency 2 --llm-workers 4 --json rejeu.json
+
+`record` crawle les URLs une fois (navigateur réel) et enregistre markdown,
+HTML et temps de crawl. `run` rejoue ces pages dans extraction_pipeline sans
+réseau : ReplayCrawler remplace AsyncWebCrawler (avec le temps de crawl
+enregistré, ou --crawl-latency) et OfflineAgent remplace le modèle Mistral
+(latence, débit de tokens et taux d'échec réglables). Le rapport donne le
+débit du lot, les percentiles par étape et le gain du pipeline par rapport
+à un traitement strictement séquentiel.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from urllib.parse import urldefrag
+
+from model_backend import OfflineAgent, OfflineModel
+
+
+def recording_path(directory: str, url: str) -> str:
+    """Fichier d'enregistrement d'une URL (fragment ignoré)."""
+    digest = hashlib.sha1(urldefrag(url)[0].encode("utf-8")).hexdigest()
+    return os.path.join(directory, f"{digest}.json")
+
+
+def load_recording(directory: str, url: str) -> Optional[Dict[str, Any]]:
+    """Enregistrement d'une URL (voir RecordingCrawler), ou None s'il n'existe pas."""
+    path = recording_path(directory, url)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class RecordingCrawler:
+    """Enveloppe un AsyncWebCrawler et enregistre chaque résultat de arun dans `directory`."""
+
+    def __init__(self, crawler: Any, directory: str):
+        self.crawler = crawler
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    async def __aenter__(self):
+        await self.crawler.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self.crawler.__aexit__(*exc_info)
+
+    async def arun(self, url: str, **options):
+        start = time.perf_counter()
+        result = await self.crawler.arun(url=url, **options)
+        recording = {
+            "url": url,
+            "success": bool(result.success),
+            "markdown": str(result.markdown or ""),
+            "html": result.html or "",
+            "error_message": result.error_message,
+            "crawl_seconds": time.perf_counter() - start,
+            "recorded_at": datetime.now().isoformat(),
+        }
+        with open(recording_path(self.directory, url), "w", encoding="utf-8") as f:
+            json.dump(recording, f, ensure_ascii=False)
+        return result
+
+
+class ReplayCrawler:
+    """Remplaçant de AsyncWebCrawler qui sert les pages enregistrées.
+
+    La durée de chaque crawl est celle de l'enregistrement multipliée par
+    `time_scale`, ou `latency_seconds` si elle est fournie. Une URL sans
+    enregistrement donne un échec, comme un crawl raté.
+    """
+
+    def __init__(self, directory: str, latency_seconds: Optional[float] = None, time_scale: float = 1.0):
+        self.directory = directory
+        self.latency_seconds = latency_seconds
+        self.time_scale = time_scale
+        self._recordings = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        path = recording_path(self.directory, url)
+        if path not in self._recordings:
+            recording = load_recording(self.directory, url)
+            if recording is None:
+                return None
+            self._recordings[path] = recording
+        return self._recordings[path]
+
+    async def arun(self, url: str, **options):
+        recording = self._load(url)
+        if recording is None:
+            return SimpleNamespace(success=False, markdown="", html="",
+                                   error_message=f"Aucun enregistrement pour {url}")
+        delay = self.latency_seconds if self.latency_seconds is not None \
+            else recording["crawl_seconds"] * self.time_scale
+        await asyncio.sleep(delay)
+        return SimpleNamespace(success=recording["success"], markdown=recording["markdown"],
+                               html=recording["html"], error_message=recording["error_message"])
+
+
+def recorded_urls(directory: str) -> List[str]:
+    urls = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                urls.append(json.load(f)["url"])
+    return urls
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Percentile par rang le plus proche (None si aucune valeur), comme benchmarks/run_benchmarks.py."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+async def record(urls: List[str], directory: str):
+    """Crawle les URLs (réseau et navigateur réels) et enregistre les résultats."""
+    from crawl4ai import AsyncWebCrawler
+    from web_extraction_agent_with_crawl4ai import crawl_page
+
+    async with RecordingCrawler(AsyncWebCrawler(verbose=False, headless=True), directory) as crawler:
+        for url in urls:
+            try:
+                markdown, _, crawl_time = await crawl_page(url, crawler)
+                print(f"✅ {url} : {len(markdown):,} caractères en {crawl_time:.2f}s")
+            except Exception as e:
+                print(f"❌ {url} : {e}")
+
+
+async def replay(urls: List[str], directory: str, model: OfflineModel, crawl_latency: Optional[float] = None,
+                 crawl_time_scale: float = 1.0, verbose: bool = False, **pipeline_options) -> Dict[str, Any]:
+    """Rejoue les URLs dans extraction_pipeline avec ReplayCrawler et OfflineAgent ; renvoie le rapport."""
+    import web_extraction_agent_with_crawl4ai as agent_module
+
+    agent = OfflineAgent(agent_module.SemanticPageInformation, agent_module.extraction_agent.instructions, model)
+    agent_module.extraction_agent = agent
+    agent_module.console.quiet = not verbose
+
+    stages = {"crawl": [], "preprocess": [], "llm": [], "queue_wait": []}
+    succeeded, failed, serial_seconds = 0, 0, 0.0
+    start = time.perf_counter()
+    async with ReplayCrawler(directory, crawl_latency, crawl_time_scale) as crawler:
+        async for result in agent_module.extraction_pipeline(urls, crawler, **pipeline_options):
+            diagnostics = result.diagnostics
+            if not diagnostics.success:
+                failed += 1
+                continue
+            succeeded += 1
+            stages["crawl"].append(diagnostics.crawl_time_seconds)
+            stages["preprocess"].append(diagnostics.preprocess_time_seconds)
+            stages["llm"].append(diagnostics.processing_time_seconds)
+            stages["queue_wait"].append(diagnostics.queue_wait_seconds)
+            serial_seconds += (diagnostics.crawl_time_seconds + diagnostics.preprocess_time_seconds
+                               + diagnostics.processing_time_seconds)
+    wall = time.perf_counter() - start
+
+    return {
+        "pages": len(urls),
+        "succeeded": succeeded,
+        "failed": failed,
+        "wall_seconds": wall,
+        "pages_per_second": succeeded / wall if wall else None,
+        # Durée qu'aurait pris le même travail sans recouvrement des étapes
+        "serial_seconds": serial_seconds,
+        "pipeline_speedup": serial_seconds / wall if wall else None,
+        "stages": {
+            name: {"p50_ms": None if not values else percentile(values, 0.50) * 1000,
+                   "p99_ms": None if not values else percentile(values, 0.99) * 1000,
+                   "total_seconds": sum(values)}
+            for name, values in stages.items()
+        },
+        "llm": dict(agent.stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Enregistre le crawl réel des URLs")
+    record_parser.add_argument("--urls", nargs="+", required=True)
+    record_parser.add_argument("--recordings", required=True, help="Dossier des enregistrements")
+
+    run_parser = commands.add_parser("run", help="Rejoue les enregistrements hors ligne")
+    run_parser.add_argument("--recordings", required=True, help="Dossier des enregistrements")
+    run_parser.add_argument("--repeat", type=int, default=1, help="Nombre de passages sur chaque page")
+    run_parser.add_argument("--crawl-latency", type=float, help="Durée fixe d'un crawl (s) au lieu de l'enregistrée")
+    run_parser.add_argument("--crawl-time-scale", type=float, default=1.0, help="Facteur appliqué aux durées enregistrées")
+    run_parser.add_argument("--llm-latency", type=float, default=1.0, help="Latence fixe d'un appel LLM (s)")
+    run_parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Débit de sortie du LLM simulé")
+    run_parser.add_argument("--failure-rate", type=float, default=0.0, help="Part des appels LLM en échec")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--crawl-workers", type=int, default=5)
+    run_parser.add_argument("--preprocess-workers", type=int, default=2)
+    run_parser.add_argument("--llm-workers", type=int, default=4)
+    run_parser.add_argument("--llm-calls-per-second", type=float)
+    run_parser.add_argument("--queue-size", type=int, default=8)
+    run_parser.add_argument("--verbose", action="store_true", help="Affiche la progression page par page")
+    run_parser.add_argument("--json", help="Fichier de sortie JSON")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record(args.urls, args.recordings))
+        return
+
+    urls = recorded_urls(args.recordings)
+    if not urls:
+        parser.error(f"aucun enregistrement dans {args.recordings}")
+    # Un fragment distinct par passage : mêmes pages, résultats distincts
+    urls = [f"{url}#replay-{i}" if args.repeat > 1 else url for i in range(args.repeat) for url in urls]
+
+    model = OfflineModel(args.llm_latency, args.tokens_per_second, args.failure_rate, args.seed)
+    report = asyncio.run(replay(
+        urls, args.recordings, model, args.crawl_latency, args.crawl_time_scale, args.verbose,
+        crawl_workers=args.crawl_workers, preprocess_workers=args.preprocess_workers,
+        llm_workers=args.llm_workers, llm_calls_per_second=args.llm_calls_per_second, queue_size=args.queue_size,
+    ))
+
+    print(f"\n{report['succeeded']}/{report['pages']} pages en {report['wall_seconds']:.2f}s "
+          f"({report['pages_per_second']:.2f} pages/s, x{report['pipeline_speedup']:.1f} par rapport au séquentiel)")
+    print(f"{'Étape':<11} {'p50 (ms)':>9} {'p99 (ms)':>9} {'Total (s)':>10}")
+    for name, stage in report["stages"].items():
+        print(f"{name:<11} {stage['p50_ms'] or 0:>9.1f} {stage['p99_ms'] or 0:>9.1f} {stage['total_seconds']:>10.2f}")
+    print(f"LLM : {report['llm']['calls']} appels, {report['llm']['failures']} échecs, "
+          f"~{report['llm']['input_tokens']:,} tokens en entrée, ~{report['llm']['output_tokens']:,} en sortie")
+
+    if args.json:
+        report.update(timestamp=datetime.now().isoformat(), options=vars(args))
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRésultats sauvegardés dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
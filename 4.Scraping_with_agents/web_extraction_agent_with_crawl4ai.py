@@ -1,16 +1,21 @@
 from textwrap import dedent
 from typing import Dict, List, Optional, Any
 import asyncio
+import contextlib
+import os
 import time
 from datetime import datetime
 
-from agno.agent import Agent
-from agno.models.mistral import MistralChat
 from pydantic import BaseModel, Field
 from rich.pretty import pprint
 from rich.console import Console
 from crawl4ai import AsyncWebCrawler
 
+from content_reduction import chunk_content, reduce_content
+from llm_cache import LLMCache
+from model_backend import make_agent
+from pre_extraction import pre_extract
+
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -35,10 +40,15 @@ class ExtractionDiagnostics(BaseModel):
     """Informations de diagnostic pour l'extraction."""
     crawl_time_seconds: float = Field(..., description="Temps de crawling en secondes")
     processing_time_seconds: float = Field(..., description="Temps de traitement LLM en secondes")
+    preprocess_time_seconds: float = Field(default=0.0, description="Temps de préparation du contenu en secondes")
+    queue_wait_seconds: float = Field(default=0.0, description="Temps d'attente entre les étapes du pipeline en secondes")
     content_length: int = Field(..., description="Longueur du contenu brut")
     extraction_timestamp: str = Field(..., description="Timestamp de l'extraction")
     crawl4ai_version: str = Field(default="0.6.3", description="Version de Crawl4AI utilisée")
     success: bool = Field(..., description="Succès de l'extraction")
+    cache_hit: bool = Field(default=False, description="Résultat LLM servi depuis le cache")
+    llm_input_tokens: Optional[int] = Field(default=None, description="Tokens de contenu envoyés au LLM (estimation)")
+    chunk_count: int = Field(default=1, description="Nombre de morceaux extraits séparément puis fusionnés")
     errors: Optional[List[str]] = Field(default=None, description="Erreurs rencontrées")
 
 class PageInformation(BaseModel):
@@ -76,134 +86,268 @@ class PageInformation(BaseModel):
     # Diagnostic
     diagnostics: ExtractionDiagnostics = Field(..., description="Extraction diagnostics")
 
-# Agent d'extraction optimisé
-extraction_agent = Agent(
-    model=MistralChat(id="mistral-large-2411"),
+class SemanticPageInformation(BaseModel):
+    """Champs de PageInformation demandés au LLM : ceux qui demandent de comprendre le texte.
+    
+    Liens, langue, description, dates, contacts, réseaux sociaux et
+    métadonnées sont extraits du HTML sans LLM (pre_extraction.py).
+    """
+    title: str = Field(..., description="Main page title")
+    main_content: str = Field(..., description="Primary page content as clean text")
+    content_sections: Optional[List[ContentSection]] = Field(default=None, description="Organized content sections")
+    headlines: Optional[List[str]] = Field(default=None, description="Major headlines found on the page")
+    categories: Optional[List[str]] = Field(default=None, description="Content categories or topics")
+    authors: Optional[List[str]] = Field(default=None, description="Author names found")
+    page_type: Optional[str] = Field(default=None, description="Type of page (news, business, blog, etc.)")
+
+# Agent d'extraction optimisé : uniquement les champs sémantiques.
+# AGENT_MODEL_BACKEND=offline le remplace par un modèle local simulé (voir model_backend.py)
+extraction_agent = make_agent(
+    SemanticPageInformation,
     instructions=dedent("""
-        You are an expert web content analyzer specializing in comprehensive information extraction.
+        You are an expert web content analyzer. Extract the meaningful content of the provided webpage.
 
-        **EXTRACTION MISSION:**
-        Extract ALL meaningful information from the provided webpage content with maximum completeness and accuracy.
+        **EXTRACT:**
+        - Main page title
+        - Primary content as clean, readable text without navigation clutter
+        - Content organized into logical sections with headings
+        - All major headlines, article titles and news items
+        - Content categories, tags, topics
+        - Author names and bylines
+        - Page type (news, business, blog, e-commerce, etc.)
 
-        **CORE EXTRACTION AREAS:**
-        
-        1. **Content Analysis:**
-           - Main page title and meta description
-           - Primary content (clean, readable text without navigation clutter)
-           - All major headlines, article titles, and news items
-           - Content organized into logical sections with headings
-           
-        2. **Link Classification:**
-           - Navigation links (main menu, breadcrumbs)
-           - Article/content links (links to individual articles or pages)
-           - External links (pointing to other domains)
-           - Include both URL and descriptive text for each link
-           
-        3. **Structured Data:**
-           - Publication dates, timestamps
-           - Author names and bylines
-           - Content categories, tags, topics
-           - Any structured data like prices, locations, events
-           
-        4. **Page Metadata:**
-           - Page type classification (news, business, blog, e-commerce, etc.)
-           - Primary language
-           - Contact information if present
-           - Social media links
-           
-        **QUALITY STANDARDS:**
-        - Be comprehensive but precise - include everything meaningful
-        - Clean and organize content for readability
-        - Categorize links accurately
-        - Extract dates in recognizable formats
-        - Only include contact info if explicitly found
-        - Set optional fields to null if no relevant data exists
-        
-        **CRITICAL RULES:**
+        Links, dates, language, contact details and metadata are extracted separately: do not list them.
+
+        **RULES:**
         - Never fabricate information
         - If a field cannot be determined, set it to null
-        - Prioritize accuracy over completeness
         - Clean text of navigation artifacts and ads
     """).strip(),
-    response_model=PageInformation,
 )
 
-async def crawl_webpage(url: str) -> tuple[str, float]:
+# Options Crawl4AI communes à toutes les pages
+CRAWL_OPTIONS = dict(
+    # Configuration optimisée pour extraction complète
+    word_count_threshold=3,  # Inclusif pour capturer plus de contenu
+    exclude_external_links=False,  # Garder tous les liens
+    exclude_social_media_links=False,  # Garder les réseaux sociaux
+    remove_overlay_elements=True,  # Supprimer popups et overlays
+    process_iframes=True,  # Traiter les iframes
+    remove_forms=False,  # Garder les formulaires pour l'analyse
+    delay_before_return_html=2.0,  # Attendre le rendu JavaScript
+    
+    # Options avancées
+    css_selector=None,  # Pas de restriction de sélecteur
+    screenshot=False,  # Pas besoin de screenshot
+    pdf=False,  # Pas besoin de PDF
+)
+
+async def crawl_page(url: str, crawler: Optional[AsyncWebCrawler] = None) -> tuple[str, str, float]:
     """
     Crawl une page web avec Crawl4AI optimisé.
-    Retourne le contenu et le temps de crawling.
+    Retourne le markdown, le HTML et le temps de crawling.
+    
+    Avec `crawler`, réutilise un navigateur déjà ouvert (voir batch_extract_pages)
+    au lieu d'en démarrer un pour cette seule page.
     """
+    if crawler is None:
+        async with AsyncWebCrawler(verbose=True, headless=True) as crawler:
+            return await crawl_page(url, crawler)
+    
     start_time = time.time()
+    result = await crawler.arun(url=url, **CRAWL_OPTIONS)
+    crawl_time = time.time() - start_time
     
-    async with AsyncWebCrawler(
-        verbose=True,
-        headless=True,
-    ) as crawler:
-        result = await crawler.arun(
-            url=url,
-            # Configuration optimisée pour extraction complète
-            word_count_threshold=3,  # Inclusif pour capturer plus de contenu
-            exclude_external_links=False,  # Garder tous les liens
-            exclude_social_media_links=False,  # Garder les réseaux sociaux
-            remove_overlay_elements=True,  # Supprimer popups et overlays
-            process_iframes=True,  # Traiter les iframes
-            remove_forms=False,  # Garder les formulaires pour l'analyse
-            delay_before_return_html=2.0,  # Attendre le rendu JavaScript
-            
-            # Options avancées
-            css_selector=None,  # Pas de restriction de sélecteur
-            screenshot=False,  # Pas besoin de screenshot
-            pdf=False,  # Pas besoin de PDF
-        )
-        
-        crawl_time = time.time() - start_time
-        
-        if result.success:
-            return result.markdown, crawl_time
-        else:
-            raise Exception(f"Crawl4AI failed: {result.error_message}")
+    if result.success:
+        return result.markdown, result.html or "", crawl_time
+    else:
+        raise Exception(f"Crawl4AI failed: {result.error_message}")
 
-def extract_page_information(url: str) -> PageInformation:
+async def crawl_webpage(url: str, crawler: Optional[AsyncWebCrawler] = None) -> tuple[str, float]:
     """
-    Fonction principale d'extraction complète et robuste.
+    Crawl une page web avec Crawl4AI optimisé.
+    Retourne le contenu et le temps de crawling.
+    """
+    markdown, _, crawl_time = await crawl_page(url, crawler)
+    return markdown, crawl_time
+
+# Budget de contenu par appel LLM (tokens estimés) : au-delà, la page est découpée
+MAX_CHUNK_TOKENS = 6000
+
+def build_extraction_prompts(url: str, raw_content: str,
+                             max_chunk_tokens: int = MAX_CHUNK_TOKENS) -> tuple[List[tuple[str, str]], Dict[str, int]]:
+    """
+    Prompts d'extraction d'une page : contenu nettoyé (boilerplate, blocs répétés,
+    cibles des liens, déjà extraits du HTML) puis découpé en morceaux d'au plus
+    `max_chunk_tokens` tokens, un prompt par morceau. Renvoie les couples
+    (morceau, prompt) et les statistiques de réduction ; le morceau seul sert
+    de clé de cache (voir run_extraction_agent).
+    """
+    content, stats = reduce_content(raw_content, keep_links=False)
+    chunks = chunk_content(content, max_chunk_tokens)
+    stats['chunks'] = len(chunks)
+    console.print(f"✂️  [cyan]Contenu réduit:[/cyan] ~{stats['original_tokens']:,} → ~{stats['reduced_tokens']:,} tokens"
+                  + (f", {len(chunks)} morceaux" if len(chunks) > 1 else ""))
+    
+    prompts = []
+    for i, chunk in enumerate(chunks, 1):
+        part = (f"Part: {i}/{len(chunks)} of the page content. The other parts are analyzed separately: "
+                f"extract only what appears in this part.\n" if len(chunks) > 1 else "")
+        prompts.append((chunk, f"""
+Analyze and extract comprehensive information from this webpage.
+
+URL: {url}
+{part}Content Length: {len(chunk):,} characters
+
+WEBPAGE CONTENT:
+{chunk}
+
+Extract all meaningful information following the detailed guidelines provided in your instructions.
+"""))
+    return prompts, stats
+
+def prepare_page(url: str, raw_content: str, html: str) -> tuple[List[tuple[str, str]], Dict[str, int], Dict[str, Any]]:
+    """Préparation d'une page avant le LLM : prompts (voir build_extraction_prompts) et champs extraits du HTML."""
+    prompts, reduction = build_extraction_prompts(url, raw_content)
+    return prompts, reduction, pre_extract(html, url)
+
+def merge_semantic_parts(parts: List[SemanticPageInformation]) -> SemanticPageInformation:
+    """Fusionne les extractions des morceaux d'une même page (listes dédoublonnées, premier champ renseigné)."""
+    
+    def first(field):
+        return next((getattr(part, field) for part in parts if getattr(part, field)), None)
+    
+    def union(field, key=lambda value: value):
+        seen, merged = set(), []
+        for part in parts:
+            for value in getattr(part, field) or []:
+                if key(value) not in seen:
+                    seen.add(key(value))
+                    merged.append(value)
+        return merged or None
+    
+    return SemanticPageInformation(
+        title=first('title') or "",
+        main_content="\n\n".join(part.main_content for part in parts if part.main_content),
+        content_sections=union('content_sections', key=lambda section: (section.heading, section.content)),
+        headlines=union('headlines'),
+        categories=union('categories'),
+        authors=union('authors'),
+        page_type=first('page_type'),
+    )
+
+def build_page_information(url: str, semantic: SemanticPageInformation, pre: Dict[str, Any],
+                           diagnostics: ExtractionDiagnostics) -> PageInformation:
+    """Assemble le résultat final : champs sémantiques du LLM et champs extraits du HTML."""
+    authors = list(dict.fromkeys((pre['authors'] or []) + (semantic.authors or [])))
+    return PageInformation(
+        url=url,
+        **semantic.model_dump(exclude={'authors'}),
+        **{field: value for field, value in pre.items() if field != 'authors'},
+        authors=authors or None,
+        diagnostics=diagnostics,
+    )
+
+def error_result(url: str, errors: List[str], crawl_time: float = 0.0, content_length: int = 0) -> PageInformation:
+    """Résultat d'échec, avec les diagnostics de la page."""
+    diagnostics = ExtractionDiagnostics(
+        crawl_time_seconds=crawl_time,
+        processing_time_seconds=0.0,
+        content_length=content_length,
+        extraction_timestamp=datetime.now().isoformat(),
+        success=False,
+        errors=errors
+    )
+    
+    return PageInformation(
+        url=url,
+        title="ERREUR D'EXTRACTION",
+        main_content=f"Erreur lors de l'extraction: {errors[-1]}",
+        diagnostics=diagnostics
+    )
+
+async def run_extraction_agent(chunk: str, prompt: str, cache: Optional[LLMCache] = None,
+                               limiter: Optional[Any] = None,
+                               slots: Optional[asyncio.Semaphore] = None) -> tuple[SemanticPageInformation, bool]:
+    """
+    Appelle extraction_agent, en passant d'abord par le cache s'il est fourni.
+    Renvoie (résultat, trouvé en cache) ; `limiter` (RateLimiter) et `slots`
+    (sémaphore partagé bornant les appels simultanés) ne s'appliquent qu'aux
+    vrais appels au LLM.
+    
+    La clé de cache porte sur le morceau de contenu, pas sur le prompt (qui
+    contient l'URL) : un même contenu servi à une autre URL est retrouvé.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key_for(extraction_agent, chunk)
+        cached = cache.get(key, SemanticPageInformation)
+        if cached is not None:
+            return cached, True
+    
+    async with slots or contextlib.nullcontext():
+        if limiter is not None:
+            await limiter.wait()
+        result = (await extraction_agent.arun(prompt)).content
+    if key is not None and isinstance(result, SemanticPageInformation):
+        cache.put(key, result)
+    return result, False
+
+async def run_chunked_extraction(prompts: List[tuple[str, str]], cache: Optional[LLMCache] = None,
+                                 limiter: Optional[Any] = None,
+                                 slots: Optional[asyncio.Semaphore] = None) -> tuple[SemanticPageInformation, bool]:
+    """
+    Extrait les morceaux d'une page en parallèle puis fusionne les résultats.
+    Renvoie (résultat, tous les morceaux trouvés en cache). Avec `slots`, les
+    appels au LLM restent bornés quel que soit le nombre de morceaux.
+    """
+    if len(prompts) == 1:
+        return await run_extraction_agent(*prompts[0], cache, limiter, slots)
+    
+    outcomes = await asyncio.gather(*(run_extraction_agent(chunk, prompt, cache, limiter, slots)
+                                      for chunk, prompt in prompts))
+    parts = [result for result, _ in outcomes]
+    return merge_semantic_parts(parts), all(cache_hit for _, cache_hit in outcomes)
+
+async def extract_page_information_async(url: str, crawler: Optional[AsyncWebCrawler] = None,
+                                         metrics: Optional[Any] = None,
+                                         cache: Optional[LLMCache] = None) -> PageInformation:
+    """
+    Version asynchrone de extract_page_information.
+    
+    `crawler` est un AsyncWebCrawler déjà ouvert, réutilisé au lieu d'en
+    démarrer un pour cette page. Pour un lot, voir extraction_pipeline.
     """
     console.print(f"🚀 [bold blue]Extraction de:[/bold blue] {url}")
     
     errors = []
+    crawl_time = 0.0
+    raw_content = ""
+    html = ""
     
     try:
         # Phase 1: Crawling
         console.print("📡 [yellow]Phase 1:[/yellow] Crawling avec Crawl4AI...")
-        raw_content, crawl_time = asyncio.run(crawl_webpage(url))
+        raw_content, html, crawl_time = await crawl_page(url, crawler)
         
-        console.print(f"✅ [green]Crawl réussi:[/green] {len(raw_content):,} caractères en {crawl_time:.2f}s")
+        console.print(f"✅ [green]Crawl réussi:[/green] {len(raw_content):,} caractères en {crawl_time:.2f}s ({url})")
+        if metrics:
+            metrics.observe('crawl', crawl_time, scraper='agent')
+            metrics.inc('bytes', len(raw_content.encode('utf-8')), scraper='agent')
         
         # Phase 2: Traitement LLM
         console.print("🧠 [yellow]Phase 2:[/yellow] Traitement par LLM...")
         processing_start = time.time()
         
-        # Limitation du contenu pour éviter les timeouts
-        content_for_llm = raw_content[:25000] if len(raw_content) > 25000 else raw_content
-        if len(raw_content) > 25000:
-            console.print(f"⚠️  [orange]Contenu tronqué:[/orange] {len(raw_content):,} → {len(content_for_llm):,} caractères")
-        
-        # Appel à l'agent d'extraction
-        extraction_prompt = f"""
-Analyze and extract comprehensive information from this webpage.
-
-URL: {url}
-Content Length: {len(content_for_llm):,} characters
-
-WEBPAGE CONTENT:
-{content_for_llm}
-
-Extract all meaningful information following the detailed guidelines provided in your instructions.
-"""
-        
-        structured_data = extraction_agent.run(extraction_prompt)
+        # Champs calculés sur le HTML, puis appel à l'agent (un appel par morceau pour les pages longues)
+        prompts, reduction, pre = prepare_page(url, raw_content, html)
+        semantic, cache_hit = await run_chunked_extraction(prompts, cache)
         processing_time = time.time() - processing_start
         
-        console.print(f"✅ [green]Traitement réussi[/green] en {processing_time:.2f}s")
+        console.print(f"✅ [green]Traitement réussi[/green] en {processing_time:.2f}s ({url})"
+                      + (" [dim](cache)[/dim]" if cache_hit else ""))
+        if metrics:
+            record_llm(metrics, processing_time, cache_hit)
         
         # Création des diagnostics
         diagnostics = ExtractionDiagnostics(
@@ -212,36 +356,203 @@ Extract all meaningful information following the detailed guidelines provided in
             content_length=len(raw_content),
             extraction_timestamp=datetime.now().isoformat(),
             success=True,
+            cache_hit=cache_hit,
+            llm_input_tokens=reduction['reduced_tokens'],
+            chunk_count=reduction['chunks'],
             errors=errors if errors else None
         )
         
-        # Ajout des diagnostics au résultat
-        result = structured_data.content
-        result.diagnostics = diagnostics
-        
-        return result
+        # Résultat complet avec les diagnostics
+        return build_page_information(url, semantic, pre, diagnostics)
         
     except Exception as e:
         error_msg = str(e)
         errors.append(error_msg)
-        console.print(f"❌ [red]Erreur:[/red] {error_msg}")
+        console.print(f"❌ [red]Erreur ({url}):[/red] {error_msg}")
+        if metrics:
+            metrics.inc('fetches', outcome='error', scraper='agent')
+            metrics.inc('errors', kind=type(e).__name__, scraper='agent')
         
         # Création d'un résultat d'erreur avec diagnostics
-        diagnostics = ExtractionDiagnostics(
-            crawl_time_seconds=0.0,
-            processing_time_seconds=0.0,
-            content_length=0,
-            extraction_timestamp=datetime.now().isoformat(),
-            success=False,
-            errors=errors
-        )
-        
-        return PageInformation(
-            url=url,
-            title="ERREUR D'EXTRACTION",
-            main_content=f"Erreur lors de l'extraction: {error_msg}",
-            diagnostics=diagnostics
-        )
+        return error_result(url, errors, crawl_time, len(raw_content))
+
+def record_llm(metrics: Any, processing_time: float, cache_hit: bool):
+    """Enregistre une extraction LLM réussie ; les réponses du cache ne comptent pas dans la phase 'llm'."""
+    if not cache_hit:
+        metrics.observe('llm', processing_time, scraper='agent')
+    metrics.inc('llm_cache', outcome='hit' if cache_hit else 'miss', scraper='agent')
+    metrics.inc('fetches', outcome='success', scraper='agent')
+
+def extract_page_information(url: str, metrics: Optional[Any] = None,
+                             cache: Optional[LLMCache] = None) -> PageInformation:
+    """
+    Fonction principale d'extraction complète et robuste.
+    
+    `metrics` accepte un MetricsRegistry (1.Scraping_with_request_bs4/metrics.py)
+    ou tout objet exposant observe() et inc() : les phases 'crawl' et 'llm'
+    y sont enregistrées avec l'étiquette scraper='agent'.
+    
+    Avec `cache` (LLMCache), une page dont le contenu n'a pas changé depuis
+    une extraction précédente est resservie sans appel au LLM
+    (diagnostics.cache_hit).
+    """
+    return asyncio.run(extract_page_information_async(url, metrics=metrics, cache=cache))
+
+class RateLimiter:
+    """Espace les appels d'au moins 1 / `calls_per_second` seconde (None : sans limite)."""
+    
+    def __init__(self, calls_per_second: Optional[float] = None):
+        self.interval = 1.0 / calls_per_second if calls_per_second else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = max(self._next, time.monotonic()) + self.interval
+
+async def extraction_pipeline(urls: List[str], crawler: AsyncWebCrawler, metrics: Optional[Any] = None,
+                              crawl_workers: int = 5, preprocess_workers: int = 2, llm_workers: int = 4,
+                              llm_calls_per_second: Optional[float] = None, queue_size: int = 8,
+                              cache: Optional[LLMCache] = None):
+    """
+    Pipeline crawl → préparation → LLM, chaque étape avec ses propres workers.
+    
+    Les étapes communiquent par des files bornées (`queue_size`) : si le LLM
+    est plus lent que le crawl, les crawlers s'arrêtent au lieu d'accumuler
+    les pages en mémoire. Le navigateur et les appels LLM travaillent en même
+    temps, et la durée du lot tend vers celle de l'étape la plus lente.
+    
+    Générateur asynchrone : les PageInformation sortent dans l'ordre où elles
+    sont terminées, avec les diagnostics de chaque étape (crawl, préparation,
+    LLM, attente dans les files). Avec `cache`, les pages déjà extraites ne
+    consomment ni appel LLM ni place dans la limite de débit.
+    
+    L'étape de préparation nettoie et découpe chaque page (voir
+    build_extraction_prompts) ; les morceaux d'une page longue sont extraits
+    en parallèle par le même worker LLM, puis fusionnés. Au total, au plus
+    `llm_workers` appels LLM sont en cours à la fois, morceaux compris.
+    
+        async with AsyncWebCrawler(headless=True) as crawler:
+            async for result in extraction_pipeline(urls, crawler, llm_workers=2):
+                ...
+    """
+    url_queue = asyncio.Queue(queue_size)
+    crawled = asyncio.Queue(queue_size)
+    prepared = asyncio.Queue(queue_size)
+    finished = asyncio.Queue(queue_size)
+    limiter = RateLimiter(llm_calls_per_second)
+    # Borne commune des appels LLM : une page découpée ne multiplie pas les appels simultanés
+    llm_slots = asyncio.Semaphore(llm_workers)
+    
+    async def fail(page, error):
+        console.print(f"❌ [red]Erreur ({page['url']}):[/red] {error}")
+        if metrics:
+            metrics.inc('fetches', outcome='error', scraper='agent')
+            metrics.inc('errors', kind=type(error).__name__, scraper='agent')
+        result = error_result(page['url'], [str(error)], page['crawl_time'], len(page['content']))
+        result.diagnostics.preprocess_time_seconds = page['preprocess_time']
+        result.diagnostics.queue_wait_seconds = page['queue_wait']
+        await finished.put(result)
+    
+    async def take(queue):
+        page = await queue.get()
+        if page is not None:
+            page['queue_wait'] += time.monotonic() - page['queued_at']
+        return page
+    
+    async def put(queue, page):
+        page['queued_at'] = time.monotonic()
+        await queue.put(page)
+    
+    async def feed():
+        for url in urls:
+            await put(url_queue, {'url': url, 'content': '', 'html': '', 'prompts': None, 'reduction': None,
+                                  'pre': None, 'crawl_time': 0.0, 'preprocess_time': 0.0, 'queue_wait': 0.0})
+    
+    async def crawl_worker():
+        while (page := await take(url_queue)) is not None:
+            try:
+                page['content'], page['html'], page['crawl_time'] = await crawl_page(page['url'], crawler)
+            except Exception as e:
+                await fail(page, e)
+                continue
+            console.print(f"✅ [green]Crawl réussi:[/green] {len(page['content']):,} caractères "
+                          f"en {page['crawl_time']:.2f}s ({page['url']})")
+            if metrics:
+                metrics.observe('crawl', page['crawl_time'], scraper='agent')
+                metrics.inc('bytes', len(page['content'].encode('utf-8')), scraper='agent')
+            await put(crawled, page)
+    
+    async def preprocess_worker():
+        while (page := await take(crawled)) is not None:
+            start = time.time()
+            try:
+                # Hors de la boucle d'événements : ne bloque pas les autres étapes
+                page['prompts'], page['reduction'], page['pre'] = await asyncio.to_thread(
+                    prepare_page, page['url'], page['content'], page['html'])
+                # Le HTML n'est plus utile : libéré avant l'attente dans la file suivante
+                page['html'] = ''
+            except Exception as e:
+                await fail(page, e)
+                continue
+            page['preprocess_time'] = time.time() - start
+            await put(prepared, page)
+    
+    async def llm_worker():
+        while (page := await take(prepared)) is not None:
+            start = time.time()
+            try:
+                semantic, cache_hit = await run_chunked_extraction(page['prompts'], cache, limiter, llm_slots)
+                processing_time = time.time() - start
+                diagnostics = ExtractionDiagnostics(
+                    crawl_time_seconds=page['crawl_time'],
+                    processing_time_seconds=processing_time,
+                    preprocess_time_seconds=page['preprocess_time'],
+                    queue_wait_seconds=page['queue_wait'],
+                    content_length=len(page['content']),
+                    extraction_timestamp=datetime.now().isoformat(),
+                    success=True,
+                    cache_hit=cache_hit,
+                    llm_input_tokens=page['reduction']['reduced_tokens'],
+                    chunk_count=page['reduction']['chunks'],
+                )
+                # Dans le try : une valeur invalide (champ extrait du HTML...) donne un résultat d'échec,
+                # sans arrêter le worker ni bloquer le pipeline
+                result = build_page_information(page['url'], semantic, page['pre'], diagnostics)
+            except Exception as e:
+                await fail(page, e)
+                continue
+            console.print(f"✅ [green]Traitement réussi[/green] en {processing_time:.2f}s ({page['url']})"
+                          + (" [dim](cache)[/dim]" if cache_hit else ""))
+            if metrics:
+                record_llm(metrics, processing_time, cache_hit)
+            await finished.put(result)
+    
+    async def run_stage(worker, count, outbox=None, outbox_workers=0):
+        await asyncio.gather(*(worker() for _ in range(count)))
+        # Fin de l'étape : un signal d'arrêt par worker de l'étape suivante
+        for _ in range(outbox_workers):
+            await outbox.put(None)
+    
+    tasks = [
+        asyncio.create_task(run_stage(feed, 1, url_queue, crawl_workers)),
+        asyncio.create_task(run_stage(crawl_worker, crawl_workers, crawled, preprocess_workers)),
+        asyncio.create_task(run_stage(preprocess_worker, preprocess_workers, prepared, llm_workers)),
+        asyncio.create_task(run_stage(llm_worker, llm_workers)),
+    ]
+    try:
+        for _ in range(len(urls)):
+            yield await finished.get()
+    finally:
+        # Consommateur arrêté avant la fin : on ne laisse pas de workers orphelins
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 def print_extraction_summary(result: PageInformation):
     """Affiche un résumé détaillé de l'extraction."""
@@ -274,9 +585,14 @@ def print_extraction_summary(result: PageInformation):
     diag = result.diagnostics
     console.print(f"\n⚡ [bold green]PERFORMANCE:[/bold green]")
     console.print(f"  • Crawling: {diag.crawl_time_seconds:.2f}s")
+    console.print(f"  • Préparation: {diag.preprocess_time_seconds:.2f}s")
     console.print(f"  • Traitement LLM: {diag.processing_time_seconds:.2f}s")
-    console.print(f"  • Total: {diag.crawl_time_seconds + diag.processing_time_seconds:.2f}s")
+    console.print(f"  • Attente entre étapes: {diag.queue_wait_seconds:.2f}s")
+    console.print(f"  • Total: {diag.crawl_time_seconds + diag.preprocess_time_seconds + diag.processing_time_seconds + diag.queue_wait_seconds:.2f}s")
     console.print(f"  • Contenu brut: {diag.content_length:,} caractères")
+    if diag.llm_input_tokens is not None:
+        console.print(f"  • Envoyé au LLM: ~{diag.llm_input_tokens:,} tokens en {diag.chunk_count} appel(s)")
+    console.print(f"  • Cache LLM: {'✅' if diag.cache_hit else '❌'}")
     console.print(f"  • Succès: {'✅' if diag.success else '❌'}")
     
     if diag.errors:
@@ -292,34 +608,92 @@ def print_extraction_summary(result: PageInformation):
     
     console.print("\n" + "="*80)
 
-def batch_extract_pages(urls: List[str]) -> Dict[str, PageInformation]:
-    """Extraction en lot pour plusieurs URLs."""
+def load_checkpoint(path: str) -> Dict[str, PageInformation]:
+    """Relit un journal JSON Lines de résultats (une ligne par URL traitée)."""
+    results = {}
+    if not os.path.exists(path):
+        return results
+    
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = PageInformation.model_validate_json(line)
+            except ValueError:
+                # Dernière ligne incomplète après un arrêt brutal
+                continue
+            results[result.url] = result
+    return results
+
+def append_checkpoint(path: str, result: PageInformation):
+    """Ajoute un résultat au journal et force l'écriture disque."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(result.model_dump_json() + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+async def batch_extract_pages_async(urls: List[str], checkpoint_path: Optional[str] = None,
+                                    metrics: Optional[Any] = None, max_concurrency: int = 5,
+                                    llm_concurrency: int = 4,
+                                    llm_calls_per_second: Optional[float] = None,
+                                    cache: Optional[LLMCache] = None) -> Dict[str, PageInformation]:
+    """Version asynchrone de batch_extract_pages (voir ci-dessous)."""
     
-    console.print(f"🚀 [bold]Extraction en lot:[/bold] {len(urls)} URLs")
+    console.print(f"🚀 [bold]Extraction en lot:[/bold] {len(urls)} URLs, "
+                  f"{max_concurrency} crawls et {llm_concurrency} appels LLM en parallèle")
     
     results = {}
+    if checkpoint_path:
+        done = load_checkpoint(checkpoint_path)
+        results.update({url: done[url] for url in urls if url in done})
+        if results:
+            console.print(f"♻️  [green]Reprise:[/green] {len(results)} URLs déjà traitées")
     
-    for i, url in enumerate(urls, 1):
-        console.print(f"\n[bold cyan]>>> {i}/{len(urls)}[/bold cyan]")
-        
-        try:
-            result = extract_page_information(url)
-            results[url] = result
-            
-            # Résumé rapide
-            status = "✅" if result.diagnostics.success else "❌"
-            headlines_count = len(result.headlines or [])
-            console.print(f"{status} [green]{result.title}[/green] - {headlines_count} headlines")
-            
-        except Exception as e:
-            console.print(f"❌ [red]Erreur pour {url}:[/red] {e}")
-            results[url] = None
+    pending = list(dict.fromkeys(url for url in urls if url not in results))
+    completed = len(results)
+    
+    if pending:
+        # Un seul navigateur pour tout le lot : chaque page ouvre un onglet
+        async with AsyncWebCrawler(verbose=False, headless=True) as crawler:
+            async for result in extraction_pipeline(pending, crawler, metrics, crawl_workers=max_concurrency,
+                                                    llm_workers=llm_concurrency,
+                                                    llm_calls_per_second=llm_calls_per_second,
+                                                    cache=cache):
+                results[result.url] = result
+                if checkpoint_path and result.diagnostics.success:
+                    append_checkpoint(checkpoint_path, result)
+                
+                # Résumé rapide
+                completed += 1
+                status = "✅" if result.diagnostics.success else "❌"
+                headlines_count = len(result.headlines or [])
+                console.print(f"[bold cyan]>>> {completed}/{len(urls)}[/bold cyan] {status} "
+                              f"[green]{result.title}[/green] - {headlines_count} headlines")
     
     # Statistiques finales
     successful = len([r for r in results.values() if r and r.diagnostics.success])
     console.print(f"\n🎯 [bold]Résultats:[/bold] {successful}/{len(urls)} extractions réussies")
     
-    return results
+    return {url: results.get(url) for url in urls}
+
+def batch_extract_pages(urls: List[str], checkpoint_path: Optional[str] = None,
+                        metrics: Optional[Any] = None, max_concurrency: int = 5, llm_concurrency: int = 4,
+                        llm_calls_per_second: Optional[float] = None,
+                        cache: Optional[LLMCache] = None) -> Dict[str, PageInformation]:
+    """Extraction en lot pour plusieurs URLs.
+    
+    Un seul AsyncWebCrawler (navigateur) est ouvert pour tout le lot. Les pages
+    passent par extraction_pipeline : jusqu'à `max_concurrency` crawls et
+    `llm_concurrency` appels LLM (au plus `llm_calls_per_second` par seconde)
+    en même temps, le crawl des pages suivantes se poursuivant pendant
+    l'analyse des précédentes. Chaque résultat garde ses propres diagnostics ;
+    ils sont renvoyés dans l'ordre des URLs. `cache` (LLMCache) évite de
+    refaire l'extraction LLM des pages inchangées.
+    
+    Avec `checkpoint_path`, chaque extraction réussie est journalisée : relancer
+    le lot reprend là où il s'est arrêté, sans refaire les URLs déjà traitées.
+    """
+    return asyncio.run(batch_extract_pages_async(urls, checkpoint_path, metrics, max_concurrency,
+                                                 llm_concurrency, llm_calls_per_second, cache))
 
 # Interface principale
 def main():
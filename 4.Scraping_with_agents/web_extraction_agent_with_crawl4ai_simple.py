@@ -1,9 +1,12 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from crawl4ai import AsyncWebCrawler
-from agno.agent import Agent
-from agno.models.mistral import MistralChat
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+
+from content_reduction import chunk_content, reduce_content
+from llm_cache import LLMCache
+from model_backend import make_agent
 
 class WebPageData(BaseModel):
     title: str
@@ -11,8 +14,20 @@ class WebPageData(BaseModel):
     headlines: List[str]
     page_type: str
 
-def extract_webpage(url: str) -> WebPageData:
-    """Version ultra-simple et robuste."""
+def merge_webpage_data(parts: List[WebPageData]) -> WebPageData:
+    """Fusionne les résultats des morceaux d'une page (titre et type du premier, headlines dédoublonnées)."""
+    return WebPageData(
+        title=next((part.title for part in parts if part.title), ""),
+        main_content="\n\n".join(part.main_content for part in parts if part.main_content),
+        headlines=list(dict.fromkeys(headline for part in parts for headline in part.headlines)),
+        page_type=next((part.page_type for part in parts if part.page_type), ""),
+    )
+
+def extract_webpage(url: str, cache: Optional[LLMCache] = None) -> WebPageData:
+    """Version ultra-simple et robuste.
+    
+    Avec `cache` (LLMCache), une page inchangée est resservie sans appel au LLM.
+    """
     
     async def get_content():
         async with AsyncWebCrawler(verbose=True) as crawler:
@@ -23,16 +38,31 @@ def extract_webpage(url: str) -> WebPageData:
     content = asyncio.run(get_content())
     print(f"✅ {len(content)} caractères extraits")
     
-    # Agent simple
-    agent = Agent(
-        model=MistralChat(id="mistral-large-2411"),
+    # Agent simple (AGENT_MODEL_BACKEND=offline : modèle local simulé)
+    agent = make_agent(
+        WebPageData,
         instructions="Extract the title, main content, headlines, and determine page type from this webpage.",
-        response_model=WebPageData,
     )
     
-    # Structuration
-    result = agent.run(f"Analyze this webpage from {url}:\n\n{content[:10000]}")
-    return result.content
+    # Nettoyage (boilerplate, blocs répétés) puis découpage en morceaux de ~3000 tokens
+    content, stats = reduce_content(content)
+    chunks = chunk_content(content, max_tokens=3000)
+    print(f"✂️ ~{stats['original_tokens']} → ~{stats['reduced_tokens']} tokens, {len(chunks)} morceau(x)")
+    
+    def structure(chunk):
+        prompt = f"Analyze this webpage from {url}:\n\n{chunk}"
+        if cache is not None:
+            result, cache_hit = cache.run(agent, prompt, content=chunk)
+            if cache_hit:
+                print("♻️ Résultat servi depuis le cache")
+            return result
+        return agent.run(prompt).content
+    
+    # Structuration, les morceaux en parallèle
+    if len(chunks) == 1:
+        return structure(chunks[0])
+    with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as executor:
+        return merge_webpage_data(list(executor.map(structure, chunks)))
 
 # Test ultra-simple
 if __name__ == "__main__":
@@ -1,13 +1,15 @@
+import os
 from textwrap import dedent
 from typing import Dict, List, Optional, Any, Union
 
-from agno.agent import Agent
-from agno.models.mistral import MistralChat
-from agno.tools.firecrawl import FirecrawlTools
 from pydantic import BaseModel, Field
 from rich.pretty import pprint
 import json
 
+from llm_cache import LLMCache
+from model_backend import make_agent, selected_backend
+from replay import load_recording
+
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -29,20 +31,26 @@ class PageInformation(BaseModel):
     # Changement clé : metadata peut contenir n'importe quel type de données
     metadata: Optional[Dict[str, Any]] = Field(None, description="Important metadata from the page - can contain strings, lists, or objects")
 
-# Étape 1 : Agent scraper (inchangé)
-scraper_agent = Agent(
-    model=MistralChat(id="mistral-large-2411"),
-    tools=[FirecrawlTools(scrape=True, crawl=True)],
-    instructions=dedent("""
-        You are a web scraper. Your job is to scrape the provided URL and return the raw content.
-        Use the firecrawl tool to get the webpage content and return it as clean text.
-        Focus on getting all the important content from the page.
-    """).strip(),
-)
+# Étape 1 : Agent scraper
+# (AGENT_MODEL_BACKEND=offline : pas de Firecrawl, le contenu vient des enregistrements de
+# replay.py, dossier OFFLINE_RECORDINGS, voir scrape_content)
+SCRAPER_INSTRUCTIONS = dedent("""
+    You are a web scraper. Your job is to scrape the provided URL and return the raw content.
+    Use the firecrawl tool to get the webpage content and return it as clean text.
+    Focus on getting all the important content from the page.
+""").strip()
+
+if selected_backend() == "offline":
+    scraper_agent = None
+else:
+    # agno et Firecrawl ne sont importés qu'en ligne
+    from agno.tools.firecrawl import FirecrawlTools
+    scraper_agent = make_agent(instructions=SCRAPER_INSTRUCTIONS, tools=[FirecrawlTools(scrape=True, crawl=True)])
 
 # Étape 2 : Agent structureur avec instructions plus précises
-structure_agent = Agent(
-    model=MistralChat(id="mistral-large-2411"),
+# (AGENT_MODEL_BACKEND=offline : modèle local simulé)
+structure_agent = make_agent(
+    PageInformation,
     instructions=dedent("""
         You are an expert content analyzer. Take the provided webpage content and structure it 
         according to the specified format. Extract:
@@ -60,23 +68,44 @@ structure_agent = Agent(
         
         Be thorough and accurate. The metadata field can contain complex nested structures.
     """).strip(),
-    response_model=PageInformation,
 )
 
-def extract_page_info(url: str) -> PageInformation:
-    """Fonction pour extraire les informations de page en deux étapes."""
+def scrape_content(url: str) -> str:
+    """Contenu brut de la page : agent Firecrawl, ou enregistrement de replay.py hors ligne."""
+    if scraper_agent is not None:
+        return scraper_agent.run(f"Scrape all content from {url}").content
+    
+    recordings = os.environ.get("OFFLINE_RECORDINGS", "enregistrements")
+    recording = load_recording(recordings, url)
+    if recording is None:
+        raise FileNotFoundError(f"Aucun enregistrement pour {url} dans {recordings} (voir replay.py record)")
+    return recording["markdown"]
+
+def extract_page_info(url: str, cache: Optional[LLMCache] = None) -> PageInformation:
+    """Fonction pour extraire les informations de page en deux étapes.
+    
+    Avec `cache` (LLMCache), l'étape de structuration d'un contenu déjà vu est
+    resservie sans appel au LLM.
+    """
     
     # Étape 1 : Scraper le contenu
     print("🔍 Étape 1 : Récupération du contenu...")
-    raw_content = scraper_agent.run(f"Scrape all content from {url}")
+    raw_content = scrape_content(url)
     
     print("✅ Contenu récupéré, structuration en cours...")
     
     # Étape 2 : Structurer le contenu
     print("📊 Étape 2 : Structuration des données...")
-    structured_data = structure_agent.run(
-        f"Structure this webpage content from {url}:\n\n{raw_content.content}"
-    )
+    prompt = f"Structure this webpage content from {url}:\n\n{raw_content}"
+    if cache is not None:
+        result, cache_hit = cache.run(structure_agent, prompt, content=raw_content)
+        if cache_hit:
+            print("♻️ Structuration servie depuis le cache")
+            # Clé sur le contenu seul : l'entrée a pu être créée pour une autre URL
+            if isinstance(result, PageInformation):
+                result = result.model_copy(update={"url": url})
+        return result
+    structured_data = structure_agent.run(prompt)
     
     return structured_data.content
 
@@ -0,0 +1,311 @@
+"""Benchmark des stratégies de scraping sur un site synthétique local.
+
+Démarre site_server.SyntheticSiteServer puis mesure chaque stratégie dans un
+processus séparé : pages/s, latence p50/p99 par page (téléchargement +
+parsing), temps CPU et mémoire maximale (RSS). Les processus enfants
+(navigateur) sont comptés à part. Le taux d'éléments JavaScript trouvés
+indique si la stratégie voit le contenu rendu côté client.
+
+    python run_benchmarks.py --pages 200 --latency-ms 20 --json resultats.json
+    python run_benchmarks.py --strategies requests async --baseline resultats.json
+
+Avec --baseline, le script compare aux résultats précédents et se termine
+en erreur si une stratégie régresse au-delà de --tolerance, ou si une
+stratégie mesurée dans la référence est cette fois en erreur ou ignorée.
+Une stratégie n'est ignorée que si sa dépendance manque (module Python,
+navigateur ou pilote) ; toute autre exception donne le statut 'error'.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import re
+import sys
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from site_server import SiteConfig, SyntheticSiteServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FOLDERS = {
+    'requests': '1.Scraping_with_request_bs4',
+    'async': '1.Scraping_with_request_bs4',
+    'selenium': '2.Scraping_with_selenium',
+    'crawl4ai': '4.Scraping_with_agents',
+}
+# Texte des éléments ajoutés par le script (le script lui-même ne correspond pas)
+JS_ITEM = re.compile(r'Élément dynamique \d+')
+# Navigateur ou pilote absent (Selenium, Playwright utilisé par crawl4ai)
+MISSING_BROWSER = re.compile(r"executable doesn't exist|playwright install|chromedriver|cannot find chrome binary"
+                             r"|unable to obtain driver|unable to locate driver", re.IGNORECASE)
+MISSING_DRIVER_ERRORS = ('NoSuchDriverException', 'SessionNotCreatedException')
+
+
+def percentile(values, fraction):
+    """Percentile par rang le plus proche (None si aucune valeur)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def _rss_mb(who):
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss est en octets sur macOS, en kilo-octets ailleurs
+    return peak / (1024 * 1024) if platform.system() == 'Darwin' else peak / 1024
+
+
+def _cpu_seconds(who):
+    if resource is None:
+        return None
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+# --- Stratégies (chacune exécutée dans un processus dédié) ------------------
+# Renvoient (latences en secondes des pages réussies, échecs, éléments JS trouvés)
+
+def bench_requests(urls, options):
+    from retry import RetryPolicy
+    from web_extraction import WebScraper
+
+    scraper = WebScraper(urls[0], parser=options['parser'],
+                         retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01))
+    latencies, failures, js_found = [], 0, 0
+    for url in urls:
+        start = time.perf_counter()
+        result = scraper.fetch(url)
+        if not result.ok:
+            failures += 1
+            continue
+        html = result.response.text
+        scraper.extract_all(scraper.parse_html(html), url)
+        latencies.append(time.perf_counter() - start)
+        js_found += len(JS_ITEM.findall(html))
+    return latencies, failures, js_found
+
+
+def bench_async(urls, options):
+    from async_extraction import AsyncWebScraper
+    from retry import RetryPolicy
+
+    async def run():
+        latencies, failures, js_found = [], 0, 0
+        async with AsyncWebScraper(urls[0], concurrency=options['concurrency'],
+                                   per_host_limit=options['concurrency'], parser=options['parser'],
+                                   retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01)) as scraper:
+            url_iterator = iter(urls)
+
+            async def worker():
+                nonlocal failures, js_found
+                # `concurrency` workers : la latence ne compte pas l'attente dans la file
+                for url in url_iterator:
+                    start = time.perf_counter()
+                    result = await scraper.fetch(url)
+                    if not result.ok:
+                        failures += 1
+                        continue
+                    html = result.response.text
+                    scraper.extract_all(scraper.parse_html(html), url)
+                    latencies.append(time.perf_counter() - start)
+                    js_found += len(JS_ITEM.findall(html))
+
+            await asyncio.gather(*(worker() for _ in range(options['concurrency'])))
+        return latencies, failures, js_found
+
+    return asyncio.run(run())
+
+
+def bench_selenium(urls, options):
+    from selenium.webdriver.common.by import By
+    from web_extraction import SeleniumScraper
+
+    scraper = SeleniumScraper(headless=True)
+    scraper.start_driver()
+    if scraper.driver is None:
+        raise RuntimeError("Chrome / ChromeDriver indisponible")
+
+    latencies, failures, js_found = [], 0, 0
+    try:
+        for url in urls:
+            start = time.perf_counter()
+            if not scraper.get_page(url):
+                failures += 1
+                continue
+            js_found += len(scraper.driver.find_elements(By.CSS_SELECTOR, '.js-item'))
+            latencies.append(time.perf_counter() - start)
+    finally:
+        scraper.close_driver()
+    return latencies, failures, js_found
+
+
+def bench_crawl4ai(urls, options):
+    # Étape de crawl du pipeline agent uniquement : pas d'appel au LLM
+    from web_extraction_agent_with_crawl4ai import crawl_webpage
+
+    latencies, failures, js_found = [], 0, 0
+    for url in urls:
+        start = time.perf_counter()
+        try:
+            markdown, _ = asyncio.run(crawl_webpage(url))
+        except Exception:
+            failures += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+        js_found += len(JS_ITEM.findall(str(markdown)))
+    return latencies, failures, js_found
+
+
+STRATEGIES = {
+    'requests': bench_requests,
+    'async': bench_async,
+    'selenium': bench_selenium,
+    'crawl4ai': bench_crawl4ai,
+}
+
+
+def _missing_dependency(error):
+    """Vrai si l'exception signale un module, un navigateur ou un pilote absent"""
+    return (isinstance(error, ImportError) or type(error).__name__ in MISSING_DRIVER_ERRORS
+            or bool(MISSING_BROWSER.search(str(error))))
+
+
+def run_strategy(name, urls, options):
+    """Mesure une stratégie (exécuté dans un processus dédié)"""
+    sys.path.insert(0, os.path.join(REPO_ROOT, FOLDERS[name]))
+    result = {'strategy': name, 'pages': len(urls)}
+    try:
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        latencies, failures, js_found = STRATEGIES[name](urls, options)
+        wall = time.perf_counter() - start
+    except Exception as e:
+        # Dépendance absente (crawl4ai, ChromeDriver...) : stratégie ignorée ; sinon vraie erreur
+        status = 'skipped' if _missing_dependency(e) else 'error'
+        return dict(result, status=status, error=f"{type(e).__name__}: {e}")
+
+    expected_js = options['js_items'] * len(urls)
+    return dict(
+        result,
+        status='ok',
+        succeeded=len(latencies),
+        failed=failures,
+        wall_seconds=wall,
+        pages_per_second=len(latencies) / wall if wall else None,
+        latency_p50_ms=None if not latencies else percentile(latencies, 0.50) * 1000,
+        latency_p99_ms=None if not latencies else percentile(latencies, 0.99) * 1000,
+        cpu_seconds=time.process_time() - cpu_start,
+        # Navigateur et pilote : processus enfants, comptés une fois terminés
+        children_cpu_seconds=_cpu_seconds(resource.RUSAGE_CHILDREN) if resource else None,
+        peak_rss_mb=_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        children_peak_rss_mb=_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+        js_items_ratio=js_found / expected_js if expected_js else None,
+    )
+
+
+def compare(results, baseline, tolerance):
+    """Liste des régressions par rapport à un fichier de résultats précédent"""
+    previous = {r['strategy']: r for r in baseline.get('results', []) if r.get('status') == 'ok'}
+    regressions = []
+    for result in results:
+        before = previous.get(result['strategy'])
+        if before is None:
+            continue
+        if result['status'] != 'ok':
+            # Mesurée dans la référence, plus maintenant : crash ou dépendance disparue
+            regressions.append(f"{result['strategy']}: ok dans la référence, {result['status']} maintenant "
+                               f"({result.get('error')})")
+            continue
+        # (métrique, True si une valeur plus haute est meilleure)
+        for metric, higher_is_better in (('pages_per_second', True), ('latency_p99_ms', False),
+                                         ('peak_rss_mb', False)):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{result['strategy']}: {metric} {old:.1f} -> {new:.1f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--strategies', nargs='+', default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument('--pages', type=int, default=100, help="Nombre de pages récupérées par stratégie")
+    parser.add_argument('--page-kb', type=int, default=30, help="Taille du texte de chaque page (Ko)")
+    parser.add_argument('--fanout', type=int, default=20, help="Liens sortants par page")
+    parser.add_argument('--table-rows', type=int, default=50)
+    parser.add_argument('--js-items', type=int, default=5, help="Éléments ajoutés par JavaScript")
+    parser.add_argument('--latency-ms', type=float, default=10)
+    parser.add_argument('--latency-jitter-ms', type=float, default=5)
+    parser.add_argument('--error-rate', type=float, default=0.02,
+                        help="Part des URLs dont la première requête échoue (503)")
+    parser.add_argument('--concurrency', type=int, default=10, help="Requêtes simultanées (stratégie async)")
+    parser.add_argument('--parser', default='html.parser', help="Backend de parsing de WebScraper")
+    parser.add_argument('--json', help="Fichier de sortie JSON")
+    parser.add_argument('--baseline', help="Résultats JSON précédents à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Dégradation tolérée (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    config = SiteConfig(pages=args.pages, page_kb=args.page_kb, fanout=args.fanout,
+                        table_rows=args.table_rows, js_items=args.js_items, latency_ms=args.latency_ms,
+                        latency_jitter_ms=args.latency_jitter_ms, error_rate=args.error_rate)
+    options = {'concurrency': args.concurrency, 'parser': args.parser, 'js_items': args.js_items}
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for name in args.strategies:
+        # Nouveau serveur par stratégie : les erreurs transitoires sont rejouées à l'identique
+        with SyntheticSiteServer(config) as site:
+            with context.Pool(1) as pool:
+                results.append(pool.apply(run_strategy, (name, site.urls(), options)))
+            results[-1]['server'] = dict(site.stats)
+
+    print(f"\n{'Stratégie':<10} {'Pages/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'CPU (s)':>8} "
+          f"{'RSS (Mo)':>9} {'Échecs':>7} {'JS':>5}")
+    for result in results:
+        if result['status'] != 'ok':
+            label = 'ignorée' if result['status'] == 'skipped' else 'ERREUR'
+            print(f"{result['strategy']:<10} {label} ({result['error']})")
+            continue
+        js = '-' if result['js_items_ratio'] is None else f"{result['js_items_ratio']:.0%}"
+        rss = '-' if result['peak_rss_mb'] is None else f"{result['peak_rss_mb']:.0f}"
+        print(f"{result['strategy']:<10} {result['pages_per_second']:>8.1f} {result['latency_p50_ms'] or 0:>9.1f} "
+              f"{result['latency_p99_ms'] or 0:>9.1f} {result['cpu_seconds']:>8.2f} {rss:>9} "
+              f"{result['failed']:>7} {js:>5}")
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config.to_dict(),
+        'options': options,
+        'results': results,
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRésultats sauvegardés dans {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRégressions détectées :")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\nAucune régression par rapport à la référence")
+
+
+if __name__ == "__main__":
+    main()
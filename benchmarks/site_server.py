@@ -0,0 +1,209 @@
+"""Serveur HTTP local servant un site synthétique pour les benchmarks.
+
+Chaque page /page/<n>.html est générée de façon déterministe à partir de la
+configuration : taille du texte, nombre de liens sortants, taille du
+tableau, contenu injecté par JavaScript (invisible sans navigateur),
+latence simulée et taux d'erreurs transitoires.
+
+    with SyntheticSiteServer(SiteConfig(pages=500, latency_ms=20)) as site:
+        urls = site.urls()
+
+    python site_server.py --pages 1000 --port 8800   # serveur seul, pour tests manuels
+"""
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PARAGRAPH = ("Le conseil municipal a adopté mardi le budget de l'année prochaine après un débat "
+             "animé sur la rénovation des écoles, le prix des transports et l'entretien des parcs. ")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # File d'attente par défaut (5) trop courte : connexions simultanées retardées d'1 s
+    request_queue_size = 128
+
+
+class SiteConfig:
+    """Paramètres du site synthétique"""
+
+    def __init__(self, pages=200, page_kb=30, fanout=10, table_rows=50, js_items=0,
+                 latency_ms=0, latency_jitter_ms=0, error_rate=0.0, seed=0):
+        self.pages = pages
+        self.page_kb = page_kb
+        self.fanout = fanout
+        self.table_rows = table_rows
+        # Éléments ajoutés au DOM par un script : seuls les navigateurs les voient
+        self.js_items = js_items
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        # Part des URLs dont la première requête renvoie 503 (erreur transitoire)
+        self.error_rate = error_rate
+        self.seed = seed
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def _fraction(seed, path):
+    """Valeur pseudo-aléatoire stable dans [0, 1) pour une URL donnée"""
+    digest = hashlib.blake2b(f"{seed}:{path}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') / 2 ** 64
+
+
+def render_page(config, number):
+    """Génère le HTML de la page `number`"""
+    links = [f'<a href="/page/{(number * 7 + i * 13 + 1) % config.pages}.html">Article {i}</a>'
+             for i in range(config.fanout)]
+    paragraphs = [f'<p>{PARAGRAPH}</p>'] * max(1, config.page_kb * 1024 // (len(PARAGRAPH) + 7))
+    rows = [f'<tr><td>Ligne {i}</td><td>{(number + i) * 1.5:.2f}</td><td>Catégorie {i % 7}</td></tr>'
+            for i in range(config.table_rows)]
+
+    script = ''
+    if config.js_items:
+        script = (
+            '<script>document.addEventListener("DOMContentLoaded", function () {'
+            'var box = document.getElementById("js-items");'
+            f'for (var i = 0; i < {config.js_items}; i++) {{'
+            'var div = document.createElement("div"); div.className = "js-item";'
+            'div.textContent = "Élément dynamique " + i; box.appendChild(div); }'
+            '});</script>'
+        )
+
+    return ''.join([
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">',
+        f'<title>Page {number}</title><meta name="description" content="Page synthétique {number}">',
+        script, '</head><body><nav>', ''.join(links), '</nav>',
+        f'<article><h1 class="entry-title">Page {number}</h1><span class="author">Rédaction</span>',
+        f'<div class="entry-content">{"".join(paragraphs)}</div></article>',
+        '<table class="data"><thead><tr><th>Nom</th><th>Valeur</th><th>Catégorie</th></tr></thead><tbody>',
+        ''.join(rows), '</tbody></table><div id="js-items"></div></body></html>',
+    ]).encode('utf-8')
+
+
+class SyntheticSiteServer:
+    """Serveur du site synthétique, dans un thread d'arrière-plan"""
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        self.config = config or SiteConfig()
+        self.stats = {'requests': 0, 'errors': 0, 'bytes': 0}
+        self._seen_errors = set()
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._server = _Server((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self, count=None):
+        """URLs des pages du site (toutes par défaut)"""
+        return [f"{self.base_url}/page/{n}.html" for n in range(count or self.config.pages)]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _page(self, number):
+        page = self._pages.get(number)
+        if page is None:
+            page = self._pages[number] = render_page(self.config, number)
+        return page
+
+    def _should_fail(self, path):
+        """Première requête d'une URL tirée au sort : 503"""
+        if not self.config.error_rate or _fraction(self.config.seed, path) >= self.config.error_rate:
+            return False
+        with self._lock:
+            if path in self._seen_errors:
+                return False
+            self._seen_errors.add(path)
+            return True
+
+    def _handler(self):
+        site = self
+        config = self.config
+        jitter = random.Random(config.seed)
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if config.latency_ms or config.latency_jitter_ms:
+                    time.sleep((config.latency_ms + jitter.uniform(0, config.latency_jitter_ms)) / 1000)
+                with site._lock:
+                    site.stats['requests'] += 1
+
+                if self.path == '/':
+                    body = ''.join(f'<a href="/page/{n}.html">Page {n}</a>'
+                                   for n in range(min(config.pages, max(config.fanout, 1))))
+                    return self._send(200, f'<html><title>Accueil</title><body>{body}</body></html>'.encode())
+
+                number = self.path[len('/page/'):-len('.html')] if self.path.startswith('/page/') else ''
+                if not number.isdigit() or int(number) >= config.pages:
+                    return self._send(404, b'<html><title>Introuvable</title></html>')
+
+                if site._should_fail(self.path):
+                    with site._lock:
+                        site.stats['errors'] += 1
+                    return self._send(503, b'<html><title>Indisponible</title></html>', {'Retry-After': '0'})
+
+                self._send(200, site._page(int(number)))
+
+            def _send(self, status, body, headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+                with site._lock:
+                    site.stats['bytes'] += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--page-kb', type=int, default=30)
+    parser.add_argument('--fanout', type=int, default=10)
+    parser.add_argument('--table-rows', type=int, default=50)
+    parser.add_argument('--js-items', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = SiteConfig(pages=args.pages, page_kb=args.page_kb, fanout=args.fanout, table_rows=args.table_rows,
+                        js_items=args.js_items, latency_ms=args.latency_ms, error_rate=args.error_rate)
+    server = SyntheticSiteServer(config, port=args.port)
+    print(f"Site synthétique sur {server.base_url}/ (Ctrl+C pour arrêter)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()